@@ -0,0 +1,114 @@
+"""
+Compares the Postgres expand strategies for paged selects.
+
+Generates authors, posts, tags and comments in the given Postgres database and
+then selects pages of posts with their author, tags and comments expanded, once
+using correlated sub-selects and once using lateral joins.  The average time to
+load a page is reported for each strategy.
+
+usage:
+
+    python benchmarks/expand_strategy.py <database> [posts] [pages]
+"""
+
+import getpass
+import random
+import sys
+import time
+
+import orb
+
+
+class BenchAuthor(orb.Table):
+    id = orb.IdColumn()
+    name = orb.StringColumn()
+
+
+class BenchTag(orb.Table):
+    id = orb.IdColumn()
+    name = orb.StringColumn()
+
+
+class BenchPost(orb.Table):
+    id = orb.IdColumn()
+    title = orb.StringColumn()
+    author = orb.ReferenceColumn(reference='BenchAuthor')
+
+    tags = orb.Pipe(through='BenchPostTag', from_='post', to='tag')
+    comments = orb.ReverseLookup(from_column='BenchComment.post')
+
+
+class BenchPostTag(orb.Table):
+    id = orb.IdColumn()
+    post = orb.ReferenceColumn(reference='BenchPost')
+    tag = orb.ReferenceColumn(reference='BenchTag')
+
+
+class BenchComment(orb.Table):
+    id = orb.IdColumn()
+    text = orb.StringColumn()
+    post = orb.ReferenceColumn(reference='BenchPost')
+
+
+def save(records, size=1000):
+    for i in xrange(0, len(records), size):
+        orb.Collection(records[i:i + size]).save()
+
+
+def generate(count):
+    if BenchPost.select().count() >= count:
+        return
+
+    authors = [BenchAuthor({'name': 'author{0}'.format(i)}) for i in xrange(max(count / 20, 1))]
+    tags = [BenchTag({'name': 'tag{0}'.format(i)}) for i in xrange(50)]
+    save(authors)
+    save(tags)
+
+    posts = [BenchPost({'title': 'post{0}'.format(i), 'author': random.choice(authors)}) for i in xrange(count)]
+    save(posts)
+
+    save([BenchPostTag({'post': post, 'tag': tag}) for post in posts for tag in random.sample(tags, 3)])
+    save([BenchComment({'text': 'comment', 'post': post}) for post in posts for _ in xrange(random.randint(0, 10))])
+
+
+def run(strategy, pages, size=100):
+    total = BenchPost.select().count()
+    starts = [random.randint(0, max(total - size, 0)) for _ in xrange(pages)]
+
+    begin = time.time()
+    for start in starts:
+        BenchPost.select(expand='author,tags,comments',
+                         order='+title',
+                         start=start,
+                         limit=size,
+                         expandStrategy=strategy).records()
+    duration = time.time() - begin
+
+    print '{0:<10} {1:>10.1f} ms/page'.format(strategy, duration * 1000 / pages)
+
+
+def main(database, count=100000, pages=20):
+    db = orb.Database('Postgres')
+    db.setName(database)
+    db.setHost('localhost')
+    db.setUsername(getpass.getuser())
+    db.setPassword('')
+    db.activate()
+    db.sync()
+
+    generate(count)
+
+    print 'posts:     {0}'.format(count)
+    print 'pages:     {0} x 100 records'.format(pages)
+    for strategy in ('subquery', 'lateral'):
+        run(strategy, pages)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print __doc__
+        sys.exit(1)
+
+    main(sys.argv[1],
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100000,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 20)
@@ -0,0 +1,47 @@
+"""
+Measures the throughput of Model.get for each of the record locking modes.
+
+Records are inflated directly from row dictionaries (no database connection is
+required) and their values are read repeatedly.
+
+usage:
+
+    python benchmarks/model_get.py [iterations]
+"""
+
+import sys
+import timeit
+
+import orb
+
+
+class BenchRecord(orb.Table):
+    id = orb.IdColumn()
+    name = orb.StringColumn()
+    email = orb.StringColumn()
+    age = orb.IntegerColumn()
+
+
+def run(mode, iterations):
+    orb.system.settings().record_locking = mode
+
+    records = [BenchRecord.inflate({'id': i + 1, 'name': 'user', 'email': 'user@example.com', 'age': i})
+               for i in xrange(100)]
+
+    def read():
+        for record in records:
+            record.get('name')
+            record.get('age')
+
+    count = iterations * len(records) * 2
+    duration = min(timeit.repeat(read, number=iterations, repeat=3))
+    print '{0:<6} {1:>12.0f} gets/sec'.format(mode, count / duration)
+
+
+def main(iterations=200):
+    for mode in ('rw', 'none'):
+        run(mode, iterations)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
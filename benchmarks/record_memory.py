@@ -0,0 +1,94 @@
+"""
+Measures the memory footprint of loaded records.
+
+Records are inflated directly from row dictionaries (no database connection is
+required), and the approximate number of bytes that each record holds onto is
+reported both before and after its values have been read.
+
+usage:
+
+    python benchmarks/record_memory.py [count]
+"""
+
+import datetime
+import sys
+
+import orb
+
+
+class BenchRecord(orb.Table):
+    id = orb.IdColumn()
+    name = orb.StringColumn()
+    email = orb.StringColumn()
+    first_name = orb.StringColumn()
+    last_name = orb.StringColumn()
+    age = orb.IntegerColumn()
+    score = orb.FloatColumn()
+    active = orb.BooleanColumn()
+    created_at = orb.DatetimeColumn()
+    notes = orb.TextColumn()
+
+
+def deep_size(obj, seen):
+    """
+    Returns the size of the given object, along with any containers and slot
+    values that are owned by it.  Shared objects are only counted once.
+    """
+    if id(obj) in seen or isinstance(obj, (type, orb.Column, orb.Schema)):
+        return 0
+
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_size(key, seen) + deep_size(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for value in obj:
+            size += deep_size(value, seen)
+    elif hasattr(obj, '__dict__') or hasattr(type(obj), '__slots__'):
+        size += deep_size(getattr(obj, '__dict__', {}), seen)
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if slot.startswith('__') and not slot.endswith('__'):
+                    slot = '_{0}{1}'.format(cls.__name__.lstrip('_'), slot)
+                try:
+                    size += deep_size(getattr(obj, slot), seen)
+                except AttributeError:
+                    continue
+    return size
+
+
+def make_rows(count):
+    now = datetime.datetime(2016, 1, 1)
+    for i in xrange(count):
+        yield {
+            'id': i + 1,
+            'name': 'user{0}'.format(i),
+            'email': 'user{0}@example.com'.format(i),
+            'first_name': 'First',
+            'last_name': 'Last',
+            'age': 30,
+            'score': 1.5,
+            'active': True,
+            'created_at': now,
+            'notes': 'notes'
+        }
+
+
+def main(count=10000):
+    records = [BenchRecord.inflate(row) for row in make_rows(count)]
+    loaded = sum(deep_size(record, set()) for record in records) / float(count)
+
+    for record in records:
+        record.get('name')
+
+    accessed = sum(deep_size(record, set()) for record in records) / float(count)
+
+    print 'records:                   {0}'.format(count)
+    print 'bytes/record (loaded):     {0:.0f}'.format(loaded)
+    print 'bytes/record (accessed):   {0:.0f}'.format(accessed)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
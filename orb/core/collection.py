@@ -1,6 +1,12 @@
+import hashlib
+import projex.rest
+
 from collections import defaultdict
 from projex.lazymodule import lazy_import
-from projex.locks import ReadWriteLock, ReadLocker, WriteLocker
+from projex.locks import ReadLocker, WriteLocker
+
+from .locks import create_lock
+from .plan import json_plan_key
 
 orb = lazy_import('orb')
 
@@ -40,45 +46,29 @@ class CollectionIterator(object):
 class Collection(object):
     def __json__(self):
         context = self.context()
-        expand = context.expandtree(self.__model)
-
-        output = {}
+        keys, include_records = self._jsonKeys(context)
+        if not include_records:
+            return self._jsonEnvelope(keys)
 
-        use_records = False
-
-        if 'count' in expand or context.returning == 'count':
-            expand.pop('count', None)
-            use_records = True
-            output['count'] = self.count()
-
-        if 'ids' in expand or context.returning == 'ids':
-            expand.pop('ids', None)
-            use_records = True
-            output['ids'] = self.ids()
-
-        if 'first' in expand or context.returning == 'first':
-            expand.pop('first', None)
-            use_records = True
-            record = self.first()
-            output['first'] = record.__json__() if record else None
-
-        if 'last' in expand or context.returning == 'last':
-            expand.pop('last', None)
-            use_records = True
-            record = self.last()
-            output['last'] = record.__json__() if record else None
+        # load the records first, so the count and ids can be taken from the loaded page
+        records = self._cachedJSON(context)
+        if records is not None:
+            with WriteLocker(self.__cacheLock):
+                self.__cache['count'].setdefault(context, len(records))
+        elif keys:
+            records = self._serialize(self._selectPage(context), context)
+        else:
+            records = self._serialize(self.records(), context)
 
-        if not output or (expand and context.returning not in ('count', 'ids', 'first', 'last')):
-            records = [record.__json__() if hasattr(record, '__json__') else record for record in self.records()]
-            if not use_records:
-                return records
-            else:
-                output['records'] = records
+        if not keys:
+            return records
 
+        output = self._jsonEnvelope(keys)
+        output['records'] = records
         return output
 
     def __init__(self, records=None, model=None, source='', record=None, collector=None, preload=None, **context):
-        self.__cacheLock = ReadWriteLock()
+        self.__cacheLock = create_lock()
         self.__cache = defaultdict(dict)
         self.__preload = preload or {}
         self.__context = orb.Context(**context)
@@ -109,9 +99,178 @@ class Collection(object):
             else:
                 return record
 
+    def _aggregateKey(self, column):
+        """
+        Returns the key that a grouped or aggregated column is returned under.  Queries
+        are keyed by their column name, wrapped in each of their functions, such as
+        `length(username)` or `date_trunc(created_at, month)`, so they do not collide
+        with the column itself.
+
+        :param      column | <str> || <orb.Query>
+
+        :return     <str>
+        """
+        if not isinstance(column, orb.Query):
+            return column
+
+        key = column.columnName()
+        for func in column.functions():
+            name, args = orb.QueryFunction.parse(func)
+            args = [arg.columnName() if isinstance(arg, orb.Query) else unicode(arg) for arg in args]
+            key = u'{0}({1})'.format(name, u', '.join([key] + args))
+        return key
+
+    def _aggregateValue(self, column, value, context):
+        """
+        Restores a grouped or aggregated database value through its column.  The
+        results of query functions are returned as they were calculated.
+
+        :param      column  | <str> || <orb.Query>
+                    value   | <variant>
+                    context | <orb.Context>
+
+        :return     <variant>
+        """
+        if isinstance(column, orb.Query):
+            if column.functions():
+                return value
+            column = column.columnName()
+        return self.__model.schema().column(column).dbRestore(value, context=context)
+
+    def _cachedJSON(self, context):
+        """
+        Returns the serialized records for this collection from the record cache
+        for versioned models.  Only the id and version of each record is selected,
+        so if every version has already been serialized, no records need to be
+        loaded or inflated.  If any record is missing from the cache, or the plan
+        includes getter, shortcut or expanded values that are not cached, None
+        is returned.
+
+        :param      context | <orb.Context>
+
+        :return     [<variant>, ..] || None
+        """
+        model = self.__model
+        if model is None or callable(model.__auth__) or self.isLoaded():
+            return None
+
+        # only look up the versions when records have been serialized for this plan
+        plan = model.jsonPlan(context)
+        if not plan.records or plan.indirect or plan.expand or context.scope:
+            return None
+
+        versions = self._versions({})
+        if versions is None:
+            return None
+
+        output = []
+        for key in versions:
+            record = plan.cachedRecord(key) if key[1] is not None else None
+            if record is None:
+                return None
+            output.append(plan.pack(record))
+        return output
+
+    def _jsonEnvelope(self, keys):
+        """
+        Returns the count, ids, first and last record information that was requested
+        for the JSON output of this collection.
+
+        :param      keys | [<str>, ..] | from the `_jsonKeys` method
+
+        :return     {<str> key: <variant> value, ..}
+        """
+        output = {}
+
+        if 'count' in keys:
+            output['count'] = self.count()
+
+        if 'ids' in keys:
+            output['ids'] = self.ids()
+
+        if 'first' in keys:
+            record = self.first()
+            output['first'] = record.__json__() if record else None
+
+        if 'last' in keys:
+            record = self.last()
+            output['last'] = record.__json__() if record else None
+
+        return output
+
+    def _jsonKeys(self, context):
+        """
+        Returns the envelope keys (count, ids, first and last) that are requested by
+        the context for the JSON output of this collection, and whether or not the
+        serialized records are included alongside them.
+
+        :param      context | <orb.Context>
+
+        :return     ([<str>, ..] keys, <bool> include records)
+        """
+        expand = context.expandtree(self.__model)
+
+        keys = [key for key in ('count', 'ids', 'first', 'last') if key in expand or context.returning == key]
+        for key in keys:
+            expand.pop(key, None)
+
+        include_records = not keys or bool(expand and context.returning not in ('count', 'ids', 'first', 'last'))
+        return keys, include_records
+
+    def _versions(self, context):
+        """
+        Returns the id and version for each record in this collection.  If the
+        model does not define a version column, then None is returned.
+
+        :param      context | <dict>
+
+        :return     [(<variant> id, <variant> version), ..] || None
+        """
+        if self.__model is None:
+            return None
+
+        plan = self.__model.schema().plan()
+        if plan.version is None:
+            return None
+
+        return self.tuples(plan.idColumn.name(), plan.version.name(), restore=True, **context)
+
+    def _iterRecords(self, context, chunk):
+        """
+        Generates the records for this collection in batches of the given size.  Loaded
+        records are split into batches, otherwise each batch is selected from the
+        backend as it is requested.
+
+        :param      context | <orb.Context>
+                    chunk   | <int>
+
+        :return     <generator> | [<variant>, ..]
+        """
+        if self.isNull():
+            return
+
+        with ReadLocker(self.__cacheLock):
+            records = self.__cache['records'].get(context)
+            raw = self.__preload.get('records', {}).get(context)
+
+        if records is None and raw is not None:
+            records = self._process(raw, context)
+
+        if records is None:
+            conn = context.db.connection()
+            for raw in conn.iterselect(self.__model, context, size=chunk):
+                yield self._process(raw, context)
+        else:
+            for i in xrange(0, len(records), chunk):
+                yield records[i:i + chunk]
+
     def _process(self, raw, context):
-        if context.inflated and context.returning != 'values':
-            records = [self.__model.inflate(x, context=context) for x in raw or []]
+        if context.returning == 'json':
+            records = self._serialize(self.__model.inflateMany(raw or [], context=context), context)
+        elif context.inflated and context.returning != 'values':
+            records = self.__model.inflateMany(raw or [], context=context)
+        elif isinstance(raw, orb.ResultSet):
+            records = self._processRows(raw, context)
         elif context.columns:
             schema = self.__model.schema()
             if context.returning == 'values':
@@ -128,6 +287,165 @@ class Collection(object):
             records = raw
         return records
 
+    def _selectPage(self, context):
+        """
+        Returns the records for this collection.  When the collection is paged, the
+        records are selected along with the total number of records that match it
+        from the same query, and the total is cached as the count for the unpaged
+        collection so that the page count does not require another query.
+
+        :param      context | <orb.Context>
+
+        :return     [<variant>, ..]
+        """
+        if self.isNull():
+            return []
+
+        with ReadLocker(self.__cacheLock):
+            loaded = context in self.__cache['records'] or context in self.__preload.get('records', {})
+
+        if loaded or context.returning == 'json' or not (context.start or context.limit):
+            return self.records(context=context)
+
+        raw, total = context.db.connection().selectTotal(self.__model, context)
+        records = self._process(raw, context)
+
+        unpaged = context.copy()
+        unpaged.page = unpaged.pageSize = unpaged.start = unpaged.limit = None
+
+        with WriteLocker(self.__cacheLock):
+            self.__cache['records'][context] = records
+            if total is not None:
+                self.__cache['count'][unpaged] = total
+        return records
+
+    def _serialize(self, records, context):
+        """
+        Serializes the given records, sharing a single plan and value context
+        for each model rather than rebuilding them for every record.
+
+        :param      records | [<orb.Model> || <variant>, ..]
+                    context | <orb.Context>
+
+        :return     [<variant>, ..]
+        """
+        plans = {}
+        output = []
+        for record in records:
+            if not isinstance(record, orb.Model):
+                output.append(record.__json__() if hasattr(record, '__json__') else record)
+                continue
+
+            model = type(record)
+            if callable(model.__auth__):
+                plan = model.jsonPlan(context, record=record)
+                value_context = plan.valueContext(context)
+            else:
+                try:
+                    plan, value_context = plans[model]
+                except KeyError:
+                    plan = model.jsonPlan(context)
+                    value_context = plan.valueContext(context)
+                    plans[model] = (plan, value_context)
+
+            output.append(record._json(plan, context, value_context))
+        return output
+
+    def _processRows(self, rows, context):
+        """
+        Processes the tuple based rows from a backend result set, only building
+        dictionaries when the raw records are being returned.
+
+        :param      rows    | <orb.ResultSet>
+                    context | <orb.Context>
+
+        :return     [<variant>, ..]
+        """
+        if not context.columns:
+            return rows.dicts()
+
+        fields = [self.__model.schema().column(col).field() for col in context.columns]
+        if context.returning != 'values':
+            return rows.dicts(fields)
+        elif len(fields) == 1:
+            if not rows.hasColumn(fields[0]):
+                raise KeyError(fields[0])
+            return rows.column(fields[0])
+        else:
+            return rows.values(*fields)
+
+    def _selectJSON(self, conn, context):
+        """
+        Selects the records for this collection already serialized by the backend.  This
+        is only possible when all of the serialized values are stored natively by the
+        backend, otherwise None is returned and the records will be serialized by their
+        model.
+
+        :param      conn    | <orb.Connection>
+                    context | <orb.Context>
+
+        :return     [<dict>, ..] || None
+        """
+        if callable(self.__model.__auth__):
+            return None
+
+        plan = self.__model.jsonPlan(context)
+        if not plan.native:
+            return None
+
+        columns = [col.name() for col in plan.columns]
+        records = conn.selectJSON(self.__model, orb.Context(columns=columns, context=context))
+
+        # encode the values the same way as records that are serialized by their model
+        if records:
+            for record in records:
+                for field, column in plan.direct:
+                    if field in record:
+                        record[field] = column.valueToJSON(record[field])
+        return records
+
+    def _selectColumns(self, columns, context):
+        """
+        Returns the values for each of the given columns as separate lists.  This
+        will select only the given fields from the backend and keep their raw database
+        values, unless the restore option is provided, in which case each column will
+        be converted using its batch restore method.  Loaded records already hold
+        restored values, so they are only used when restoring.
+
+        :param      columns | [<str> || <orb.Column>, ..]
+                    context | <dict>
+
+        :return     [[<variant>, ..], ..]
+        """
+        restore = context.pop('restore', False)
+        context = self.context(**context)
+        schema = self.__model.schema()
+        fields = [schema.column(col) for col in columns]
+
+        # use the loaded records when available
+        if restore:
+            with ReadLocker(self.__cacheLock):
+                records = self.__cache['records'].get(context)
+
+            if records is not None and all(isinstance(record, orb.Model) for record in records):
+                return [[record.get(field, inflated=False) for record in records] for field in fields]
+
+        context.columns = list(columns)
+        context.inflated = False
+        context.returning = 'values'
+        context.expand = None
+
+        rows = context.db.connection().select(self.__model, context)
+        if isinstance(rows, orb.ResultSet):
+            values = [rows.column(field.field()) for field in fields]
+        else:
+            values = [[row.get(field.field()) for row in rows] for field in fields]
+
+        if restore:
+            values = [field.dbRestoreMany(field_values, context=context)
+                      for field, field_values in zip(fields, values)]
+        return values
+
     def add(self, record):
         if isinstance(self.__collector, orb.Pipe):
             cls = self.__collector.throughModel()
@@ -163,6 +481,78 @@ class Collection(object):
             records.append(record)
             return True
 
+    def aggregate(self, groupBy=None, **options):
+        """
+        Calculates aggregate values for the records of this collection within the
+        database, optionally grouped by one or more columns, without loading the
+        records.  Each aggregate is provided as a keyword for its function (`count`,
+        `sum`, `avg`, `min` or `max`) with a column name, or a list of column names,
+        and `count='*'` counts the records within each group.  When a list of columns
+        is provided, the values are returned as a dictionary keyed by column.  The
+        ordering and paging of the collection do not apply to the aggregates.
+
+        :usage      |>>> Invoice.select().aggregate(groupBy=['status'], count='*', sum='amount')
+                    |[{'status': 'paid', 'count': 12, 'sum': 1250}, ..]
+
+        Queries can be used in place of column names to group or aggregate by the
+        result of their functions, such as `Q('created_at').call('date_trunc', 'month')`,
+        and are returned under their functions and column name, such as
+        `date_trunc(created_at, month)`.
+
+        :param      groupBy | [<str> column || <orb.Query>, ..] || <str> || None
+
+        :return     [{<str> key: <variant> value, ..}, ..]
+        """
+        if isinstance(groupBy, (str, unicode)):
+            groupBy = groupBy.split(',')
+        elif isinstance(groupBy, orb.Query):
+            groupBy = [groupBy]
+        groupBy = list(groupBy or [])
+
+        aggregates = []
+        for function in ('count', 'sum', 'avg', 'min', 'max'):
+            columns = options.pop(function, None)
+            if columns is None:
+                continue
+            elif isinstance(columns, (str, unicode, orb.Query)):
+                aggregates.append((function, columns, False))
+            else:
+                aggregates.extend((function, column, True) for column in columns)
+
+        if not aggregates:
+            aggregates.append(('count', '*', False))
+
+        if self.isNull():
+            return []
+
+        context = self.context(**options)
+        conn = context.db.connection()
+        rows = conn.aggregate(self.__model, context, groupBy, [(f, c) for f, c, _ in aggregates])
+
+        # an ungrouped aggregate always results in a single row
+        if not (rows or groupBy):
+            rows = [{}]
+
+        output = []
+        for row in rows:
+            out = {}
+            for i, column in enumerate(groupBy):
+                value = row.get('_orb_group_{0}'.format(i))
+                out[self._aggregateKey(column)] = self._aggregateValue(column, value, context)
+
+            for i, (function, column, nested) in enumerate(aggregates):
+                value = row.get('_orb_value_{0}'.format(i), 0 if function == 'count' else None)
+                if function in ('min', 'max'):
+                    value = self._aggregateValue(column, value, context)
+
+                if nested:
+                    out.setdefault(function, {})[self._aggregateKey(column)] = value
+                else:
+                    out[function] = value
+
+            output.append(out)
+        return output
+
     def at(self, index, **context):
         records = self.records(**context)
         try:
@@ -233,6 +623,7 @@ class Collection(object):
         if self.isNull():
             return 0
 
+        approximate = context.pop('approximate', False)
         context = self.context(**context)
         try:
             with ReadLocker(self.__cacheLock):
@@ -240,7 +631,10 @@ class Collection(object):
         except KeyError:
             try:
                 with ReadLocker(self.__cacheLock):
-                    return len(self.__cache['records'][context])
+                    loaded = self.__cache['records'].get(context)
+                    if loaded is None:
+                        loaded = self.__cache['ids'][context]
+                    return len(loaded)
             except KeyError:
                 optimized_context = context.copy()
                 optimized_context.columns = [self.__model.schema().idColumn()]
@@ -257,6 +651,13 @@ class Collection(object):
                             count = len(raw)
                     except KeyError:
                         conn = optimized_context.db.connection()
+
+                        # estimated counts are not cached, so they are not mistaken for exact counts
+                        if approximate:
+                            estimate = conn.estimateCount(self.__model, optimized_context)
+                            if estimate is not None:
+                                return estimate
+
                         count = conn.count(self.__model, optimized_context)
 
                 with WriteLocker(self.__cacheLock):
@@ -318,6 +719,90 @@ class Collection(object):
         else:
             return self.update([])
 
+    def etag(self, **context):
+        """
+        Returns a weak ETag for the serialized form of this collection, derived from
+        the id and version of each record along with the columns, expand tree and
+        locale that will be serialized.  If the model does not define a version
+        column, then None is returned.
+
+        :return     <str> || None
+        """
+        versions = self._versions(dict(context))
+        if versions is None:
+            return None
+
+        model = self.__model
+        key = (model.schema().name(), json_plan_key(model, self.context(**context)), versions)
+        return 'W/"{0}"'.format(hashlib.md5(repr(key)).hexdigest())
+
+    def exists(self, **context):
+        """
+        Returns whether or not this collection contains any records.  Loaded records,
+        ids and counts are used when available, otherwise the backend only checks
+        for a single matching record rather than counting or loading them.
+
+        :return     <bool>
+        """
+        if self.isNull():
+            return False
+
+        context = self.context(**context)
+
+        with ReadLocker(self.__cacheLock):
+            for cache in (self.__cache, self.__preload):
+                for key in ('records', 'ids', 'count'):
+                    try:
+                        loaded = cache[key][context]
+                    except KeyError:
+                        continue
+                    else:
+                        return (loaded if key == 'count' else len(loaded or [])) > 0
+
+        conn = context.db.connection()
+        return conn.exists(self.__model, context)
+
+    def facets(self, columns, **context):
+        """
+        Counts the records of this collection for each value of the given columns,
+        such as for the filters of a search page.  The counts for all of the columns
+        are calculated by the database in a single query, and the values for each
+        column are ordered from the most to the least common.
+
+        :usage      |>>> Invoice.select().facets(['status', 'owner'])
+                    |{'status': [{'value': 'paid', 'count': 12}, ..], 'owner': [..]}
+
+        :param      columns | [<str> column || <orb.Query>, ..] || <str>
+
+        :return     {<str> column: [{'value': <variant>, 'count': <int>}, ..], ..}
+        """
+        if isinstance(columns, (str, unicode)):
+            columns = columns.split(',')
+
+        output = {}
+        facet_columns = []
+        for column in columns:
+            key = self._aggregateKey(column)
+            if key not in output:
+                output[key] = []
+                facet_columns.append(column)
+
+        if self.isNull() or not facet_columns:
+            return output
+
+        context = self.context(**context)
+        conn = context.db.connection()
+
+        for row in conn.facets(self.__model, context, facet_columns):
+            index = row['_orb_facet']
+            column = facet_columns[index]
+            value = self._aggregateValue(column, row['_orb_group_{0}'.format(index)], context)
+            output[self._aggregateKey(column)].append({'value': value, 'count': row['count']})
+
+        for values in output.values():
+            values.sort(key=lambda x: x['count'], reverse=True)
+        return output
+
     def first(self, **context):
         if self.isNull():
             return None
@@ -390,9 +875,21 @@ class Collection(object):
 
     def has(self, record, **context):
         context = self.context(**context)
-        context.returning = 'values'
-        context.columns = [self.__model.schema().idColumn().name()]
-        return self.first(context=context) is not None
+
+        with ReadLocker(self.__cacheLock):
+            records = self.__cache['records'].get(context)
+
+        if records is not None:
+            return record in records
+
+        # a record can only be looked up within a page through its ids
+        elif context.start or context.limit:
+            record_id = record.id() if isinstance(record, orb.Model) else record
+            return record_id in self.ids(context=context)
+
+        else:
+            context.where = (orb.Query(self.__model) == record) & context.where
+            return self.exists(context=context)
 
     def ids(self, **context):
         if self.isNull():
@@ -403,13 +900,20 @@ class Collection(object):
             with ReadLocker(self.__cacheLock):
                 return self.__cache['ids'][context]
         except KeyError:
+            with ReadLocker(self.__cacheLock):
+                records = self.__cache['records'].get(context)
+
             try:
                 with ReadLocker(self.__cacheLock):
                     ids = self.__preload['ids'][context]
             except KeyError:
-                ids = self.records(columns=[self.__model.schema().idColumn()],
-                                   returning='values',
-                                   context=context)
+                # use the loaded records when available
+                if records is not None and all(isinstance(record, orb.Model) for record in records):
+                    ids = [record.id() for record in records]
+                else:
+                    ids = self.records(columns=[self.__model.schema().idColumn()],
+                                       returning='values',
+                                       context=context)
 
             with WriteLocker(self.__cacheLock):
                 self.__cache['ids'][context] = ids
@@ -433,7 +937,7 @@ class Collection(object):
             return context in self.__cache['records']
 
     def isEmpty(self, **context):
-        return self.count(**context) == 0
+        return not self.exists(**context)
 
     def isNull(self):
         with ReadLocker(self.__cacheLock):
@@ -442,6 +946,45 @@ class Collection(object):
     def iterate(self, batch=100):
         return CollectionIterator(self, batch)
 
+    def iterjson(self, chunk=500):
+        """
+        Generates the JSON for this collection as UTF-8 encoded chunks, matching the
+        output of the `__json__` method.  Records are selected and serialized in
+        batches of the given size as the output is consumed, so the full list of
+        records is never held in memory.
+
+        :param      chunk | <int>
+
+        :return     <generator> | <str>
+        """
+        def _encode(value):
+            text = projex.rest.jsonify(value, indent=None)
+            return text.encode('utf-8') if isinstance(text, unicode) else text
+
+        context = self.context()
+        keys, include_records = self._jsonKeys(context)
+        if not include_records:
+            yield _encode(self._jsonEnvelope(keys))
+            return
+
+        yield '{"records": [' if keys else '['
+
+        first = True
+        for records in self._iterRecords(context, chunk):
+            if not records:
+                continue
+
+            data = ', '.join(_encode(record) for record in self._serialize(records, context))
+            yield data if first else ', ' + data
+            first = False
+
+        # the envelope follows the records, so it is computed once they have been streamed
+        if keys:
+            envelope = self._jsonEnvelope(keys)
+            yield ']' + ''.join(', {0}: {1}'.format(_encode(key), _encode(envelope[key])) for key in keys) + '}'
+        else:
+            yield ']'
+
     def last(self, **context):
         if self.isNull():
             return None
@@ -500,11 +1043,13 @@ class Collection(object):
             return 1
         else:
             context['page'] = None
+            context['pageSize'] = None
+            context['start'] = None
             context['limit'] = None
 
             fraction = self.count(**context) / float(size)
             count = int(fraction)
-            if count % 1:
+            if fraction % 1:
                 count += 1
             return max(1, count)
 
@@ -525,14 +1070,22 @@ class Collection(object):
             with ReadLocker(self.__cacheLock):
                 return self.__cache['records'][context]
         except KeyError:
+            records = None
             try:
                 with ReadLocker(self.__cacheLock):
                     raw = self.__preload['records'][context]
             except KeyError:
                 conn = context.db.connection()
-                raw = conn.select(self.__model, context)
 
-            records = self._process(raw, context)
+                # serialize the records from the backend when possible
+                if context.returning == 'json':
+                    records = self._selectJSON(conn, context)
+
+                if records is None:
+                    raw = conn.select(self.__model, context)
+
+            if records is None:
+                records = self._process(raw, context)
 
             with WriteLocker(self.__cacheLock):
                 self.__cache['records'][context] = records
@@ -592,6 +1145,64 @@ class Collection(object):
         collection.refine(order=order)
         return collection
 
+    def scalars(self, column, **context):
+        """
+        Returns the database values for a single column of this collection.  No
+        records, dictionaries or per-value contexts are created, and the results are
+        not cached, so this is suitable for very large result sets.  Providing
+        `restore=True` will convert the values using the column's batch restore method.
+
+        :param      column | <str> || <orb.Column>
+
+        :return     [<variant>, ..]
+        """
+        if self.isNull():
+            return []
+        return self._selectColumns([column], context)[0]
+
+    def toArrays(self, columns, **context):
+        """
+        Exports the values for the given columns of this collection to typed arrays
+        for use with vectorized code.  Integer, long, float, decimal, boolean and date
+        columns are stored in an `array.array` buffer, or a numpy array when numpy is
+        installed, along with a mask of which values are null.  Dates are stored as the
+        number of days since the unix epoch.  Providing `useNumpy=False` will always
+        use the `array` module.
+
+        :param      columns | [<str> || <orb.Column>, ..] || <str>
+
+        :return     {<str> column name: (<array.array> || <numpy.ndarray>, <null mask>), ..}
+        """
+        use_numpy = context.pop('useNumpy', orb.core.column.numpy is not None)
+        if isinstance(columns, (str, unicode)):
+            columns = columns.split(',')
+
+        if self.isNull():
+            return {}
+
+        schema = self.__model.schema()
+        output = {}
+        for col, column_values in zip(columns, self._selectColumns(columns, context)):
+            column = schema.column(col)
+            output[column.name()] = column.toArray(column_values, useNumpy=use_numpy)
+        return output
+
+    def tuples(self, *columns, **context):
+        """
+        Returns a tuple of database values for the given columns for each record in
+        this collection.  No records, dictionaries or per-value contexts are created,
+        and the results are not cached, so this is suitable for very large result sets.
+        Providing `restore=True` will convert the values using each column's batch
+        restore method.
+
+        :param      *columns | <str> || <orb.Column>
+
+        :return     [(<variant>, ..), ..]
+        """
+        if self.isNull() or not columns:
+            return []
+        return zip(*self._selectColumns(columns, context))
+
     def update(self, records, useMethod=True, **context):
         if useMethod and self.__collector is not None and self.__collector.settermethod() is not None:
             return self.__collector.settermethod()(self.__record, records, **context)
@@ -776,27 +1387,32 @@ class Collection(object):
                     raw = conn.select(self.__model, context)
 
                 schema = self.__model.schema()
-                values = []
                 fields = [schema.column(col) for col in columns]
-                for record in raw:
-                    if not context.inflated:
-                        record_values = [record[field.field()] for field in fields]
+                if not isinstance(raw, orb.ResultSet):
+                    raw = list(raw)
+
+                # convert the values one column at a time
+                column_values = []
+                for col, field in zip(columns, fields):
+                    if isinstance(raw, orb.ResultSet):
+                        field_values = raw.column(field.field())
                     else:
-                        record_values = []
-                        for i, field in enumerate(fields):
-                            col = columns[i]
-                            raw_values = orig_context.copy()
-                            raw_values['distinct'] = None
-                            if isinstance(field, orb.ReferenceColumn) and raw_values.get('inflated') is None:
-                                raw_values['inflated'] = col != field.field()
-
-                            val = field.restore(record[field.field()], context=orb.Context(**raw_values))
-                            record_values.append(val)
-
-                    if len(fields) == 1:
-                        values.append(record_values[0])
-                    else:
-                        values.append(record_values)
+                        field_values = [record[field.field()] for record in raw]
+                    if context.inflated:
+                        raw_values = orig_context.copy()
+                        raw_values['distinct'] = None
+                        if isinstance(field, orb.ReferenceColumn) and raw_values.get('inflated') is None:
+                            raw_values['inflated'] = col != field.field()
+
+                        field_values = field.restoreMany(field_values, context=orb.Context(**raw_values))
+                    column_values.append(field_values)
+
+                if len(fields) == 1:
+                    values = column_values[0]
+                elif fields:
+                    values = [list(record_values) for record_values in zip(*column_values)]
+                else:
+                    values = [[] for _ in raw]
 
                 with WriteLocker(self.__cacheLock):
                     self.__cache['values'][(context, columns)] = values
@@ -1,5 +1,6 @@
 """ Defines the meta information for a column within a table schema. """
 
+import array
 import logging
 import projex.text
 
@@ -10,10 +11,20 @@ from projex.lazymodule import lazy_import
 log = logging.getLogger(__name__)
 orb = lazy_import('orb')
 
+# optional imports
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class Column(AddonManager):
     """ Used to define database schema columns when defining Table classes. """
     TypeMap = {}
+    LazyRestore = False  # defer restoring database values until they are first accessed
+    ArrayType = None  # array typecode used when exporting values, see Collection.toArrays
+    NumpyType = None  # numpy dtype used when exporting values, defaults to the ArrayType
+    NativeJSON = True  # stored values serialize the same through the database's json encoding
     MathMap = {
         'Default': {
             'Add': u'{field} + {value}',
@@ -42,7 +53,8 @@ class Column(AddonManager):
         'Private',
         'AutoExpand',
         'RequiresExpand',
-        'Keyable'
+        'Keyable',
+        'Deferred'
     )
 
     def __json__(self):
@@ -102,6 +114,25 @@ class Column(AddonManager):
         if schema:
             schema.register(self)
 
+    def arrayType(self):
+        """
+        Returns the array typecode that is used to export the values for this
+        column, or None if the values cannot be stored in a typed array.
+
+        :return: <str> || None
+        """
+        return self.ArrayType
+
+    def arrayValue(self, db_value):
+        """
+        Converts a non-null database value to one that can be stored in a typed array.
+
+        :param db_value: <variant>
+
+        :return: <variant>
+        """
+        return db_value
+
     def copy(self):
         """
         Returns a new instance copy of this column.
@@ -155,6 +186,25 @@ class Column(AddonManager):
         else:
             return db_value
 
+    def dbRestoreMany(self, db_values, context=None):
+        """
+        Converts a list of stored database values to Python.  This is used to restore
+        a full column of a result set at once, and should be reimplemented by column
+        types that can share work between values.
+
+        :param db_values: [<variant>, ..]
+        :param context: <orb.Context>
+
+        :return: [<variant>, ..]
+        """
+        dbRestore = self.dbRestore
+
+        # standard columns store their values as-is
+        if dbRestore.im_func is Column.dbRestore.im_func and not self.testFlag(self.Flags.I18n):
+            return list(db_values)
+        else:
+            return [dbRestore(db_value, context=context) for db_value in db_values]
+
     def dbMath(self, typ, field, op, value):
         """
         Performs some database math on the given field.  This will be database specific
@@ -183,7 +233,7 @@ class Column(AddonManager):
         """
         # convert base types to work in the database
         if isinstance(py_value, (list, tuple, set)):
-            py_value = tuple((self.dbStore(x) for x in py_value))
+            py_value = tuple(self.dbStoreMany(typ, py_value))
         elif isinstance(py_value, orb.Collection):
             py_value = py_value.ids()
         elif isinstance(py_value, orb.Model):
@@ -191,6 +241,19 @@ class Column(AddonManager):
 
         return py_value
 
+    def dbStoreMany(self, typ, py_values):
+        """
+        Prepares a list of values to store for this column for a particular backend
+        database.
+
+        :param typ: <str>
+        :param py_values: [<variant>, ..]
+
+        :return: [<variant>, ..]
+        """
+        dbStore = self.dbStore
+        return [dbStore(typ, py_value) for py_value in py_values]
+
     def dbType(self, typ):
         """
         Returns the database object type based on the given connection type.
@@ -430,6 +493,25 @@ class Column(AddonManager):
         else:
             return value
 
+    def restoreMany(self, values, context=None):
+        """
+        Restores a list of values from a table cache for usage, sharing the same
+        context between all of the values.
+
+        :param      values  | [<variant>, ..]
+                    context | <orb.Context> || None
+
+        :return     [<variant>, ..]
+        """
+        context = context or orb.Context()
+        restore = self.restore
+
+        # standard columns restore their values as-is
+        if restore.im_func is Column.restore.im_func and not self.testFlag(self.Flags.I18n):
+            return list(values)
+        else:
+            return [restore(value, context=context) for value in values]
+
     def setShortcut(self, shortcut):
         """
         Sets the shortcut information for this column.
@@ -469,6 +551,16 @@ class Column(AddonManager):
         else:
             return value
 
+    def restoresLazily(self):
+        """
+        Returns whether or not the database values for this column should be restored when
+        they are first accessed on a record vs. when the record is loaded.  This is used
+        for column types that are expensive to decode, as well as translatable columns.
+
+        :return: <bool>
+        """
+        return self.LazyRestore or self.testFlag(self.Flags.I18n)
+
     def schema(self):
         """
         Returns the table that this column is linked to in the database.
@@ -587,6 +679,38 @@ class Column(AddonManager):
 
         return bool(self.flags() & flag) if flag >= 0 else not bool(self.flags() & ~flag)
 
+    def toArray(self, db_values, useNumpy=False):
+        """
+        Converts a list of database values for this column to a typed array, along
+        with a mask of which values are null.  Null values are stored as 0 within the
+        typed array.  Columns without an array type are returned as a list, or an
+        object array when using numpy.
+
+        :param db_values: [<variant>, ..]
+        :param useNumpy: <bool>
+
+        :return: (<array.array> || <numpy.ndarray> || [<variant>, ..], <array.array> || <numpy.ndarray>)
+        """
+        typecode = self.arrayType()
+        nulls = [db_value is None for db_value in db_values]
+
+        if typecode is None:
+            data = list(db_values)
+        else:
+            convert = self.arrayValue
+            data = [0 if db_value is None else convert(db_value) for db_value in db_values]
+
+        if useNumpy:
+            if numpy is None:
+                raise orb.errors.DependencyNotFound('numpy')
+
+            dtype = object if typecode is None else (self.NumpyType or typecode)
+            return numpy.array(data, dtype=dtype), numpy.array(nulls, dtype=bool)
+        elif typecode is None:
+            return data, array.array('B', nulls)
+        else:
+            return array.array(typecode, data), array.array('B', nulls)
+
     def validate(self, value):
         """
         Validates the inputted value against this columns rules.  If the inputted value does not pass, then
@@ -606,6 +730,18 @@ class Column(AddonManager):
         # otherwise, we're good
         return True
 
+    def valueToJSON(self, value):
+        """
+        Converts the restored value for this column to the value that is used when
+        serializing records, so records serialized by the backend and by their model
+        encode the same way.
+
+        :param      value | <variant>
+
+        :return     <variant>
+        """
+        return value
+
     def valueFromString(self, value, context=None):
         """
         Converts the inputted string text to a value that matches the type from
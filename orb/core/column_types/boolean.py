@@ -14,6 +14,18 @@ class BooleanColumn(Column):
         'SQLite': 'INTEGER',
         'MySQL': 'BOOLEAN'
     }
+    ArrayType = 'B'
+    NumpyType = 'bool'
+
+    def arrayValue(self, db_value):
+        """
+        Converts a non-null database value to one that can be stored in a typed array.
+
+        :param db_value: <bool> || <int>
+
+        :return: <int>
+        """
+        return 1 if db_value else 0
 
     def random(self):
         """
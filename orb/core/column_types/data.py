@@ -18,6 +18,8 @@ class BinaryColumn(Column):
         'SQLite': 'BLOB',
         'MySQL': 'TEXT'
     }
+    LazyRestore = True
+    NativeJSON = False
 
     def random(self):
         """
@@ -62,6 +64,7 @@ class JSONColumn(Column):
         'SQLite': 'TEXT',
         'MySQL': 'TEXT'
     }
+    LazyRestore = True
 
     def random(self):
         """
@@ -105,6 +108,8 @@ class JSONColumn(Column):
 
 
 class QueryColumn(JSONColumn):
+    NativeJSON = False
+
     def random(self):
         """
         Returns a random value that fits this column's parameters.
@@ -136,6 +141,8 @@ class YAMLColumn(Column):
         'SQLite': 'TEXT',
         'MySQL': 'TEXT'
     }
+    LazyRestore = True
+    NativeJSON = False
 
     def random(self):
         """
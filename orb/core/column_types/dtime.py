@@ -16,6 +16,26 @@ log = logging.getLogger(__name__)
 orb = lazy_import('orb')
 pytz = lazy_import('pytz')
 
+_timezones = {}
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def get_timezone(name):
+    """
+    Returns the pytz timezone for the given name.  Timezones are looked up for every
+    value that is stored and restored, so the instances are cached by name.
+
+    :param name: <str>
+
+    :return: <pytz.tzinfo>
+    """
+    try:
+        return _timezones[name]
+    except KeyError:
+        tz = _timezones[name] = pytz.timezone(name)
+        return tz
+
 
 class AbstractDatetimeColumn(Column):
 
@@ -71,6 +91,19 @@ class AbstractDatetimeColumn(Column):
             return None
         return self.valueToString(py_value, context=context)
 
+    def valueToJSON(self, value):
+        """
+        Serializes dates and times as ISO 8601 strings, which is how they are encoded
+        by the backend.
+
+        :param      value | <variant>
+
+        :return     <variant>
+        """
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        return value
+
     def setDefaultFormat(self, form):
         """
         Sets the default string format for rendering this instance.
@@ -86,12 +119,29 @@ class DateColumn(AbstractDatetimeColumn):
         'SQLite': 'TEXT',
         'MySQL': 'DATE'
     }
+    ArrayType = 'l'
+    NumpyType = 'datetime64[D]'
 
     def __init__(self, **kwds):
         kwds.setdefault('defaultFormat', '%Y-%m-%d')
 
         super(DateColumn, self).__init__(**kwds)
 
+    def arrayValue(self, db_value):
+        """
+        Converts a non-null database value to the number of days since the
+        unix epoch, so that it can be stored in a typed array.
+
+        :param db_value: <datetime.date> || <str>
+
+        :return: <int>
+        """
+        if isinstance(db_value, (str, unicode)):
+            db_value = self.valueFromString(db_value)
+        elif isinstance(db_value, datetime.datetime):
+            db_value = db_value.date()
+        return db_value.toordinal() - EPOCH_ORDINAL
+
     def dbRestore(self, db_value, context=None):
         """
         Converts a stored database value to Python.
@@ -118,8 +168,8 @@ class DateColumn(AbstractDatetimeColumn):
         else:
             time_struct = time.strptime(value, self.defaultFormat())
             return datetime.date(time_struct.tm_year,
-                                 time_struct.tm_month,
-                                 time_struct.tm_day)
+                                 time_struct.tm_mon,
+                                 time_struct.tm_mday)
 
     def valueToString(self, value, context=None):
         """
@@ -159,10 +209,10 @@ class DatetimeColumn(AbstractDatetimeColumn):
         else:
             time_struct = time.strptime(value, self.defaultFormat())
             return datetime.datetime(time_struct.tm_year,
-                                     time_struct.tm_month,
-                                     time_struct.tm_day,
+                                     time_struct.tm_mon,
+                                     time_struct.tm_mday,
                                      time_struct.tm_hour,
-                                     time_struct.tm_minute,
+                                     time_struct.tm_min,
                                      time_struct.tm_sec)
 
     def valueToString(self, value, context=None):
@@ -183,6 +233,7 @@ class DatetimeWithTimezoneColumn(AbstractDatetimeColumn):
         'SQLite': 'TEXT',
         'MySQL': 'DATETIME'
     }
+    NativeJSON = False
 
     def __init__(self, **kwds):
         kwds.setdefault('defaultFormat', '%Y-%m-%d %H:%M:%S')
@@ -200,15 +251,61 @@ class DatetimeWithTimezoneColumn(AbstractDatetimeColumn):
         :return: <variant>
         """
         if isinstance(py_value, datetime.datetime):
-            # ensure we have some timezone information before converting to UTC time
-            if py_value.tzinfo is None:
-                # match the server information
-                tz = pytz.timezone(orb.system.settings().server_timezone)
-                py_value = tz.localize(py_value)
-            return py_value.astimezone(pytz.utc).replace(tzinfo=None)
+            return self._toUTC(py_value, get_timezone(orb.system.settings().server_timezone))
         else:
             return super(DatetimeWithTimezoneColumn, self).dbStore(typ, py_value)
 
+    def dbStoreMany(self, typ, py_values):
+        """
+        Prepares a list of values to store for this column for a particular backend
+        database, looking up the server timezone once for all of the values.
+
+        :param typ: <str>
+        :param py_values: [<variant>, ..]
+
+        :return: [<variant>, ..]
+        """
+        base_tz = get_timezone(orb.system.settings().server_timezone)
+        dbStore = super(DatetimeWithTimezoneColumn, self).dbStore
+        return [self._toUTC(py_value, base_tz) if isinstance(py_value, datetime.datetime) else dbStore(typ, py_value)
+                for py_value in py_values]
+
+    def _fromUTC(self, value, tz, base_tz):
+        """
+        Converts the given datetime value to the preferred timezone.
+
+        :param value: <datetime.datetime>
+        :param tz: <pytz.tzinfo>
+        :param base_tz: <pytz.tzinfo>
+
+        :return: <datetime.datetime>
+        """
+        if value.tzinfo is None:
+            # the machine timezone and preferred timezone match, so create off utc time
+            if base_tz == tz:
+                return tz.fromutc(value)
+
+            # convert the server timezone to a preferred timezone
+            else:
+                return base_tz.fromutc(value).astimezone(tz)
+        else:
+            return value.astimezone(tz)
+
+    def _toUTC(self, value, base_tz):
+        """
+        Converts the given datetime value to a naive UTC time.
+
+        :param value: <datetime.datetime>
+        :param base_tz: <pytz.tzinfo>
+
+        :return: <datetime.datetime>
+        """
+        # ensure we have some timezone information before converting to UTC time
+        if value.tzinfo is None:
+            # match the server information
+            value = base_tz.localize(value)
+        return value.astimezone(pytz.utc).replace(tzinfo=None)
+
     def restore(self, value, context=None):
         """
         Restores the value from a table cache for usage.
@@ -222,26 +319,43 @@ class DatetimeWithTimezoneColumn(AbstractDatetimeColumn):
             value = datetime.date.now()
 
         if isinstance(value, datetime.datetime):
-            tz = pytz.timezone(context.timezone)
+            tz = get_timezone(context.timezone)
 
             if tz is not None:
-                if value.tzinfo is None:
-                    base_tz = pytz.timezone(orb.system.settings().server_timezone)
-
-                    # the machine timezone and preferred timezone match, so create off utc time
-                    if base_tz == tz:
-                        value = tz.fromutc(value)
-
-                    # convert the server timezone to a preferred timezone
-                    else:
-                        value = base_tz.fromutc(value).astimezone(tz)
-                else:
-                    value = value.astimezone(tz)
+                value = self._fromUTC(value, tz, get_timezone(orb.system.settings().server_timezone))
             else:
                 log.warning('No local timezone defined')
 
         return value
 
+    def restoreMany(self, values, context=None):
+        """
+        Restores a list of values from a table cache for usage, looking up the
+        timezones once for all of the values.
+
+        :param      values  | [<variant>, ..]
+                    context | <orb.Context> || None
+
+        :return     [<variant>, ..]
+        """
+        context = context or orb.Context()
+        restore = super(DatetimeWithTimezoneColumn, self).restore
+        tz = get_timezone(context.timezone)
+        base_tz = get_timezone(orb.system.settings().server_timezone)
+
+        output = []
+        for value in values:
+            value = restore(value, context)
+
+            if value in ('today', 'now'):
+                value = datetime.date.now()
+
+            if isinstance(value, datetime.datetime):
+                value = self._fromUTC(value, tz, base_tz)
+
+            output.append(value)
+        return output
+
     def store(self, value, context=None):
         """
         Converts the value to one that is safe to store on a record within
@@ -252,12 +366,7 @@ class DatetimeWithTimezoneColumn(AbstractDatetimeColumn):
         :return     <variant>
         """
         if isinstance(value, datetime.datetime):
-            # ensure we have some timezone information before converting to UTC time
-            if value.tzinfo is None:
-                # match the server information
-                tz = pytz.timezone(orb.system.settings().server_timezone)
-                value = tz.localize(value)
-            value = value.astimezone(pytz.utc).replace(tzinfo=None)
+            value = self._toUTC(value, get_timezone(orb.system.settings().server_timezone))
         return super(DatetimeWithTimezoneColumn, self).store(value, context=context)
 
     def valueFromString(self, value, context=None):
@@ -272,10 +381,10 @@ class DatetimeWithTimezoneColumn(AbstractDatetimeColumn):
         else:
             time_struct = time.strptime(value, self.defaultFormat())
             return datetime.datetime(time_struct.tm_year,
-                                     time_struct.tm_month,
-                                     time_struct.tm_day,
+                                     time_struct.tm_mon,
+                                     time_struct.tm_mday,
                                      time_struct.tm_hour,
-                                     time_struct.tm_minute,
+                                     time_struct.tm_min,
                                      time_struct.tm_sec)
 
     def valueToString(self, value, context=None):
@@ -296,6 +405,7 @@ class IntervalColumn(AbstractDatetimeColumn):
         'SQLite': 'TEXT',
         'MySQL': 'TEXT'
     }
+    NativeJSON = False
 
     def valueFromString(self, value, context=None):
         """
@@ -381,6 +491,7 @@ class TimestampColumn(AbstractDatetimeColumn):
         'SQLite': 'INTEGER',
         'MySQL': 'BIGINT'
     }
+    NativeJSON = False
 
     def dbRestore(self, db_value, context=None):
         """
@@ -451,10 +562,10 @@ class UTC_DatetimeColumn(AbstractDatetimeColumn):
         else:
             time_struct = time.strptime(value, self.defaultFormat())
             return datetime.datetime(time_struct.tm_year,
-                                     time_struct.tm_month,
-                                     time_struct.tm_day,
+                                     time_struct.tm_mon,
+                                     time_struct.tm_mday,
                                      time_struct.tm_hour,
-                                     time_struct.tm_minute,
+                                     time_struct.tm_min,
                                      time_struct.tm_sec)
 
     def valueToString(self, value, context=None):
@@ -475,6 +586,7 @@ class UTC_TimestampColumn(AbstractDatetimeColumn):
         'SQLite': 'TEXT',
         'MySQL': 'BIGINT'
     }
+    NativeJSON = False
 
     def dbRestore(self, db_value, context=None):
         """
@@ -6,6 +6,8 @@ from ..column import Column
 orb = lazy_import('orb')
 
 class IdColumn(Column):
+    ArrayType = 'l'
+
     def __init__(self, type='default', bits=32, **kwds):
         super(IdColumn, self).__init__(**kwds)
 
@@ -21,6 +23,14 @@ class IdColumn(Column):
         self.__type = type
         self.__bits = bits
 
+    def arrayType(self):
+        """
+        Hash based ids cannot be exported to a typed array.
+
+        :return: <str> || None
+        """
+        return None if self.__type == 'hash' else self.ArrayType
+
     def bits(self):
         return self.__bits
 
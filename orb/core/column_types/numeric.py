@@ -70,6 +70,8 @@ class DecimalColumn(AbstractNumericColumn):
         'SQLite': 'REAL',
         'MySQL': 'DECIMAL'
     }
+    ArrayType = 'd'
+    NativeJSON = False  # the backend encodes decimals as numbers, which would lose their precision
 
     def __init__(self, precision=65, scale=30, **kwds):
         super(DecimalColumn, self).__init__(**kwds)
@@ -78,6 +80,16 @@ class DecimalColumn(AbstractNumericColumn):
         self.__precision = precision
         self.__scale = scale
 
+    def arrayValue(self, db_value):
+        """
+        Converts a non-null database value to one that can be stored in a typed array.
+
+        :param db_value: <decimal.Decimal> || <float>
+
+        :return: <float>
+        """
+        return float(db_value)
+
     def dbType(self, connectionType):
         if connectionType in ('Postgres', 'MySQL'):
             return 'DECIMAL({0}, {1})'.format(self.precision(), self.scale())
@@ -125,6 +137,7 @@ class FloatColumn(AbstractNumericColumn):
         'SQLite': 'REAL',
         'MySQL': 'DOUBLE'
     }
+    ArrayType = 'd'
 
 
 class IntegerColumn(AbstractNumericColumn):
@@ -133,6 +146,7 @@ class IntegerColumn(AbstractNumericColumn):
         'SQLite': 'INTEGER',
         'MySQL': 'INTEGER'
     }
+    ArrayType = 'l'
 
     def __init__(self, minimum=None, maximum=None, **kwds):
         if minimum is None:
@@ -151,6 +165,7 @@ class LongColumn(AbstractNumericColumn):
         'SQLite': 'INTEGER',
         'MySQL': 'BIGINT'
     }
+    ArrayType = 'l'
 
     def __init__(self, minimum=None, maximum=None, **kwds):
         if minimum is None:
@@ -195,8 +210,31 @@ class EnumColumn(LongColumn):
         self.__enum = cls
 
 
+class VersionColumn(LongColumn):
+    """
+    Defines a column that stores the revision number for a record, which is
+    incremented each time the record is saved.  Serialized records are cached
+    based on their version, so models that define a version column can re-use
+    their JSON representation until the record changes.
+    """
+    def __init__(self, **kwds):
+        kwds.setdefault('default', 0)
+        super(VersionColumn, self).__init__(**kwds)
+
+    def nextVersion(self, value):
+        """
+        Returns the version that follows the inputted one.
+
+        :param      value | <int> || None
+
+        :return     <int>
+        """
+        return (value or 0) + 1
+
+
 Column.registerAddon('Enum', EnumColumn)
 Column.registerAddon('Decimal', DecimalColumn)
 Column.registerAddon('Float', FloatColumn)
 Column.registerAddon('Integer', IntegerColumn)
-Column.registerAddon('Long', LongColumn)
\ No newline at end of file
+Column.registerAddon('Long', LongColumn)
+Column.registerAddon('Version', VersionColumn)
\ No newline at end of file
@@ -30,6 +30,17 @@ class ReferenceColumn(Column):
         'Block'         # 4
     )
 
+    # context options that are carried over when looking up referenced records
+    LookupOptions = {
+        'db',
+        'database',
+        'forceNamespace',
+        'inflated',
+        'locale',
+        'namespace',
+        'timezone'
+    }
+
     def __json__(self):
         output = super(ReferenceColumn, self).__json__()
         output['reference'] = self.__reference
@@ -46,6 +57,10 @@ class ReferenceColumn(Column):
         self.__reference = reference
         self.__removeAction = removeAction
 
+        # cached reference model lookup
+        self.__referenceModel = None
+        self.__referenceRevision = -1
+
     def _restore(self, value, context=None):
         if not context.inflated and isinstance(value, orb.Model):
             return value.id()
@@ -120,6 +135,49 @@ class ReferenceColumn(Column):
 
         return super(ReferenceColumn, self).dbRestore(db_value, context=context)
 
+    def dbRestoreMany(self, db_values, context=None):
+        """
+        Extracts a list of db_values provided back from the database.  Expanded
+        references are inflated together, so their deferred columns are loaded
+        together as well.
+
+        :param db_values: [<variant>, ..]
+        :param context: <orb.Context>
+
+        :return: [<variant>, ..]
+        """
+        if self.testFlag(self.Flags.I18n):
+            return super(ReferenceColumn, self).dbRestoreMany(db_values, context=context)
+
+        output = list(db_values)
+        expanded = []
+        for i, db_value in enumerate(output):
+            if isinstance(db_value, (str, unicode)) and db_value.startswith('{'):
+                try:
+                    db_value = output[i] = projex.text.safe_eval(db_value)
+                except StandardError:
+                    log.exception('Invalid reference found')
+                    raise orb.errors.OrbError('Invalid reference found.')
+
+            if isinstance(db_value, dict):
+                expanded.append(i)
+
+        if expanded:
+            cls = self.referenceModel()
+
+            # update the expansion information to not propagate to references
+            if context:
+                context = context.copy()
+                expand = context.expandtree(cls)
+                sub_expand = expand.pop(self.name(), {})
+                context.expand = context.raw_values['expand'] = sub_expand
+
+            records = cls.inflateMany([output[i] for i in expanded], context=context)
+            for i, record in zip(expanded, records):
+                output[i] = record
+
+        return output
+
     def loadJSON(self, jdata):
         """
         Loads the given JSON information for this column.
@@ -130,6 +188,7 @@ class ReferenceColumn(Column):
 
         # load additional information
         self.__reference = jdata.get('reference') or self.__reference
+        self.__referenceModel = None
         self.__removeAction = jdata.get('removeAction') or self.__removeAction
 
     def random(self):
@@ -149,10 +208,25 @@ class ReferenceColumn(Column):
 
         :return     <Table> || None
         """
-        model = orb.system.model(self.__reference)
-        if not model:
-            raise orb.errors.ModelNotFound(self.__reference)
-        return model
+        revision = orb.system.revision()
+        if self.__referenceModel is None or self.__referenceRevision != revision:
+            model = orb.system.model(self.__reference)
+            if not model:
+                raise orb.errors.ModelNotFound(self.__reference)
+
+            self.__referenceModel = model
+            self.__referenceRevision = revision
+
+        return self.__referenceModel
+
+    def restoresLazily(self):
+        """
+        References are always restored on load, as they may contain expanded record
+        information.
+
+        :return: <bool>
+        """
+        return False
 
     def restore(self, value, context=None):
         """
@@ -172,6 +246,34 @@ class ReferenceColumn(Column):
         else:
             return self._restore(value, context)
 
+    def restoreMany(self, values, context=None):
+        """
+        Returns the inflated value states for a list of values.  When the references
+        should be inflated, all of the referenced records are looked up with a single
+        query rather than one query per value.
+
+        :param values: [<variant>, ..]
+        :param context: <orb.Context>
+
+        :return: [<variant>, ..]
+        """
+        context = context or orb.Context()
+        if self.testFlag(self.Flags.I18n) or not context.inflated:
+            return super(ReferenceColumn, self).restoreMany(values, context=context)
+
+        model = self.referenceModel()
+        keys = list({value for value in values if isinstance(value, (int, long))})
+        records = {}
+        if keys:
+            # only carry over the options that identify where and how to load the records,
+            # the query options of the caller (columns, order, paging, etc.) do not apply
+            lookup_context = orb.Context(**{k: v for k, v in context.raw_values.items() if k in self.LookupOptions})
+            lookup = model.select(where=orb.Query(model).in_(keys), context=lookup_context)
+            records = {record.id(): record for record in lookup.records()}
+
+        return [records.get(value) if isinstance(value, (int, long)) else self.restore(value, context=context)
+                for value in values]
+
     def validate(self, value):
         ref_model = self.referenceModel()
         if isinstance(value, orb.Model) and value.schema().name() != ref_model.schema().name():
@@ -107,6 +107,28 @@ class AbstractStringColumn(Column):
 
         return super(AbstractStringColumn, self).restore(value, context)
 
+    def restoreMany(self, values, context=None):
+        """
+        Restores a list of values from a table cache for usage.
+
+        :param      values  | [<variant>, ..]
+                    context | <orb.Context> || None
+
+        :return     [<variant>, ..]
+        """
+        if self.restore.im_func is not AbstractStringColumn.restore.im_func:
+            return super(AbstractStringColumn, self).restoreMany(values, context=context)
+
+        decoded = projex.text.decoded
+        output = [decoded(value) if isinstance(value, (str, unicode)) else value for value in values]
+
+        if self.testFlag(self.Flags.I18n):
+            context = context or orb.Context()
+            restore = super(AbstractStringColumn, self).restore
+            output = [restore(value, context) for value in output]
+
+        return output
+
     def store(self, value, context=None):
         """
         Converts the value to one that is safe to store on a record within
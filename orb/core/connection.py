@@ -65,6 +65,23 @@ class Connection(AddonManager):
         :param context: <orb.Context>
         """
 
+    @abstractmethod()
+    def aggregate(self, model, context, groupBy, aggregates):
+        """
+        Calculates the aggregates for the records of the inputted model that
+        match the context, grouped by the given columns.  Each row contains the
+        grouped values as `_orb_group_<index>` and the aggregates as
+        `_orb_value_<index>`, as they are stored in the database.  This method is
+        required for every backend, as it is also used to calculate facets.
+
+        :param      model      | <subclass of orb.Model>
+                    context    | <orb.Context>
+                    groupBy    | [<str> column, ..]
+                    aggregates | [(<str> function, <str> column || '*'), ..]
+
+        :return     [{<str> key: <variant> value, ..}, ..]
+        """
+
     @abstractmethod
     def alterModel(self, model, context, add=None, remove=None, owner=''):
         """
@@ -176,6 +193,20 @@ class Connection(AddonManager):
         :return     {<str> columnName: <list> value, ..}
         """
 
+    def estimateCount(self, model, context):
+        """
+        Returns the estimated number of records for the inputted model from the
+        database statistics.  Backends that do not keep statistics, or contexts
+        that cannot be estimated, will return None, in which case the records
+        should be counted instead.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+
+        :return     <int> || None
+        """
+        return None
+
     @abstractmethod()
     def execute(self, command, data=None, flags=0):
         """
@@ -189,6 +220,43 @@ class Connection(AddonManager):
         :return     <variant> returns a native set of information
         """
 
+    def exists(self, model, context):
+        """
+        Returns whether or not any records exist for the inputted model and
+        context.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+
+        :return     <bool>
+        """
+        return self.count(model, context) > 0
+
+    def facets(self, model, context, columns):
+        """
+        Counts the records of the inputted model that match the context for
+        each value of the given columns.  Each row contains the index of the
+        column it was grouped by as `_orb_facet`, the grouped value as
+        `_orb_group_<index>` and the number of records as `count`.  By default,
+        the records are counted per column with the `aggregate` method, backends
+        that can group by all of the columns at once should override this.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+                    columns | [<str> column, ..]
+
+        :return     [{<str> key: <variant> value, ..}, ..]
+        """
+        output = []
+        for index, column in enumerate(columns):
+            for row in self.aggregate(model, context, [column], [('count', '*')]):
+                output.append({
+                    '_orb_facet': index,
+                    '_orb_group_{0}'.format(index): row['_orb_group_0'],
+                    'count': row['_orb_value_0']
+                })
+        return output
+
     @abstractmethod()
     def insert(self, records, context):
         """
@@ -218,6 +286,22 @@ class Connection(AddonManager):
         :return     <bool> connected
         """
 
+    def iterselect(self, model, context, size=500):
+        """
+        Selects the records from the database in chunks of the given size.  By default,
+        all of the records are selected at once and then split, backends that support
+        server-side cursors will fetch each chunk as it is requested.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+                    size    | <int>
+
+        :return     <generator>
+        """
+        records = self.select(model, context)
+        for i in xrange(0, len(records), size):
+            yield records[i:i + size]
+
     @abstractmethod()
     def open(self, force=False):
         """
@@ -249,6 +333,33 @@ class Connection(AddonManager):
         :return     [<variant> result, ..]
         """
 
+    def selectJSON(self, model, context):
+        """
+        Selects the records from the database already serialized to JSON.  Backends
+        that cannot serialize records themselves will return None, in which case the
+        records are selected and serialized by the model.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+
+        :return     [<dict>, ..] || None
+        """
+        return None
+
+    def selectTotal(self, model, context):
+        """
+        Selects the records from the database along with the total number of records
+        that match the context, regardless of its start and limit.  Backends that
+        cannot count the records within the same query will return None for the
+        total.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+
+        :return     ([<dict>, ..] records, <int> || None total)
+        """
+        return self.select(model, context), None
+
     def setup(self, context):
         """
         Initializes the database with any additional information that is required.
@@ -0,0 +1,269 @@
+""" Defines the join planner used to compile dotted column paths into SQL joins. """
+
+import os
+
+from projex.lazymodule import lazy_import
+
+orb = lazy_import('orb')
+
+
+class JoinPlan(object):
+    """
+    Tracks the joins that are required to resolve dotted column paths, such as
+    `user.username`, for a SELECT statement.  Each reference that is walked
+    through is joined once and given an alias based on its path, so multiple
+    columns that share part of a path (for filtering and ordering) will share
+    the same join.
+
+    Only paths made up of references are joined, since a reference points to
+    at most one record and will not duplicate the selected rows.  Paths through
+    collectors should be resolved using correlated EXISTS queries instead.
+    """
+    def __init__(self, model, alias=None, quote=u'"{0}"', namespaces=False):
+        self.__model = model
+        self.__alias = alias or model.schema().dbname()
+        self.__quote = quote
+        self.__namespaces = namespaces
+        self.__aliases = {}
+        self.__joins = []
+
+    def alias(self):
+        """
+        Returns the alias for the base model of this plan.
+
+        :return     <str>
+        """
+        return self.__alias
+
+    def compile(self, model, query, where, aliases=None, references=True):
+        """
+        Compiles a query for a dotted column path into SQL.  Paths through references
+        are resolved to a column from a joined table, and paths through collectors
+        are compiled to correlated EXISTS queries.  If the query cannot be compiled
+        by this plan, then None is returned and the query should be expanded into
+        sub-selects instead.
+
+        :param      model      | <subclass of orb.Model>
+                    query      | <orb.Query>
+                    where      | <callable>(model, query, aliases, joins) -> (<str> sql, <dict> data)
+                    aliases    | {<subclass of orb.Model>: <str>, ..} || None
+                    references | <bool> | whether or not joins can be added for references
+
+        :return     (<str> sql, <dict> data) || None
+        """
+        path = query.columnName()
+        if not isinstance(path, basestring) or '.' not in path or query.model(model) is not model:
+            return None
+
+        aliases = aliases or {}
+        name = path.split('.', 1)[0]
+        schema = model.schema()
+
+        if schema.column(name, raise_=False) is None:
+            collector = schema.collector(name)
+            if collector is None:
+                return None
+            return self.exists(model, collector, query, where, alias=aliases.get(model))
+
+        elif not references or model is not self.__model:
+            return None
+
+        resolved = self.resolve(path)
+        if resolved is None:
+            return None
+
+        rmodel, column, alias = resolved
+        sub_q = query.copy()
+        sub_q._Query__column = column.name()
+        sub_q._Query__model = rmodel
+
+        sub_aliases = dict(aliases)
+        sub_aliases[rmodel] = alias
+        sql, data = where(rmodel, sub_q, sub_aliases, None)
+
+        # a missing reference should not match a null lookup
+        if sql and sub_q.value() is None and sub_q.op() == sub_q.Op.Is:
+            sql = u'({0} AND {1}.{2} IS NOT NULL)'.format(sql,
+                                                         self.quote(alias),
+                                                         self.quote(rmodel.schema().idColumn().field()))
+        return sql, data
+
+    def exists(self, model, collector, query, where, alias=None):
+        """
+        Generates a correlated EXISTS query for a dotted path that starts with the
+        inputted collector, such as `groups.name`.  The remainder of the path is
+        compiled through the `where` callable against the collected model, using
+        its own join plan within the sub-query.  If the collector cannot be
+        compiled to an EXISTS query, then None is returned.
+
+        :param      model     | <subclass of orb.Model> | the model that owns the collector
+                    collector | <orb.Collector>
+                    query     | <orb.Query>
+                    where     | <callable>(model, query, aliases, joins) -> (<str> sql, <dict> data)
+                    alias     | <str> || None | the alias for the outer model
+
+        :return     (<str> sql, <dict> data) || None
+        """
+        if callable(collector.queryFilterMethod()) or collector.testFlag(collector.Flags.Virtual):
+            return None
+
+        outer = self.quote(alias or model.schema().dbname())
+        model_id = self.quote(model.schema().idColumn().field())
+
+        if isinstance(collector, orb.ReverseLookup):
+            target_model = collector.referenceModel()
+            if target_model.baseQuery() is not None:
+                return None
+
+            target_alias = self.subalias(target_model.schema().dbname())
+            source = u'{0} AS {1}'.format(self.table(target_model), self.quote(target_alias))
+            correlate = u'{0}.{1} = {2}.{3}'.format(self.quote(target_alias),
+                                                    self.quote(collector.targetColumn().field()),
+                                                    outer,
+                                                    model_id)
+
+        elif isinstance(collector, orb.Pipe):
+            through = collector.throughModel()
+            target_model = collector.toModel()
+            if through.baseQuery() is not None or target_model.baseQuery() is not None:
+                return None
+
+            through_alias = self.subalias(through.schema().dbname())
+            target_alias = self.subalias(target_model.schema().dbname())
+            source = u'{0} AS {1} INNER JOIN {2} AS {3} ON ({3}.{4} = {1}.{5})'.format(
+                self.table(through),
+                self.quote(through_alias),
+                self.table(target_model),
+                self.quote(target_alias),
+                self.quote(target_model.schema().idColumn().field()),
+                self.quote(collector.toColumn().field())
+            )
+            correlate = u'{0}.{1} = {2}.{3}'.format(self.quote(through_alias),
+                                                    self.quote(collector.fromColumn().field()),
+                                                    outer,
+                                                    model_id)
+
+        else:
+            return None
+
+        sub_q = query.copy()
+        sub_q._Query__column = query.columnName().split('.', 1)[1]
+        sub_q._Query__model = target_model
+
+        sub_plan = JoinPlan(target_model, alias=target_alias, quote=self.__quote, namespaces=self.__namespaces)
+        sub_sql, data = where(target_model, sub_q, {target_model: target_alias}, sub_plan)
+        if sub_sql:
+            correlate += u' AND ' + sub_sql
+
+        sql = u' '.join([u'EXISTS (SELECT 1 FROM {0}'.format(source)] +
+                        sub_plan.joins() +
+                        [u'WHERE {0})'.format(correlate)])
+        return sql, data
+
+    def joins(self):
+        """
+        Returns the JOIN statements that have been generated by this plan.
+
+        :return     [<str>, ..]
+        """
+        return list(self.__joins)
+
+    def model(self):
+        """
+        Returns the base model for this plan.
+
+        :return     <subclass of orb.Model>
+        """
+        return self.__model
+
+    def quote(self, name):
+        """
+        Returns the quoted name for the inputted identifier.
+
+        :param      name | <str>
+
+        :return     <str>
+        """
+        return self.__quote.format(name)
+
+    def resolve(self, path):
+        """
+        Resolves the inputted dotted column path, adding any joins that are required
+        to access the final column.  If the path cannot be joined (it is not dotted,
+        or it walks through a collector, shortcut, filtered or translatable column),
+        then None is returned.
+
+        :param      path | <str>
+
+        :return     (<subclass of orb.Model>, <orb.Column>, <str> alias) || None
+        """
+        if not isinstance(path, basestring) or '.' not in path:
+            return None
+
+        parts = path.split('.')
+        hops = []
+        model = self.__model
+        for part in parts[:-1]:
+            column = model.schema().column(part, raise_=False)
+            if not (isinstance(column, orb.ReferenceColumn) and self.__isPlain(column)):
+                return None
+
+            rmodel = column.referenceModel()
+            if rmodel.baseQuery() is not None:
+                return None
+
+            hops.append((column, rmodel))
+            model = rmodel
+
+        column = model.schema().column(parts[-1], raise_=False)
+        if column is None or not self.__isPlain(column) or column.testFlag(column.Flags.I18n):
+            return None
+
+        alias = self.__alias
+        key = ()
+        for ref_column, rmodel in hops:
+            key += (ref_column.name(),)
+            try:
+                alias = self.__aliases[key]
+            except KeyError:
+                join_alias = self.__aliases[key] = u'_'.join(('join',) + key)
+                self.__joins.append(u'LEFT JOIN {table} AS {alias} ON ({alias}.{id} = {parent}.{field})'.format(
+                    table=self.table(rmodel),
+                    alias=self.quote(join_alias),
+                    id=self.quote(rmodel.schema().idColumn().field()),
+                    parent=self.quote(alias),
+                    field=self.quote(ref_column.field())
+                ))
+                alias = join_alias
+
+        return model, column, alias
+
+    def subalias(self, name):
+        """
+        Generates a new unique alias for a sub-query, such as a correlated EXISTS
+        query, so that it will not collide with any of the outer aliases.
+
+        :param      name | <str>
+
+        :return     <str>
+        """
+        return u'{0}_{1}'.format(name, os.urandom(4).encode('hex'))
+
+    def table(self, model):
+        """
+        Returns the quoted table name for the inputted model.
+
+        :param      model | <subclass of orb.Model>
+
+        :return     <str>
+        """
+        schema = model.schema()
+        if self.__namespaces:
+            return u'{0}.{1}'.format(self.quote(schema.namespace() or 'public'), self.quote(schema.dbname()))
+        else:
+            return self.quote(schema.dbname())
+
+    def __isPlain(self, column):
+        return not (column.shortcut() or
+                    column.testFlag(column.Flags.Virtual) or
+                    callable(column.queryFilterMethod()))
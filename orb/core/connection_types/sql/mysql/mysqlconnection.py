@@ -1,5 +1,6 @@
 """ Defines the backend connection class for PostgreSQL databases. """
 
+import json
 import logging
 import orb
 import re
@@ -30,6 +31,10 @@ class MySQLConnection(SQLConnection):
     Creates a PostgreSQL backend connection type for handling database
     connections to PostgreSQL databases.
     """
+    def __init__(self, *args, **kwds):
+        super(MySQLConnection, self).__init__(*args, **kwds)
+
+        self.__windowFunctions = None
 
     # ----------------------------------------------------------------------
     # PROTECTED METHODS
@@ -55,7 +60,7 @@ class MySQLConnection(SQLConnection):
         if data is None:
             data = {}
 
-        with native.cursor() as cursor:
+        with native.cursor(pymysql.cursors.Cursor) as cursor:
             log.debug('***********************')
             log.debug(command % data)
             log.debug('***********************')
@@ -97,13 +102,73 @@ class MySQLConnection(SQLConnection):
                 raise orb.errors.QueryFailed(command, data, nstr(err))
 
             try:
-                raw = cursor.fetchall()
-                results = [mapper(record) for record in raw]
+                columns = [description[0] for description in cursor.description or []]
+                results = orb.ResultSet(columns, list(cursor.fetchall()))
             except pymysql.ProgrammingError:
-                results = []
+                results = orb.ResultSet()
+
+            if mapper is not None:
+                results = results.mapped(mapper)
 
             return results, rowcount
 
+    def _iterate(self, native, command, data=None, size=500):
+        """
+        Executes the inputted command through an unbuffered cursor, fetching
+        the results from the database in chunks of the given size.
+
+        :param      native  | <variant>
+                    command | <str>
+                    data    | <dict> || None
+                    size    | <int>
+
+        :return     <generator> | <orb.ResultSet>
+        """
+        with native.cursor(pymysql.cursors.SSCursor) as cursor:
+            log.debug('***********************')
+            log.debug(command % data)
+            log.debug('***********************')
+
+            try:
+                cursor.execute(command.strip().rstrip(';') + ';', data)
+                columns = [description[0] for description in cursor.description or []]
+                while True:
+                    rows = cursor.fetchmany(size)
+                    if not rows:
+                        break
+                    yield orb.ResultSet(columns, list(rows))
+
+            # look for a disconnection error
+            except pymysql.InterfaceError:
+                raise orb.errors.ConnectionLost()
+
+            except pymysql.Error as err:
+                native.rollback()
+                raise orb.errors.QueryFailed(command, data, nstr(err))
+
+    def _dropValues(self, native, name):
+        """
+        Drops the temporary table of values with the given name.
+
+        :param      native | <pymysql.Connection>
+                    name   | <str>
+        """
+        native.cursor().execute(u'DROP TEMPORARY TABLE IF EXISTS `{0}`;'.format(name))
+
+    def _loadValues(self, native, name, values):
+        """
+        Creates a temporary table with the given name and loads the inputted values
+        into it, which are inserted as multi-row batches by the cursor.
+
+        :param      native | <pymysql.Connection>
+                    name   | <str>
+                    values | <orb.core.connection_types.sql.valuetable.ValueTable>
+        """
+        typ = u'BIGINT' if values.kind() == 'integer' else u'TEXT'
+        cursor = native.cursor()
+        cursor.execute(u'CREATE TEMPORARY TABLE `{0}` (`value` {1});'.format(name, typ))
+        cursor.executemany(u'INSERT INTO `{0}` (`value`) VALUES (%s)'.format(name), list(values))
+
     def _open(self, db):
         """
         Handles simple, SQL specific connection creation.  This will not
@@ -117,6 +182,10 @@ class MySQLConnection(SQLConnection):
         if not pymysql:
             raise orb.errors.BackendNotFound('psycopg2 is not installed.')
 
+        # decode the json columns, such as expanded records, as they are loaded
+        conversions = pymysql.converters.conversions.copy()
+        conversions[pymysql.FIELD_TYPE.JSON] = json.loads
+
         # create the python connection
         try:
             return pymysql.connect(db=db.name(),
@@ -124,6 +193,7 @@ class MySQLConnection(SQLConnection):
                                    passwd=db.password(),
                                    host=db.host() or 'localhost',
                                    port=db.port() or 3306,
+                                   conv=conversions,
                                    cursorclass=pymysql.cursors.DictCursor)
         except pymysql.OperationalError as err:
             log.exception('Failed to connect to postgres')
@@ -141,6 +211,29 @@ class MySQLConnection(SQLConnection):
         except pymysql.Error:
             pass
 
+    def hasWindowFunctions(self):
+        """
+        Returns whether or not the server supports window functions, which were
+        added in MySQL 8.0 and MariaDB 10.2.  The server version is only looked
+        up the first time this is called.
+
+        :return     <bool>
+        """
+        if self.__windowFunctions is None:
+            rows, _ = self.execute(u'SELECT VERSION() AS `version`')
+            version = (rows[0]['version'] if rows else '').lower()
+
+            # MariaDB versions can be prefixed with the MySQL version they are compatible with
+            if 'mariadb' in version:
+                numbers = re.findall(r'(\d+)\.(\d+)', version.split('mariadb')[0])[-1:]
+                minimum = (10, 2)
+            else:
+                numbers = re.findall(r'(\d+)\.(\d+)', version)[:1]
+                minimum = (8, 0)
+
+            self.__windowFunctions = bool(numbers) and tuple(int(n) for n in numbers[0]) >= minimum
+        return self.__windowFunctions
+
     def schemaInfo(self, context):
         info = super(MySQLConnection, self).schemaInfo(context)
         for v in info.values():
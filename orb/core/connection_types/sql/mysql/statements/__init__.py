@@ -8,6 +8,8 @@ from . import enable_internals
 from . import insert
 from . import schema_info
 from . import select
+from . import select_aggregate
 from . import select_count
+from . import select_expand
 from . import update
 from . import where
\ No newline at end of file
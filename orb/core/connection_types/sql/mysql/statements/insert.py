@@ -21,20 +21,8 @@ class INSERT(MySQLStatement):
 
             # define the
             if not schema in schema_meta:
-                i18n = []
-                standard = []
-                for col in schema.columns().values():
-                    if col.testFlag(col.Flags.Virtual):
-                        continue
-                    if col.testFlag(col.Flags.I18n):
-                        i18n.append(col)
-                    else:
-                        standard.append(col)
-
-                schema_meta[schema] = {'i18n': i18n, 'standard': standard}
-
-            if not schema in schema_meta:
-                schema_meta[schema] = {'i18n': [], 'standard': []}
+                plan = schema.plan()
+                schema_meta[schema] = {'i18n': plan.i18n, 'standard': plan.standard}
 
             for key, columns in schema_meta[schema].items():
                 record_values = {}
@@ -0,0 +1,287 @@
+import projex.text
+
+from projex.decorators import abstractmethod
+from projex.lazymodule import lazy_import
+from ..mysqlconnection import MySQLStatement
+
+orb = lazy_import('orb')
+
+
+class SELECT_EXPAND(MySQLStatement):
+    def __call__(self, obj, tree, alias=''):
+        name, sql, data = self.generateRow(obj, tree, alias=alias)
+        return u'(\n{0}\n) AS `{1}`'.format(sql, name), data
+
+    def collectionFields(self, tree, target_alias, target_id_field, target_json):
+        """
+        Returns the JSON_OBJECT keys and values that are selected for an expanded
+        collection, based on the keywords within the expand tree.  The records are
+        aggregated directly from the target table, rather than from a derived table,
+        as derived tables can only reference the outer query as of MySQL 8.0.14.
+
+        :param      tree            | <dict>
+                    target_alias    | <str>
+                    target_id_field | <str>
+                    target_json     | <str>
+
+        :return     [<str>, ..]
+        """
+        records = u'JSON_ARRAYAGG({0})'.format(target_json)
+
+        fields = []
+        if 'ids' in tree:
+            fields.append(u"'ids', JSON_ARRAYAGG(`{0}`.`{1}`)".format(target_alias, target_id_field))
+        if 'count' in tree:
+            fields.append(u"'count', COUNT(*)")
+        if 'first' in tree:
+            fields.append(u"'first', JSON_EXTRACT({0}, '$[0]')".format(records))
+        if 'last' in tree:
+            fields.append(u"'last', JSON_EXTRACT({0}, '$[last]')".format(records))
+        if 'records' in tree or not fields:
+            fields.append(u"'records', {0}".format(records))
+        return fields
+
+    @abstractmethod()
+    def generateRow(self, obj, tree, alias=''):
+        """
+        Generates the query that selects the expanded json value for the inputted
+        column or collector, correlated against the given source alias.
+
+        :param      obj   | <orb.Column> || <orb.Collector>
+                    tree  | <dict>
+                    alias | <str>
+
+        :return     (<str> name, <str> sql, <dict> data)
+        """
+
+    def generateSubTree(self, model, tree):
+        schema = model.schema()
+
+        expand_col = self.byName('SELECT EXPAND COLUMN')
+        expand_pipe = self.byName('SELECT EXPAND PIPE')
+        expand_rev = self.byName('SELECT EXPAND REVERSE')
+
+        for name, sub_tree in tree.items():
+            # cannot expand these keywords, they are reserved
+            if name in ('ids', 'count', 'records'):
+                continue
+
+            # these are expanded via the sub-tree
+            elif name in ('first', 'last'):
+                for child in self.generateSubTree(model, sub_tree):
+                    yield child
+
+            # otherwise, lookup a column, pipe or reverse lookup
+            else:
+                column = schema.column(name, raise_=False)
+                if column:
+                    if not column.testFlag(column.Flags.Virtual):
+                        yield expand_col, column, sub_tree
+                else:
+                    collector = schema.collector(name)
+                    if collector:
+                        if not collector.testFlag(collector.Flags.Virtual):
+                            if isinstance(collector, orb.Pipe):
+                                yield expand_pipe, collector, sub_tree
+                            elif isinstance(collector, orb.ReverseLookup):
+                                yield expand_rev, collector, sub_tree
+                    else:
+                        raise orb.errors.ColumnNotFound(schema.name(), name)
+
+    def collectSubTree(self, model, tree, alias=''):
+        fields = []
+        data = {}
+        for action, obj, sub_tree in self.generateSubTree(model, tree):
+            name, sub_sql, sub_data = action.generateRow(obj, sub_tree, alias=alias)
+            fields.append(u"'{0}', CAST((\n{1}\n) AS JSON)".format(name, sub_sql))
+            data.update(sub_data)
+        return fields, data
+
+    def generateObject(self, model, tree, alias):
+        """
+        Generates the JSON_OBJECT call for a record of the inputted model, which
+        includes the columns stored in the model's table, the translations for the
+        current locale and any nested expansions.
+
+        :param      model | <subclass of orb.Model>
+                    tree  | <dict>
+                    alias | <str>
+
+        :return     (<str> sql, <dict> data)
+        """
+        schema = model.schema()
+
+        fields = []
+        for column in schema.columns(recurse=False).values():
+            if column.testFlag(column.Flags.Virtual):
+                continue
+            elif column.testFlag(column.Flags.I18n):
+                sql = u"'{0}', (SELECT `{0}` FROM {1} WHERE `{2}_id` = `{3}`.`{4}` AND `locale` = %(locale)s)"
+                fields.append(sql.format(column.field(), self.tableName(schema, u'_i18n'), schema.dbname(), alias, schema.idColumn().field()))
+            else:
+                fields.append(u"'{0}', `{1}`.`{0}`".format(column.field(), alias))
+
+        sub_fields, data = self.collectSubTree(model, tree, alias=alias)
+        return u'JSON_OBJECT({0})'.format(u', '.join(fields + sub_fields)), data
+
+    def tableName(self, schema, suffix=u''):
+        """
+        Returns the quoted table name for the inputted schema, including its
+        namespace when one is defined.
+
+        :param      schema | <orb.Schema>
+                    suffix | <str>
+
+        :return     <str>
+        """
+        if schema.namespace():
+            return u'`{0}`.`{1}{2}`'.format(schema.namespace(), schema.dbname(), suffix)
+        else:
+            return u'`{0}{1}`'.format(schema.dbname(), suffix)
+
+    def generateBaseWhere(self, model, alias):
+        """
+        Generates the filter for the base query of the inputted model, if one
+        is defined.
+
+        :param      model | <subclass of orb.Model>
+                    alias | <str>
+
+        :return     (<str> sql, <dict> data)
+        """
+        query = model.baseQuery()
+        if query is not None:
+            WHERE = self.byName('WHERE')
+            sql, data = WHERE(model, query, aliases={model: alias})
+            if sql:
+                return u'({0}) AND '.format(sql), data
+        return u'', {}
+
+
+class SELECT_EXPAND_COLUMN(SELECT_EXPAND):
+    def generateRow(self, column, tree, alias=''):
+        target = column.referenceModel()
+        target_name = projex.text.underscore(column.name())
+        target_alias = '{0}_table'.format(target_name)
+
+        target_base_where, data = self.generateBaseWhere(target, target_alias)
+        target_json, target_data = self.generateObject(target, tree, target_alias)
+        data.update(target_data)
+
+        # generate the sql options
+        sql_options = {
+            'target_json': target_json,
+            'target_alias': target_alias,
+            'target_id_field': target.schema().idColumn().field(),
+            'target_base_where': target_base_where,
+            'target_table': self.tableName(target.schema()),
+            'source_table': alias or column.schema().dbname(),
+            'source_field': column.field()
+        }
+
+        # generate the sql
+        sql = (
+            u'  SELECT {target_json}\n'
+            u'  FROM {target_table} AS `{target_alias}`\n'
+            u'  WHERE {target_base_where}`{target_alias}`.`{target_id_field}` = `{source_table}`.`{source_field}`'
+        ).format(**sql_options)
+
+        return target_name, sql, data
+
+
+class SELECT_EXPAND_REVERSE(SELECT_EXPAND):
+    def generateRow(self, reversed, tree, alias=''):
+        target = reversed.referenceModel()
+        source = reversed.schema().model()
+
+        target_name = projex.text.underscore(reversed.name())
+        target_alias = '{0}_table'.format(target_name)
+        target_id_field = target.schema().idColumn().field()
+
+        target_base_where, data = self.generateBaseWhere(target, target_alias)
+        target_json, target_data = self.generateObject(target, tree, target_alias)
+        data.update(target_data)
+
+        # define the sql options
+        sql_options = {
+            'target_fields': u', '.join(self.collectionFields(tree, target_alias, target_id_field, target_json)),
+            'target_alias': target_alias,
+            'target_base_where': target_base_where,
+            'target_table': self.tableName(target.schema()),
+            'target_id_field': target_id_field,
+            'source_table': alias or source.schema().dbname(),
+            'source_field': reversed.targetColumn().field(),
+            'source_id_field': source.schema().idColumn().field()
+        }
+
+        # unique lookups only expand the first matching record
+        if reversed.testFlag(reversed.Flags.Unique):
+            sql_options['unique_where'] = (
+                u'\n  AND `{target_alias}`.`{target_id_field}` = (\n'
+                u'      SELECT `u`.`{target_id_field}`\n'
+                u'      FROM {target_table} AS `u`\n'
+                u'      WHERE `u`.`{source_field}` = `{source_table}`.`{source_id_field}`\n'
+                u'      LIMIT 1\n'
+                u'  )'
+            ).format(**sql_options)
+        else:
+            sql_options['unique_where'] = u''
+
+        # define the sql
+        sql = (
+            u'  SELECT JSON_OBJECT({target_fields})\n'
+            u'  FROM {target_table} AS `{target_alias}`\n'
+            u'  WHERE {target_base_where}`{target_alias}`.`{source_field}` = `{source_table}`.`{source_id_field}`'
+            u'{unique_where}'
+        ).format(**sql_options)
+
+        return target_name, sql, data
+
+
+class SELECT_EXPAND_PIPE(SELECT_EXPAND):
+    def generateRow(self, pipe, tree, alias=''):
+        source = pipe.fromModel()
+        through = pipe.throughModel()
+        target = pipe.toModel()
+
+        target_name = projex.text.underscore(pipe.name())
+        target_alias = '{0}_table'.format(target_name)
+        target_id_field = target.schema().idColumn().field()
+
+        target_base_where, data = self.generateBaseWhere(target, target_alias)
+        target_json, target_data = self.generateObject(target, tree, target_alias)
+        data.update(target_data)
+
+        # define the sql options, MySQL does not support LIMIT within an IN sub-query,
+        # so unique pipes compare against a single scalar value instead
+        sql_options = {
+            'target_fields': u', '.join(self.collectionFields(tree, target_alias, target_id_field, target_json)),
+            'target_alias': target_alias,
+            'target_base_where': target_base_where,
+            'target_table': self.tableName(target.schema()),
+            'target_id_field': target_id_field,
+            'target_field': pipe.toColumn().field(),
+            'through_table': self.tableName(through.schema()),
+            'source_table': alias or source.schema().dbname(),
+            'source_id_field': source.schema().idColumn().field(),
+            'source_field': pipe.fromColumn().field(),
+            'through_op': u'=' if pipe.testFlag(pipe.Flags.Unique) else u'IN',
+            'limit_if_unique': u'\n      LIMIT 1' if pipe.testFlag(pipe.Flags.Unique) else u''
+        }
+
+        # define the sql
+        sql = (
+            u'  SELECT JSON_OBJECT({target_fields})\n'
+            u'  FROM {target_table} AS `{target_alias}`\n'
+            u'  WHERE {target_base_where}`{target_alias}`.`{target_id_field}` {through_op} (\n'
+            u'      SELECT `t`.`{target_field}`\n'
+            u'      FROM {through_table} AS `t`\n'
+            u'      WHERE `t`.`{source_field}` = `{source_table}`.`{source_id_field}`{limit_if_unique}\n'
+            u'  )'
+        ).format(**sql_options)
+
+        return target_name, sql, data
+
+MySQLStatement.registerAddon('SELECT EXPAND COLUMN', SELECT_EXPAND_COLUMN())
+MySQLStatement.registerAddon('SELECT EXPAND REVERSE', SELECT_EXPAND_REVERSE())
+MySQLStatement.registerAddon('SELECT EXPAND PIPE', SELECT_EXPAND_PIPE())
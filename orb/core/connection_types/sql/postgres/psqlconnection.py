@@ -6,6 +6,7 @@ import os
 import orb
 import re
 import traceback
+import uuid
 
 from projex.text import nativestring as nstr
 
@@ -16,14 +17,13 @@ log = logging.getLogger(__name__)
 
 try:
     import psycopg2 as pg
-    from psycopg2.extras import DictCursor, register_hstore, register_json
+    from psycopg2.extras import register_hstore, register_json
     from psycopg2.extensions import QueryCanceledError
 
 except ImportError:
     log.debug('For PostgreSQL backend, download the psycopg2 module')
 
     QueryCanceledError = orb.errors.DatabaseError
-    DictCursor = None
     register_hstore = None
     register_json = None
     pg = None
@@ -64,7 +64,7 @@ class PSQLConnection(SQLConnection):
         if data is None:
             data = {}
 
-        cursor = native.cursor(cursor_factory=DictCursor)
+        cursor = native.cursor()
 
         # register the hstore option
         try:
@@ -150,12 +150,96 @@ class PSQLConnection(SQLConnection):
             raise orb.errors.QueryFailed(command, data, nstr(err))
 
         try:
-            results = [mapper(record) for record in cursor.fetchall()]
+            columns = [description[0] for description in cursor.description or []]
+            results = orb.ResultSet(columns, cursor.fetchall())
         except pg.ProgrammingError:
-            results = []
+            results = orb.ResultSet()
+
+        if mapper is not None:
+            results = results.mapped(mapper)
 
         return results, rowcount
 
+    def _iterate(self, native, command, data=None, size=500):
+        """
+        Executes the inputted command through a server-side cursor, fetching
+        the results from the database in chunks of the given size.
+
+        :param      native  | <variant>
+                    command | <str>
+                    data    | <dict> || None
+                    size    | <int>
+
+        :return     <generator> | <orb.ResultSet>
+        """
+        cursor = native.cursor(name='orb_{0}'.format(uuid.uuid4().hex))
+        cursor.itersize = size
+
+        try:
+            register_hstore(cursor, unicode=True)
+        except pg.ProgrammingError:
+            log.warning('HSTORE is not supported in this version of Postgres!')
+
+        try:
+            register_json(cursor)
+        except pg.ProgrammingError:
+            log.warning('JSON is not supported in this version of Postgres!')
+
+        log.debug('***********************')
+        log.debug(command % data)
+        log.debug('***********************')
+
+        try:
+            cursor.execute(command.rstrip(';'), data)
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+
+                columns = [description[0] for description in cursor.description]
+                yield orb.ResultSet(columns, rows)
+
+        # look for a disconnection error
+        except pg.InterfaceError:
+            raise orb.errors.ConnectionLost()
+
+        except pg.Error as err:
+            try:
+                native.rollback()
+            except StandardError:
+                pass
+
+            raise orb.errors.QueryFailed(command, data, nstr(err))
+
+        finally:
+            if not cursor.closed:
+                cursor.close()
+
+    def _dropValues(self, native, name):
+        """
+        Drops the temporary table of values with the given name.
+
+        :param      native | <psycopg2.connection>
+                    name   | <str>
+        """
+        self._execute(native, u'DROP TABLE IF EXISTS "{0}";'.format(name), {}, False, None)
+
+    def _loadValues(self, native, name, values):
+        """
+        Creates a temporary table with the given name and loads the inputted values
+        into it from a single array parameter, analyzing the table afterwards so the
+        planner can choose how to join against it.
+
+        :param      native | <psycopg2.connection>
+                    name   | <str>
+                    values | <orb.core.connection_types.sql.valuetable.ValueTable>
+        """
+        typ = u'BIGINT' if values.kind() == 'integer' else u'TEXT'
+        sql = u'CREATE TEMPORARY TABLE "{0}" ("value" {1}) ON COMMIT DROP;\n' \
+              u'INSERT INTO "{0}" ("value") SELECT unnest(%(values)s::{1}[]);\n' \
+              u'ANALYZE "{0}";'.format(name, typ)
+        self._execute(native, sql, {'values': list(values)}, False, None)
+
     def _open(self, db):
         """
         Handles simple, SQL specific connection creation.  This will not
@@ -19,7 +19,9 @@ class CREATE_INDEX(PSQLStatement):
         index_name = index.dbname()
         cmd = 'CREATE' if not index.testFlag(index.Flags.Unique) else 'CREATE UNIQUE'
 
-        cols = ['lower("{0}"::varchar)'.format(col.field())
+        # case-insensitive columns are indexed by their lowercase value, using the pattern
+        # operators so the index supports both equality and prefix (LIKE 'abc%') lookups
+        cols = ['lower("{0}"::varchar) text_pattern_ops'.format(col.field())
                 if isinstance(col, orb.AbstractStringColumn) and not col.testFlag(col.Flags.CaseSensitive)
                 else '"{0}"'.format(col.field())
                 for col in index.columns()]
@@ -1,5 +1,6 @@
 from collections import defaultdict
 from projex.lazymodule import lazy_import
+from ...joinplan import JoinPlan
 from ..psqlconnection import PSQLStatement
 
 orb = lazy_import('orb')
@@ -9,7 +10,7 @@ class SELECT(PSQLStatement):
     def cmpcol(self, col_a, col_b):
         return cmp(col_a.field(), col_b.field())
 
-    def __call__(self, model, context, fields=None):
+    def __call__(self, model, context, fields=None, total=False):
         EXPAND_COL = self.byName('SELECT EXPAND COLUMN')
         EXPAND_PIPE = self.byName('SELECT EXPAND PIPE')
         EXPAND_REV = self.byName('SELECT EXPAND REVERSE')
@@ -22,26 +23,44 @@ class SELECT(PSQLStatement):
             if base_where:
                 where = base_where & where
 
+        # normalize the query before it is compiled, a query that will not match any
+        # records does not need to be run
+        if where is not None:
+            try:
+                where = where.optimize()
+            except orb.errors.QueryIsNull:
+                return u'', {}
+
         # determine what to expand
         schema = model.schema()
         expand = context.expandtree(model)
         expanded = bool(expand)
-        columns = [schema.column(c) for c in context.columns] if context.columns else schema.columns().values()
+        columns = context.queryColumns(schema)
+
+        # determine how to expand, lateral joins are opted into for paged results
+        # so the expansions are only evaluated for the selected page of records
+        strategy = context.expandStrategy or 'subquery'
+        lateral = expanded and strategy == 'lateral' and not context.distinct
 
         data = {
             'locale': context.locale,
             'default_locale': orb.system.settings().default_locale
         }
         fields = fields or {}
+        joins = JoinPlan(model, namespaces=True)
         sql_group_by = set()
         sql_columns = defaultdict(list)
-        sql_joins = []
+        output_fields = []
+        lateral_columns = []
+        lateral_joins = []
 
         # process columns to select
         for column in sorted(columns, self.cmpcol):
             if column.testFlag(column.Flags.Virtual):
                 continue
 
+            output_fields.append(column.field())
+
             if column.testFlag(column.Flags.I18n):
                 if context.locale == 'all':
                     sql = u'hstore_agg(hstore("i18n"."locale", "i18n"."{0}")) AS "{0}"'
@@ -57,10 +76,16 @@ class SELECT(PSQLStatement):
                 # expand a reference
                 if isinstance(column, orb.ReferenceColumn) and column.name() in expand:
                     sub_tree = expand.pop(column.name())
-                    sql, sub_data = EXPAND_COL(column, sub_tree)
-                    if sql:
-                        sql_columns['standard'].append(sql)
+                    if lateral:
+                        sql, join, sub_data = EXPAND_COL.lateral(column, sub_tree, alias=schema.dbname())
+                        lateral_columns.append(sql)
+                        lateral_joins.append(join)
                         data.update(sub_data)
+                    else:
+                        sql, sub_data = EXPAND_COL(column, sub_tree)
+                        if sql:
+                            sql_columns['standard'].append(sql)
+                            data.update(sub_data)
 
                 # select the base record
                 sql_columns['standard'].append(u'"{0}"."{1}" AS "{1}"'.format(schema.dbname(),
@@ -76,13 +101,22 @@ class SELECT(PSQLStatement):
 
                     sub_tree = expand.pop(collector.name(), None)
                     if isinstance(collector, orb.Pipe):
-                        sql, sub_data = EXPAND_PIPE(collector, sub_tree, alias=schema.dbname())
+                        expander = EXPAND_PIPE
                     elif isinstance(collector, orb.ReverseLookup):
-                        sql, sub_data = EXPAND_REV(collector, sub_tree, alias=schema.dbname())
+                        expander = EXPAND_REV
+                    else:
+                        continue
 
-                    if sql:
-                        sql_columns['standard'].append(sql)
+                    if lateral:
+                        sql, join, sub_data = expander.lateral(collector, sub_tree, alias=schema.dbname())
+                        lateral_columns.append(sql)
+                        lateral_joins.append(join)
                         data.update(sub_data)
+                    else:
+                        sql, sub_data = expander(collector, sub_tree, alias=schema.dbname())
+                        if sql:
+                            sql_columns['standard'].append(sql)
+                            data.update(sub_data)
 
                 if not expand:
                     break
@@ -91,11 +125,23 @@ class SELECT(PSQLStatement):
         sql_order_by = []
         if context.order:
             for col, dir in context.order:
-                column = schema.column(col)
-                if not column:
-                    raise orb.errors.ColumnNotFound(col)
+                joined = joins.resolve(col)
+                if joined:
+                    _, column, alias = joined
+                    field = u'"{0}"."{1}"'.format(alias, column.field())
+                elif isinstance(col, orb.Query):
+                    # order by the result of the query's functions
+                    if '.' in col.columnName():
+                        raise orb.errors.QueryInvalid('Could not order by {0}'.format(col.columnName()))
+                    field = WHERE.generateField(model, col.column(model), col, {}, data)
+                elif isinstance(col, basestring) and '.' in col:
+                    raise orb.errors.QueryInvalid('Could not order by {0}'.format(col))
+                else:
+                    column = schema.column(col)
+                    if not column:
+                        raise orb.errors.ColumnNotFound(col)
 
-                field = fields.get(column) or u'"{0}"."{1}"'.format(schema.dbname(), column.field())
+                    field = fields.get(column) or u'"{0}"."{1}"'.format(schema.dbname(), column.field())
                 if sql_group_by:
                     sql_group_by.add(field)
                 sql_order_by.append(u'{0} {1}'.format(field, dir.upper()))
@@ -103,6 +149,29 @@ class SELECT(PSQLStatement):
                 if context.distinct is True:
                     sql_columns['standard'].append(field)
 
+        # generate sql statements
+        try:
+            sql_where, sql_where_data = WHERE(model, where, fields=fields, joins=joins)
+        except orb.errors.QueryIsNull:
+            return u'', {}
+        else:
+            data.update(sql_where_data)
+
+        # join in any references that are used for filtering or ordering
+        sql_joins = joins.joins()
+
+        # the lateral joins are made against the selected page of records, which keeps
+        # its ordering through a row number
+        if lateral:
+            expanded = False
+            if sql_order_by:
+                sql_columns['order'].append(u'row_number() OVER (ORDER BY {0}) AS "_orb_row"'.format(', '.join(sql_order_by)))
+
+        # count the total records alongside the page, the window is evaluated before the
+        # limit is applied (this is not possible when the page is selected by a sub-query)
+        if total and not expanded and not context.distinct:
+            sql_columns['total'].append(u'COUNT(*) OVER () AS "_orb_total"')
+
         if context.distinct is True:
             cmd = ['SELECT DISTINCT {0} FROM "{1}"'.format(', '.join(sql_columns['standard'] + sql_columns['i18n']),
                                                            schema.dbname())]
@@ -121,14 +190,10 @@ class SELECT(PSQLStatement):
                                                                     schema.dbname())]
             sql_order_by = on_ + sql_order_by
         else:
-            cmd = [u'SELECT {0} FROM "{1}"."{2}"'.format(', '.join(sql_columns['standard'] + sql_columns['i18n']),
+            cmd = [u'SELECT {0} FROM "{1}"."{2}"'.format(', '.join(sql_columns['standard'] + sql_columns['i18n'] + sql_columns['order'] + sql_columns['total']),
                                                          schema.namespace() or 'public',
                                                          schema.dbname())]
 
-        # add sql joins to the statement
-        if sql_joins:
-            cmd += sql_joins
-
         # join in the i18n table
         if sql_columns['i18n']:
             if context.locale == 'all':
@@ -140,17 +205,13 @@ class SELECT(PSQLStatement):
                     sql += u'\nLEFT JOIN "{1}_i18n" AS "i18n_default" ON ("i18n_default"."{1}_id" = "id" AND "i18n_default"."locale" = %(default_locale)s)'
                 cmd.append(sql.format(schema.namespace() or 'public', schema.dbname()))
 
-        # generate sql statements
-        try:
-            sql_where, sql_where_data = WHERE(model, where, fields=fields)
-        except orb.errors.QueryIsNull:
-            sql_where, sql_where_data = '', {}
-        else:
-            data.update(sql_where_data)
+        # add sql joins to the statement
+        if sql_joins and not expanded:
+            cmd += sql_joins
 
         if expanded:
             if sql_order_by:
-                distinct = u'ON ({0})'.format(', '.join((order.split(' ')[0] for order in sql_order_by)))
+                distinct = u'ON ({0})'.format(', '.join((order.rsplit(' ', 1)[0] for order in sql_order_by)))
             else:
                 distinct = ''
 
@@ -166,10 +227,12 @@ class SELECT(PSQLStatement):
                     sql = u'LEFT JOIN "{0}"."{1}_i18n" AS "i18n" ON ("i18n"."{1}_id" = "id" AND "i18n"."locale" = %(locale)s)'
                     cmd.append('    ' + sql.format(schema.namespace() or 'public', schema.dbname()))
 
+            cmd += [u'    ' + join for join in sql_joins]
+
             if sql_where:
                 cmd.append(u'    WHERE {0}'.format(sql_where))
             if sql_group_by:
-                cmd.append(u'    GROUP BY {0}'.format(', '.join(list(sql_group_by) + [order.split(' ')[0] for order in sql_order_by])))
+                cmd.append(u'    GROUP BY {0}'.format(', '.join(list(sql_group_by) + [order.rsplit(' ', 1)[0] for order in sql_order_by])))
             if sql_order_by:
                 cmd.append(u'    ORDER BY {0}'.format(', '.join(sql_order_by)))
             if context.start:
@@ -200,6 +263,18 @@ class SELECT(PSQLStatement):
                     raise orb.errors.DatabaseError('Invalid value provided for limit')
                 cmd.append(u'LIMIT {0}'.format(context.limit))
 
+        if lateral:
+            outer_columns = [u'"{0}"."{1}"'.format(schema.dbname(), field) for field in output_fields]
+            if sql_columns['total']:
+                outer_columns.append(u'"{0}"."_orb_total"'.format(schema.dbname()))
+            cmd = [u'SELECT {0} FROM ('.format(', '.join(outer_columns + lateral_columns))] + \
+                  [u'    ' + line for line in u'\n'.join(cmd).split(u'\n')] + \
+                  [u') AS "{0}"'.format(schema.dbname())] + \
+                  lateral_joins
+
+            if sql_columns['order']:
+                cmd.append(u'ORDER BY "{0}"."_orb_row"'.format(schema.dbname()))
+
         return u'\n'.join(cmd), data
 
 PSQLStatement.registerAddon('SELECT', SELECT())
\ No newline at end of file
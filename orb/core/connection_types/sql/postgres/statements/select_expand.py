@@ -1,6 +1,7 @@
 import os
 import projex.text
 
+from projex.decorators import abstractmethod
 from projex.lazymodule import lazy_import
 from ..psqlconnection import PSQLStatement
 
@@ -8,6 +9,80 @@ orb = lazy_import('orb')
 
 
 class SELECT_EXPAND(PSQLStatement):
+    def __call__(self, obj, tree, alias=''):
+        name, sql, data = self.generateRow(obj, tree, alias=alias)
+        return u'(\n{0}\n) AS "{1}"'.format(sql, name), data
+
+    def collectionFields(self, tree, records_alias, id_field, lateral=False):
+        """
+        Returns the aggregate fields that are selected for an expanded collection,
+        based on the keywords within the expand tree.  The lateral strategy builds
+        the records with json_agg, while the sub-select strategy collects them into
+        an array of json rows.
+
+        :param      tree          | <dict>
+                    records_alias | <str>
+                    id_field      | <str>
+                    lateral       | <bool>
+
+        :return     [<str>, ..]
+        """
+        fields = []
+        if lateral:
+            if 'ids' in tree:
+                fields.append(u'json_agg({0}.{1}) AS ids'.format(records_alias, id_field))
+            if 'count' in tree:
+                fields.append(u'count({0}.*) AS count'.format(records_alias))
+            if 'first' in tree:
+                fields.append(u'(json_agg({0}.*) -> 0) AS first'.format(records_alias))
+            if 'last' in tree:
+                fields.append(u'(json_agg({0}.*) -> (count({0}.*)::int - 1)) AS last'.format(records_alias))
+            if 'records' in tree or not fields:
+                fields.append(u'json_agg({0}.*) AS records'.format(records_alias))
+        else:
+            if 'ids' in tree:
+                fields.append(u'array_agg({0}.{1}) AS ids'.format(records_alias, id_field))
+            if 'count' in tree:
+                fields.append(u'count({0}.*) AS count'.format(records_alias))
+            if 'first' in tree:
+                fields.append(u'(array_agg(row_to_json({0}.*)))[1] AS first'.format(records_alias))
+            if 'last' in tree:
+                fields.append(u'(array_agg(row_to_json({0}.*)))[1][count({0}.*)] AS last'.format(records_alias))
+            if 'records' in tree or not fields:
+                fields.append(u'array_agg(row_to_json({0}.*)) AS records'.format(records_alias))
+        return fields
+
+    @abstractmethod()
+    def generateRow(self, obj, tree, alias='', lateral=False):
+        """
+        Generates the query that selects the expanded json value for the inputted
+        column or collector, correlated against the given source alias.
+
+        :param      obj     | <orb.Column> || <orb.Collector>
+                    tree    | <dict>
+                    alias   | <str>
+                    lateral | <bool>
+
+        :return     (<str> name, <str> sql, <dict> data)
+        """
+
+    def lateral(self, obj, tree, alias=''):
+        """
+        Generates the expansion for the inputted column or collector as a lateral
+        join, which is evaluated once for each selected row, along with the column
+        that selects the expanded value from it.
+
+        :param      obj   | <orb.Column> || <orb.Collector>
+                    tree  | <dict>
+                    alias | <str>
+
+        :return     (<str> column, <str> join, <dict> data)
+        """
+        name, sql, data = self.generateRow(obj, tree, alias=alias, lateral=True)
+        join = u'LEFT JOIN LATERAL (\n{0}\n) AS "{1}_lateral" ON true'.format(sql, name)
+        column = u'"{0}_lateral"."json" AS "{0}"'.format(name)
+        return column, join, data
+
     def generateSubTree(self, model, tree):
         schema = model.schema()
 
@@ -58,7 +133,7 @@ class SELECT_EXPAND(PSQLStatement):
 
 
 class SELECT_EXPAND_COLUMN(SELECT_EXPAND):
-    def __call__(self, column, tree, alias=''):
+    def generateRow(self, column, tree, alias='', lateral=False):
         data = {}
         target = column.referenceModel()
         translation_columns = target.schema().columns(flags=orb.Column.Flags.I18n).values()
@@ -140,23 +215,21 @@ class SELECT_EXPAND_COLUMN(SELECT_EXPAND):
 
         # generate the sql
         sql = (
-            u'(\n'
-            u'  SELECT row_to_json({target_name}_row) FROM\n'
+            u'  SELECT row_to_json({target_name}_row) AS "json" FROM\n'
             u'  (\n'
             u'      SELECT {target_data} {target_expand}\n'
             u'      FROM "{target_namespace}"."{target_table}" AS "{target_alias}"\n'
             u'      {target_i18n}\n'
             u'      WHERE {target_base_where} "{target_alias}"."{target_id_field}" = "{source_table}"."{source_field}"\n'
             u'      {target_i18n_grouping}'
-            u'  ) AS {target_name}_row\n'
-            u') AS "{target_name}"'
+            u'  ) AS {target_name}_row'
         ).format(**sql_options)
 
-        return sql, data
+        return target_name, sql, data
 
 
 class SELECT_EXPAND_REVERSE(SELECT_EXPAND):
-    def __call__(self, reversed, tree, alias=''):
+    def generateRow(self, reversed, tree, alias='', lateral=False):
         data = {}
         target = reversed.referenceModel()
         source = reversed.schema().model()
@@ -165,7 +238,6 @@ class SELECT_EXPAND_REVERSE(SELECT_EXPAND):
         target_records_alias = '{0}_records'.format(target_name)
         target_alias = '{0}_table'.format(target_name)
         has_translations = target.schema().hasTranslations()
-        target_fields = []
 
         # get the base table query
         target_q = target.baseQuery()
@@ -181,16 +253,10 @@ class SELECT_EXPAND_REVERSE(SELECT_EXPAND):
             target_base_where = ''
 
         # collect keywords
-        if 'ids' in tree:
-            target_fields.append(u'array_agg({0}.{1}) AS ids'.format(target_records_alias, target.schema().idColumn().field()))
-        if 'count' in tree:
-            target_fields.append(u'count({0}.*) AS count'.format(target_records_alias))
-        if 'first' in tree:
-            target_fields.append(u'(array_agg(row_to_json({0}.*)))[1] AS first'.format(target_records_alias))
-        if 'last' in tree:
-            target_fields.append(u'(array_agg(row_to_json({0}.*)))[1][count({0}.*)] AS last'.format(target_records_alias))
-        if 'records' in tree or not target_fields:
-            target_fields.append(u'array_agg(row_to_json({0}.*)) AS records'.format(target_records_alias))
+        target_fields = self.collectionFields(tree,
+                                              target_records_alias,
+                                              target.schema().idColumn().field(),
+                                              lateral=lateral)
 
         if has_translations:
             target_data = u'"{target_alias}".*, "{target_alias}_i18n".*'.format(target_alias=target_alias)
@@ -228,8 +294,7 @@ class SELECT_EXPAND_REVERSE(SELECT_EXPAND):
 
         # define the sql
         sql = (
-            u'(\n'
-            u'  SELECT row_to_json({target_name}_row) FROM (\n'
+            u'  SELECT row_to_json({target_name}_row) AS "json" FROM (\n'
             u'      SELECT {target_fields}\n'
             u'      FROM (\n'
             u'          SELECT {target_data} {target_expand}\n'
@@ -238,15 +303,14 @@ class SELECT_EXPAND_REVERSE(SELECT_EXPAND):
             u'          WHERE {target_base_where} "{target_alias}"."{source_field}" = "{source_table}"."{source_id_field}"\n'
             u'          {limit_if_unique}'
             u'      ) AS {target_records_alias}\n'
-            u'  ) AS {target_name}_row\n'
-            u') AS "{target_name}"'
+            u'  ) AS {target_name}_row'
         ).format(**sql_options)
 
-        return sql, data
+        return target_name, sql, data
 
 
 class SELECT_EXPAND_PIPE(SELECT_EXPAND):
-    def __call__(self, pipe, tree, alias=''):
+    def generateRow(self, pipe, tree, alias='', lateral=False):
         WHERE = self.byName('WHERE')
 
         data = {}
@@ -259,19 +323,11 @@ class SELECT_EXPAND_PIPE(SELECT_EXPAND):
         target = pipe.toModel()
         target_records_alias = projex.text.underscore(pipe.name()) + '_records'
 
-        target_fields = []
-
         # collect keywords
-        if 'ids' in tree:
-            target_fields.append(u'array_agg({0}.{1}) AS ids'.format(target_records_alias, target.schema().idColumn().field()))
-        if 'count' in tree:
-            target_fields.append(u'count({0}.*) AS count'.format(target_records_alias))
-        if 'first' in tree:
-            target_fields.append(u'(array_agg(row_to_json({0}.*)))[1] AS first'.format(target_records_alias))
-        if 'last' in tree:
-            target_fields.append(u'(array_agg(row_to_json({0}.*)))[1][count({0}.*)] AS last'.format(target_records_alias))
-        if 'records' in tree or not target_fields:
-            target_fields.append(u'array_agg(row_to_json({0}.*)) AS records'.format(target_records_alias))
+        target_fields = self.collectionFields(tree,
+                                              target_records_alias,
+                                              target.schema().idColumn().field(),
+                                              lateral=lateral)
 
         # define the sql options
         target_name = projex.text.underscore(pipe.name())
@@ -330,8 +386,7 @@ class SELECT_EXPAND_PIPE(SELECT_EXPAND):
 
         # define the sql
         sql = (
-            u'(\n'
-            u'  SELECT row_to_json({target_name}_row) FROM ('
+            u'  SELECT row_to_json({target_name}_row) AS "json" FROM (\n'
             u'      SELECT {target_fields}\n'
             u'      FROM (\n'
             u'          SELECT {target_data} {target_expand}\n'
@@ -344,11 +399,10 @@ class SELECT_EXPAND_PIPE(SELECT_EXPAND):
             u'              {limit_if_unique}\n'
             u'          )\n'
             u'      ) {target_records_alias}\n'
-            u'  ) {target_name}_row\n'
-            u') AS "{target_name}"'
+            u'  ) {target_name}_row'
         ).format(**sql_options)
 
-        return sql, data
+        return target_name, sql, data
 
 PSQLStatement.registerAddon('SELECT EXPAND COLUMN', SELECT_EXPAND_COLUMN())
 PSQLStatement.registerAddon('SELECT EXPAND REVERSE', SELECT_EXPAND_REVERSE())
@@ -0,0 +1,16 @@
+from projex.lazymodule import lazy_import
+from ..psqlconnection import PSQLStatement
+
+orb = lazy_import('orb')
+
+
+class SELECT_JSON(PSQLStatement):
+    def __call__(self, model, context):
+        SELECT = self.byName('SELECT')
+        sql, data = SELECT(model, context)
+        if sql:
+            sql = 'SELECT row_to_json("records") AS "json" FROM ({0}) AS "records";'.format(sql.rstrip().rstrip(';'))
+        return sql, data
+
+
+PSQLStatement.registerAddon('SELECT JSON', SELECT_JSON())
@@ -29,11 +29,12 @@ class UPDATE(PSQLStatement):
         i18n_values = defaultdict(list)
         i18n_keys = defaultdict(list)
 
+        plan = record.schema().plan()
         for column in changes:
-            if column.testFlag(column.Flags.Virtual):
+            if column not in plan.storedSet:
                 continue
 
-            if column.testFlag(column.Flags.I18n):
+            if column in plan.i18nSet:
                 for record_locale, value in record.get(column, locale='all').items():
                     value_key = '{0}_{1}'.format(column.field(), os.urandom(4).encode('hex'))
                     data[value_key] = column.dbStore('Postgres', value)
@@ -1,18 +1,35 @@
 import os
 from projex.lazymodule import lazy_import
+from ...joinplan import JoinPlan
+from ...valuetable import ValueTable
 from ..psqlconnection import PSQLStatement
 
 orb = lazy_import('orb')
 
 
 class WHERE(PSQLStatement):
-    def __call__(self, model, query, aliases=None, fields=None):
+    # lists with more values than this are loaded into a temporary table
+    ValueTableThreshold = 10000
+
+    def __call__(self, model, query, aliases=None, fields=None, joins=None):
         if query is None or model is None:
             return u'', {}
 
         aliases = aliases or {}
         fields = fields or {}
         data = {}
+
+        # compile dotted paths to joins and correlated EXISTS queries when possible
+        if isinstance(query, orb.Query):
+            planner = joins or JoinPlan(model, alias=aliases.get(model), namespaces=True)
+            compiled = planner.compile(model,
+                                       query,
+                                       lambda m, q, a, j: self(m, q, aliases=a, joins=j),
+                                       aliases=aliases,
+                                       references=joins is not None)
+            if compiled is not None:
+                return compiled
+
         query = query.expand(model)
         if query is None:
             return u'', {}
@@ -21,7 +38,7 @@ class WHERE(PSQLStatement):
         if isinstance(query, orb.QueryCompound):
             sub_query_sql = []
             for sub_query in query:
-                sub_sql, sub_data = self(model, sub_query, aliases, fields)
+                sub_sql, sub_data = self(model, sub_query, aliases, fields, joins)
                 if sub_sql:
                     sub_query_sql.append(sub_sql)
                     data.update(sub_data)
@@ -47,8 +64,9 @@ class WHERE(PSQLStatement):
                 else:
                     raise
 
-            # generate the sql field
-            field = fields.get(column) or self.generateField(model, column, query, aliases)
+            # generate the sql field, using the expression from the index for case-insensitive lookups
+            index_field = self.indexField(model, column, query, aliases) if column not in fields else None
+            field = fields.get(column) or index_field or self.generateField(model, column, query, aliases, data)
             value_key = u'{0}_{1}'.format(column.field(), os.urandom(4).encode('hex'))
 
             # calculate any math operations to the sql field
@@ -62,7 +80,7 @@ class WHERE(PSQLStatement):
             invert = query.isInverted()
 
             try:
-                sql_op = self.opSql(op, case_sensitive)
+                sql_op = self.opSql(op, case_sensitive or index_field is not None)
             except KeyError:
                 raise orb.errors.QueryInvalid('{0} is an unknown operator'.format(orb.Query.Op(op)))
 
@@ -80,7 +98,7 @@ class WHERE(PSQLStatement):
             if isinstance(value, (orb.Query, orb.QueryCompound)):
                 val_model = value.model()
                 val_column = value.column()
-                val_field = self.generateField(val_model, val_column, value, aliases)
+                val_field = self.generateField(val_model, val_column, value, aliases, data)
                 if invert:
                     sql = u' '.join((val_field, sql_op, field))
                 else:
@@ -105,8 +123,12 @@ class WHERE(PSQLStatement):
                 if sub_sql:
                     sql = u'{0} {1} ({2})'.format(field, sql_op, sub_sql.strip(';'))
                     data.update(sub_data)
+
+                # a sub-query that cannot match any records leaves nothing to compare against
+                elif op == orb.Query.Op.IsNotIn:
+                    sql = u'1 = 1'
                 else:
-                    raise orb.errors.QueryInvalid('Could not create sub-query')
+                    sql = u'1 = 0'
 
             # convert all other data
             else:
@@ -119,13 +141,21 @@ class WHERE(PSQLStatement):
                 elif op in (orb.Query.Op.Endswith, orb.Query.Op.DoesNotEndwith):
                     value = u'%{0}'.format(value)
 
-                if invert:
-                    opts = (u'%({0})s'.format(value_key), sql_op, field)
+                if op in (orb.Query.Op.IsIn, orb.Query.Op.IsNotIn) and not invert:
+                    sql, list_data = self.listSql(field, op, value, value_key)
+                    data.update(list_data)
                 else:
-                    opts = (field, sql_op, u'%({0})s'.format(value_key))
+                    sql_value = u'%({0})s'.format(value_key)
+                    if index_field is not None:
+                        sql_value = u'lower({0})'.format(sql_value)
 
-                sql = u' '.join(opts)
-                data[value_key] = value
+                    if invert:
+                        opts = (sql_value, sql_op, field)
+                    else:
+                        opts = (field, sql_op, sql_value)
+
+                    sql = u' '.join(opts)
+                    data[value_key] = value
 
                 if column.testFlag(column.Flags.I18n) and column not in fields:
                     model_name = aliases.get(model) or model.schema().dbname()
@@ -143,7 +173,7 @@ class WHERE(PSQLStatement):
 
         return sql, data
 
-    def generateField(self, model, column, query, aliases):
+    def generateField(self, model, column, query, aliases, data=None):
         alias = aliases.get(model) or model.schema().dbname()
         field = column.field()
 
@@ -151,15 +181,75 @@ class WHERE(PSQLStatement):
 
         # process any functions on the query
         for func in query.functions():
-            try:
-                sql_func = self.funcSql(func)
-                sql_field = sql_func.format(sql_field)
-            except KeyError:
-                msg = 'Unknown function type: {0}'.format(orb.Query.Function(func))
-                raise orb.errors.QueryInvalid(msg)
+            sql_field = self.funcSql(model, func, sql_field, aliases, data)
 
         return sql_field
 
+    def indexField(self, model, column, query, aliases):
+        """
+        Returns the field expression that matches the index created for case-insensitive
+        string columns (`lower("column"::varchar)`) when the query is a case-insensitive
+        lookup that can use it, otherwise None is returned.
+
+        :param      model   | <subclass of orb.Model>
+                    column  | <orb.Column>
+                    query   | <orb.Query>
+                    aliases | {<subclass of orb.Model>: <str>, ..}
+
+        :return     <str> || None
+        """
+        if (not isinstance(column, orb.AbstractStringColumn) or
+                column.testFlag(column.Flags.CaseSensitive) or
+                column.testFlag(column.Flags.I18n) or
+                query.math() or
+                query.isInverted() or
+                not isinstance(query.value(), basestring)):
+            return None
+
+        op = query.op()
+        functions = list(query.functions())
+        lower = [orb.Query.Function.Lower]
+
+        if op in (orb.Query.Op.Is, orb.Query.Op.IsNot) and functions == lower:
+            pass
+        elif (op in (orb.Query.Op.Startswith, orb.Query.Op.DoesNotStartwith) and
+              not query.caseSensitive() and
+              functions in ([], lower)):
+            pass
+        else:
+            return None
+
+        alias = aliases.get(model) or model.schema().dbname()
+        return u'lower("{0}"."{1}"::varchar)'.format(alias, column.field())
+
+    def listSql(self, field, op, values, value_key):
+        """
+        Generates the SQL for an IN or NOT IN check against a list of values.  The
+        values are bound as a single array parameter, so the statement text does not
+        grow with the number of values, and lists larger than the `ValueTableThreshold`
+        are loaded into a temporary table that is joined against instead.
+
+        :param      field     | <str>
+                    op        | <orb.Query.Op>
+                    values    | (<variant>, ..)
+                    value_key | <str>
+
+        :return     (<str> sql, <dict> data)
+        """
+        kind = ValueTable.valueKind(values)
+        if kind is not None and len(values) > self.ValueTableThreshold:
+            sql = u'{0} {1} (SELECT "value" FROM "{2}")'.format(field,
+                                                              u'IN' if op == orb.Query.Op.IsIn else u'NOT IN',
+                                                              ValueTable.tableName(value_key))
+            return sql, {value_key: ValueTable(values, kind)}
+        else:
+            cast = {'integer': u'::bigint[]', 'string': u'::text[]'}.get(kind, u'')
+            sql = u'{0} {1}(%({2})s{3})'.format(field,
+                                                u'= ANY' if op == orb.Query.Op.IsIn else u'!= ALL',
+                                                value_key,
+                                                cast)
+            return sql, {value_key: list(values)}
+
     @staticmethod
     def opSql(op, caseSensitive=False):
         general_mapping = {
@@ -181,7 +271,9 @@ class WHERE(PSQLStatement):
             orb.Query.Op.Contains: u'LIKE',
             orb.Query.Op.DoesNotContain: u'NOT LIKE',
             orb.Query.Op.Startswith: u'LIKE',
-            orb.Query.Op.Endswith: u'LIKE'
+            orb.Query.Op.Endswith: u'LIKE',
+            orb.Query.Op.DoesNotStartwith: u'NOT LIKE',
+            orb.Query.Op.DoesNotEndwith: u'NOT LIKE'
         }
 
         non_sensitive_mapping = {
@@ -190,19 +282,45 @@ class WHERE(PSQLStatement):
             orb.Query.Op.Contains: u'ILIKE',
             orb.Query.Op.DoesNotContain: u'NOT ILIKE',
             orb.Query.Op.Startswith: u'ILIKE',
-            orb.Query.Op.Endswith: u'ILIKE'
+            orb.Query.Op.Endswith: u'ILIKE',
+            orb.Query.Op.DoesNotStartwith: u'NOT ILIKE',
+            orb.Query.Op.DoesNotEndwith: u'NOT ILIKE'
         }
 
         return general_mapping.get(op) or (sensitive_mapping[op] if caseSensitive else non_sensitive_mapping[op])
 
-    @staticmethod
-    def funcSql(func):
-        func_mapping = {
-            orb.Query.Function.Lower: u'lower({0})',
-            orb.Query.Function.Upper: u'upper({0})',
-            orb.Query.Function.Abs: u'abs({0})',
-            orb.Query.Function.AsString: u'{0}::varchar'
-        }
-        return func_mapping[func]
+    def funcSql(self, model, func, field, aliases, data=None):
+        """
+        Applies a query function to the inputted field using the template that is
+        registered for this dialect.  Arguments are bound into the data, and query
+        arguments are converted to the fields that they look up.
+
+        :param      model   | <subclass of orb.Model>
+                    func    | <orb.Query.Function> || (<str> name, (<variant>, ..) args)
+                    field   | <str>
+                    aliases | {<subclass of orb.Model>: <str>, ..}
+                    data    | <dict> || None
+
+        :return     <str>
+        """
+        name, args = orb.QueryFunction.parse(func)
+        function = orb.QueryFunction.byName(name)
+
+        sql_args = []
+        for arg in args:
+            if isinstance(arg, orb.Query):
+                arg_model = arg.model(model)
+                sql_args.append(self.generateField(arg_model, arg.column(arg_model), arg, aliases, data))
+            elif data is None:
+                raise orb.errors.QueryInvalid('Could not bind the arguments for {0}'.format(name))
+            else:
+                key = u'{0}_{1}'.format(name, os.urandom(4).encode('hex'))
+                data[key] = arg
+                sql_args.append(u'%({0})s'.format(key))
+
+        sql = function('Postgres', field, sql_args) if function else None
+        if sql is None:
+            raise orb.errors.QueryInvalid('Unknown function type: {0}'.format(name))
+        return sql
 
 PSQLStatement.registerAddon('WHERE', WHERE())
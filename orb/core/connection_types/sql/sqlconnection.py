@@ -14,6 +14,7 @@ from projex.decorators import abstractmethod
 log = logging.getLogger(__name__)
 
 from .sqlstatement import SQLStatement
+from .valuetable import ValueTable
 
 
 # noinspection PyAbstractClass,PyProtectedMember
@@ -76,10 +77,50 @@ class SQLConnection(orb.Connection):
                     autoCommit | <bool> | commit database changes immediately
                     autoClose  | <bool> | closes connections immediately
                     returning  | <bool>
-                    mapper     | <variant>
+                    mapper     | <callable> || None | when None, the rows are returned as an <orb.ResultSet>
                     retries    | <int>
 
-        :return     [{<str> key: <variant>, ..}, ..], <int> rowcount
+        :return     [{<str> key: <variant>, ..}, ..] || <orb.ResultSet>, <int> rowcount
+        """
+
+    def _iterate(self, native, command, data=None, size=500):
+        """
+        Executes the inputted command and yields the results in chunks of
+        the given size.  By default, the results are fetched all at once and
+        then split, backends that support server-side cursors should override
+        this method to fetch each chunk from the database as it is requested.
+
+        :param      native  | <variant>
+                    command | <str>
+                    data    | <dict> || None
+                    size    | <int>
+
+        :return     <generator> | <orb.ResultSet>
+        """
+        results, _ = self._execute(native, command, data, True, None)
+        columns = results.columns()
+        rows = results.rows()
+        for i in xrange(0, len(rows), size):
+            yield orb.ResultSet(columns, rows[i:i + size])
+
+    @abstractmethod()
+    def _loadValues(self, native, name, values):
+        """
+        Creates a temporary table with the given name that has a single `value`
+        column, and loads the inputted values into it.
+
+        :param      native | <variant>
+                    name   | <str>
+                    values | <orb.core.connection_types.sql.valuetable.ValueTable>
+        """
+
+    @abstractmethod()
+    def _dropValues(self, native, name):
+        """
+        Drops the temporary table of values with the given name.
+
+        :param      native | <variant>
+                    name   | <str>
         """
 
     @abstractmethod()
@@ -107,6 +148,40 @@ class SQLConnection(orb.Connection):
                     connection | <variant> | backend specific database.
         """
 
+    @contextlib.contextmanager
+    def _valueTables(self, native, data):
+        """
+        Loads any large lists of values from the inputted data into the temporary
+        tables that the command will select from, dropping the tables once the
+        command has been run.  The data is yielded without the loaded values, so
+        they are not bound to the command as well.
+
+        :param      native | <variant>
+                    data   | <dict> || None
+
+        :return     <dict> || None
+        """
+        tables = [(ValueTable.tableName(key), value) for key, value in (data or {}).items()
+                  if isinstance(value, ValueTable)]
+        loaded = []
+        try:
+            for name, values in tables:
+                self._loadValues(native, name, values)
+                loaded.append(name)
+
+            if tables:
+                yield {key: value for key, value in data.items() if not isinstance(value, ValueTable)}
+            else:
+                yield data
+
+        # always drop the tables, including when an iteration is closed before it finishes
+        finally:
+            for name in loaded:
+                try:
+                    self._dropValues(native, name)
+                except Exception:
+                    log.debug('Could not drop value table: {0}'.format(name))
+
     def _rollback(self, native):
         try:
             native.rollback()
@@ -158,6 +233,28 @@ class SQLConnection(orb.Connection):
         else:
             self.execute(u'\n'.join(sql), data, writeAccess=True)
 
+    def aggregate(self, model, context, groupBy, aggregates):
+        """
+        Calculates the aggregates for the records of the inputted model that
+        match the context within the database, grouped by the given columns.
+
+        :param      model      | <subclass of orb.Model>
+                    context    | <orb.Context>
+                    groupBy    | [<str> column, ..]
+                    aggregates | [(<str> function, <str> column || '*'), ..]
+
+        :return     [{<str> key: <variant> value, ..}, ..]
+        """
+        SELECT_AGGREGATE = self.statement('SELECT AGGREGATE')
+        sql, data = SELECT_AGGREGATE(model, context, groupBy, aggregates)
+        if not sql:
+            return []
+        elif context.dryRun:
+            log.info(sql % data)
+            return []
+        else:
+            return self.execute(sql, data)[0]
+
     def close(self):
         """
         Closes the connection to the database for this connection.
@@ -191,7 +288,9 @@ class SQLConnection(orb.Connection):
         except orb.errors.QueryIsNull:
             return 0
         else:
-            if context.dryRun:
+            if not sql:
+                return 0
+            elif context.dryRun:
                 print sql % data
                 return 0
             else:
@@ -241,18 +340,47 @@ class SQLConnection(orb.Connection):
         :param      records  | <orb.Collection>
                     context  | <orb.Context>
 
-        :return     <int> number of rows removed
+        :return     (<list> rows, <int> number of rows removed)
         """
         # include various schema records to remove
         DELETE = self.statement('DELETE')
         sql, data = DELETE(records, context)
 
-        if context.dryRun:
+        if not sql:
+            return [], 0
+        elif context.dryRun:
             print sql % data
-            return 0
+            return [], 0
         else:
             return self.execute(sql, data, writeAccess=True)
 
+    def estimateCount(self, model, context):
+        """
+        Returns the estimated number of records for the inputted model from the
+        database statistics, which avoids scanning large tables.  Filtered, paged
+        and distinct contexts cannot be estimated, and neither can tables that have
+        no statistics yet, in which case None is returned.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+
+        :return     <int> || None
+        """
+        SELECT_ESTIMATE = self.statement('SELECT COUNT ESTIMATE')
+        if SELECT_ESTIMATE is None:
+            return None
+
+        sql, data = SELECT_ESTIMATE(model, context)
+        if not sql or context.dryRun:
+            return None
+
+        rows, _ = self.execute(sql, data)
+        count = rows[0]['count'] if rows else None
+        if count is not None and count > 0:
+            return int(count)
+        else:
+            return None
+
     def execute(self,
                 command,
                 data=None,
@@ -270,10 +398,10 @@ class SQLConnection(orb.Connection):
                     autoCommit | <bool> | commit database changes immediately
                     autoClose  | <bool> | closes connections immediately
                     returning  | <bool>
-                    mapper     | <variant>
+                    mapper     | <callable> || None | when None, the rows are returned as an <orb.ResultSet>
                     retries    | <int>
 
-        :return     [{<str> key: <variant>, ..}, ..], <int> rowcount
+        :return     [{<str> key: <variant>, ..}, ..] || <orb.ResultSet>, <int> rowcount
         """
         command = command.strip()
 
@@ -291,11 +419,12 @@ class SQLConnection(orb.Connection):
 
         try:
             with self.native() as conn:
-                results, rowcount = self._execute(conn,
-                                                  command,
-                                                  data,
-                                                  returning,
-                                                  mapper)
+                with self._valueTables(conn, data) as command_data:
+                    results, rowcount = self._execute(conn,
+                                                      command,
+                                                      command_data,
+                                                      returning,
+                                                      mapper)
 
         # always raise interruption errors as these need to be handled
         # from a thread properly
@@ -330,6 +459,63 @@ class SQLConnection(orb.Connection):
 
         return results, rowcount
 
+    def exists(self, model, context):
+        """
+        Returns whether or not any records exist for the inputted model and
+        context, checking for a single matching record with an EXISTS query.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+
+        :return     <bool>
+        """
+        SELECT_EXISTS = self.statement('SELECT EXISTS')
+
+        try:
+            sql, data = SELECT_EXISTS(model, context)
+        except orb.errors.QueryIsNull:
+            return False
+        else:
+            if not sql:
+                return False
+            elif context.dryRun:
+                log.info(sql % data)
+                return False
+            else:
+                rows, _ = self.execute(sql, data)
+                return bool(rows[0]['exists']) if rows else False
+
+    def facets(self, model, context, columns):
+        """
+        Counts the records of the inputted model that match the context for
+        each value of the given columns, in a single query.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+                    columns | [<str> column, ..]
+
+        :return     [{<str> key: <variant> value, ..}, ..]
+        """
+        SELECT_FACETS = self.statement('SELECT FACETS')
+        sql, data = SELECT_FACETS(model, context, columns)
+        if not sql:
+            return []
+        elif context.dryRun:
+            log.info(sql % data)
+            return []
+        else:
+            return self.execute(sql, data)[0]
+
+    def hasWindowFunctions(self):
+        """
+        Returns whether or not the backend server supports window functions, such
+        as COUNT(*) OVER (), which are used to select the total number of records
+        alongside a page of records.
+
+        :return     <bool>
+        """
+        return True
+
     def insert(self, records, context):
         """
         Inserts the table instance into the database.  If the
@@ -368,6 +554,21 @@ class SQLConnection(orb.Connection):
         """
         return not self.__pool.empty()
 
+    def iterselect(self, model, context, size=500):
+        SELECT = self.statement('SELECT')
+        sql, data = SELECT(model, context)
+        if not sql:
+            return
+        elif context.dryRun:
+            log.info(sql % data)
+            return
+
+        data.setdefault('locale', context.locale)
+        with self.native() as conn:
+            with self._valueTables(conn, data) as command_data:
+                for results in self._iterate(conn, sql.strip(), command_data, size):
+                    yield results
+
     @contextlib.contextmanager
     def native(self, isolation_level=None):
         """
@@ -391,6 +592,11 @@ class SQLConnection(orb.Connection):
             else:
                 conn = self._rollback(conn)
             raise
+        except GeneratorExit:
+            # the results were not iterated to the end, which is not an error
+            if not self._closed(conn):
+                self._commit(conn)
+            raise
         else:
             if not self._closed(conn):
                 self._commit(conn)
@@ -452,7 +658,63 @@ class SQLConnection(orb.Connection):
             log.info(sql % data)
             return []
         else:
-            return self.execute(sql, data)[0]
+            return self.execute(sql, data, mapper=None)[0]
+
+    def selectJSON(self, model, context):
+        SELECT_JSON = self.statement('SELECT JSON')
+        if SELECT_JSON is None:
+            return None
+
+        sql, data = SELECT_JSON(model, context)
+        if not sql:
+            return []
+        elif context.dryRun:
+            log.info(sql % data)
+            return []
+        else:
+            return self.execute(sql, data, mapper=None)[0].column('json')
+
+    def selectTotal(self, model, context):
+        """
+        Selects the records for the inputted model along with the total number of
+        records that match the context, regardless of its start and limit.  The
+        total is selected as a COUNT(*) OVER () window alongside each record, so
+        paged results do not require a separate count query.  If the server does
+        not support window functions, or the SELECT statement could not include
+        the window, then None is returned for the total.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+
+        :return     (<orb.ResultSet> records, <int> || None total)
+        """
+        if not self.hasWindowFunctions():
+            return self.select(model, context), None
+
+        SELECT = self.statement('SELECT')
+        sql, data = SELECT(model, context, total=True)
+        if not sql:
+            return [], 0
+        elif context.dryRun:
+            log.info(sql % data)
+            return [], None
+
+        rows = self.execute(sql, data, mapper=None)[0]
+        if isinstance(rows, orb.ResultSet):
+            if not rows.hasColumn('_orb_total'):
+                return rows, None
+            totals = rows.column('_orb_total')
+            rows = rows.without('_orb_total')
+        else:
+            totals = [row.pop('_orb_total', None) for row in rows]
+
+        # an empty page only determines the total when it starts at the first record
+        if totals:
+            return rows, totals[0]
+        elif not context.start:
+            return rows, 0
+        else:
+            return rows, None
 
     def setBatchSize(self, size):
         """
@@ -1,5 +1,6 @@
 """ Defines the backend connection class for PostgreSQL databases. """
 
+import json
 import logging
 import orb
 import re
@@ -19,6 +20,10 @@ except ImportError:
     log.debug('For SQLite backend, ensure your python version supports sqlite3')
     sqlite = None
 
+else:
+    # decode the json columns, such as expanded records, as they are loaded
+    sqlite.register_converter('json', json.loads)
+
 
 # -----------------------------------------------------------------------------
 #   SQLITE EXTENSIONS
@@ -48,21 +53,6 @@ def does_not_match(expr, item):
     """
     return re.match(expr, item) is None
 
-def dict_factory(cursor, row):
-    """
-    Converts the cursor information from a SQLite query to a dictionary.
-
-    :param      cursor | <sqlite3.Cursor>
-                row    | <sqlite3.Row>
-
-    :return     {<str> column: <variant> value, ..}
-    """
-    out = {}
-    for i, col in enumerate(cursor.description):
-        out[col[0]] = row[i]
-    return out
-
-
 # ----------------------------------------------------------------------
 
 class SQLiteStatement(SQLStatement):
@@ -130,7 +120,7 @@ class SQLiteConnection(SQLConnection):
                     replace.append('?')
                     output.append(sub_value)
 
-                return '({0})'.format(','.join(replace)), output
+            return '({0})'.format(','.join(replace)), output
 
         rowcount = 0
         for cmd in commands:
@@ -188,8 +178,12 @@ class SQLiteConnection(SQLConnection):
                 raise orb.errors.QueryFailed(cmd, args, nstr(err))
 
         if returning:
-            results = [mapper(record) for record in cursor.fetchall()]
+            columns = [description[0] for description in cursor.description or []]
+            results = orb.ResultSet(columns, cursor.fetchall())
             rowcount = len(results)  # for some reason, rowcount in sqlite3 returns -1 for selects...
+
+            if mapper is not None:
+                results = results.mapped(mapper)
         else:
             results = []
 
@@ -198,6 +192,29 @@ class SQLiteConnection(SQLConnection):
 
         return results, rowcount
 
+    def _dropValues(self, native, name):
+        """
+        Drops the temporary table of values with the given name.
+
+        :param      native | <sqlite.Connection>
+                    name   | <str>
+        """
+        native.cursor().execute(u'DROP TABLE IF EXISTS temp.`{0}`;'.format(name))
+
+    def _loadValues(self, native, name, values):
+        """
+        Creates a temporary table with the given name and loads the inputted values
+        into it.  Values are inserted through a single prepared statement, so the
+        list is not limited by the number of variables allowed in a statement.
+
+        :param      native | <sqlite.Connection>
+                    name   | <str>
+                    values | <orb.core.connection_types.sql.valuetable.ValueTable>
+        """
+        cursor = native.cursor()
+        cursor.execute(u'CREATE TEMP TABLE `{0}` (`value`);'.format(name))
+        cursor.executemany(u'INSERT INTO `{0}` (`value`) VALUES (?);'.format(name), [(value,) for value in values])
+
     def _open(self, db):
         """
         Handles simple, SQL specific connection creation.  This will not
@@ -214,9 +231,8 @@ class SQLiteConnection(SQLConnection):
         dbname = db.name()
 
         try:
-            sqlite_db = sqlite.connect(dbname)
+            sqlite_db = sqlite.connect(dbname, detect_types=sqlite.PARSE_COLNAMES)
             sqlite_db.create_function('REGEXP', 2, matches)
-            sqlite_db.row_factory = dict_factory
             sqlite_db.text_factory = unicode
 
             self.__threaded_connections[sqlite_db] = threading.current_thread().ident
@@ -243,6 +259,18 @@ class SQLiteConnection(SQLConnection):
         super(SQLiteConnection, self).delete(records, context)
         return [], count
 
+    def hasWindowFunctions(self):
+        # window functions were added in SQLite 3.25
+        return sqlite.sqlite_version_info >= (3, 25, 0)
+
+    def estimateCount(self, model, context):
+        # the statistics table is only created once the database has been analyzed
+        rows, _ = self.execute(u"SELECT 1 FROM `sqlite_master` WHERE `type` = 'table' AND `name` = 'sqlite_stat1'")
+        if not rows:
+            return None
+        else:
+            return super(SQLiteConnection, self).estimateCount(model, context)
+
     def schemaInfo(self, context):
         tables_sql = "select name from sqlite_master where type = 'table';"
         tables = [x['name'] for x in self.execute(tables_sql)[0]]
@@ -12,9 +12,14 @@ class DELETE(SQLiteStatement):
             model = records.model()
             context = records.context()
 
-            if context.where is not None:
+            try:
+                query = context.where.optimize() if context.where is not None else None
+            except orb.errors.QueryIsNull:
+                return u'', {}
+
+            if query is not None:
                 WHERE = self.byName('WHERE')
-                where, data = WHERE(model, context.where)
+                where, data = WHERE(model, query)
             else:
                 where, data = '', {}
 
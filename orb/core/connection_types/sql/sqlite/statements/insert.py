@@ -19,21 +19,9 @@ class INSERT(SQLiteStatement):
 
             # define the
             if not schema in schema_meta:
-                i18n = []
-                standard = []
-                for col in schema.columns().values():
-                    if col.testFlag(col.Flags.Virtual):
-                        continue
-
-                    if col.testFlag(col.Flags.I18n):
-                        i18n.append(col)
-                    elif not col.testFlag(col.Flags.AutoAssign):
-                        standard.append(col)
-
-                schema_meta[schema] = {'i18n': i18n, 'standard': standard}
-
-            if not schema in schema_meta:
-                schema_meta[schema] = {'i18n': [], 'standard': []}
+                plan = schema.plan()
+                standard = [col for col in plan.standard if not col.testFlag(col.Flags.AutoAssign)]
+                schema_meta[schema] = {'i18n': plan.i18n, 'standard': standard}
 
             for key, columns in schema_meta[schema].items():
                 data.update({'{0}_{1}'.format(col.field(), i): col.dbStore('SQLite', record.get(col)) for col in columns})
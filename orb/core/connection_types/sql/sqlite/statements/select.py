@@ -1,5 +1,6 @@
 from collections import defaultdict
 from projex.lazymodule import lazy_import
+from ...joinplan import JoinPlan
 from ..sqliteconnection import SQLiteStatement
 
 orb = lazy_import('orb')
@@ -9,7 +10,10 @@ class SELECT(SQLiteStatement):
     def cmpcol(self, col_a, col_b):
         return cmp(col_a.field(), col_b.field())
 
-    def __call__(self, model, context, fields=None):
+    def __call__(self, model, context, fields=None, total=False):
+        EXPAND_COL = self.byName('SELECT EXPAND COLUMN')
+        EXPAND_PIPE = self.byName('SELECT EXPAND PIPE')
+        EXPAND_REV = self.byName('SELECT EXPAND REVERSE')
         WHERE = self.byName('WHERE')
 
         # generate the where query
@@ -19,9 +23,18 @@ class SELECT(SQLiteStatement):
             if base_where:
                 where = base_where & where
 
+        # normalize the query before it is compiled, a query that will not match any
+        # records does not need to be run
+        if where is not None:
+            try:
+                where = where.optimize()
+            except orb.errors.QueryIsNull:
+                return u'', {}
+
         # determine what to expand
         schema = model.schema()
-        columns = [schema.column(c) for c in context.columns] if context.columns else schema.columns().values()
+        expand = context.expandtree(model)
+        columns = context.queryColumns(schema)
 
         data = {
             'locale': context.locale,
@@ -30,7 +43,7 @@ class SELECT(SQLiteStatement):
         fields = fields or {}
         sql_group_by = []
         sql_columns = defaultdict(list)
-        sql_joins = []
+        joins = JoinPlan(model, quote=u'`{0}`')
 
         # process columns to select
         for column in sorted(columns, self.cmpcol):
@@ -49,24 +62,75 @@ class SELECT(SQLiteStatement):
                 sql_group_by.append(u'`{0}`.`id`'.format(schema.dbname()))
                 fields[column] = u'`i18n`.`{0}`'.format(column.field())
             else:
+                # expand a reference
+                if isinstance(column, orb.ReferenceColumn) and column.name() in expand:
+                    sql, sub_data = EXPAND_COL(column, expand.pop(column.name()), alias=schema.dbname())
+                    sql_columns['standard'].append(sql)
+                    data.update(sub_data)
+
                 # select the base record
                 sql_columns['standard'].append(u'`{0}`.`{1}` AS `{1}`'.format(schema.dbname(),
                                                                              column.field(),
                                                                              column.field()))
 
+        # expand any pipes and reverse lookups
+        if expand:
+            for collector in schema.collectors().values():
+                if collector.name() in expand:
+                    if collector.testFlag(collector.Flags.Virtual):
+                        continue
+
+                    sub_tree = expand.pop(collector.name(), None)
+                    if isinstance(collector, orb.Pipe):
+                        sql, sub_data = EXPAND_PIPE(collector, sub_tree, alias=schema.dbname())
+                    elif isinstance(collector, orb.ReverseLookup):
+                        sql, sub_data = EXPAND_REV(collector, sub_tree, alias=schema.dbname())
+                    else:
+                        continue
+
+                    sql_columns['standard'].append(sql)
+                    data.update(sub_data)
+
+                if not expand:
+                    break
+
         # generate sql ordering
         sql_order_by = []
         if context.order:
             for col, dir in context.order:
-                column = schema.column(col)
-                if not column:
-                    raise orb.errors.ColumnNotFound(col)
+                joined = joins.resolve(col)
+                if joined:
+                    _, column, alias = joined
+                    field = u'`{0}`.`{1}`'.format(alias, column.field())
+                elif isinstance(col, orb.Query):
+                    # order by the result of the query's functions
+                    if '.' in col.columnName():
+                        raise orb.errors.QueryInvalid('Could not order by {0}'.format(col.columnName()))
+                    field = WHERE.generateField(model, col.column(model), col, {}, data)
+                elif isinstance(col, basestring) and '.' in col:
+                    raise orb.errors.QueryInvalid('Could not order by {0}'.format(col))
+                else:
+                    column = schema.column(col)
+                    if not column:
+                        raise orb.errors.ColumnNotFound(col)
 
-                field = fields.get(column) or u'`{0}`.`{1}`'.format(schema.dbname(), column.field())
+                    field = fields.get(column) or u'`{0}`.`{1}`'.format(schema.dbname(), column.field())
                 if sql_group_by:
                     sql_group_by.append(field)
                 sql_order_by.append(u'{0} {1}'.format(field, dir.upper()))
 
+        # generate sql statements
+        try:
+            sql_where, sql_where_data = WHERE(model, where, fields=fields, joins=joins)
+        except orb.errors.QueryIsNull:
+            return u'', {}
+        else:
+            data.update(sql_where_data)
+
+        # count the total records alongside the page, the window is evaluated before the limit is applied
+        if total and not context.distinct:
+            sql_columns['total'].append(u'COUNT(*) OVER () AS `_orb_total`')
+
         if context.distinct is True:
             cmd = ['SELECT DISTINCT {0} FROM `{1}`'.format(', '.join(sql_columns['standard'] + sql_columns['i18n']), schema.dbname())]
         elif isinstance(context.distinct, (list, set, tuple)):
@@ -83,11 +147,7 @@ class SELECT(SQLiteStatement):
                                                                     schema.dbname())]
             sql_group_by.append(on_)
         else:
-            cmd = [u'SELECT {0} FROM `{1}`'.format(', '.join(sql_columns['standard'] + sql_columns['i18n']), schema.dbname())]
-
-        # add sql joins to the statement
-        if sql_joins:
-            cmd += sql_joins
+            cmd = [u'SELECT {0} FROM `{1}`'.format(', '.join(sql_columns['standard'] + sql_columns['i18n'] + sql_columns['total']), schema.dbname())]
 
         # join in the i18n table
         if sql_columns['i18n']:
@@ -99,13 +159,8 @@ class SELECT(SQLiteStatement):
                     sql += u'\nLEFT JOIN `{0}_i18n` AS `i18n_default` ON (`i18n_default`.`{0}_id` = `id` AND `i18n_default`.`locale` = %(default_locale)s)'
                 cmd.append(sql.format(schema.dbname()))
 
-        # generate sql statements
-        try:
-            sql_where, sql_where_data = WHERE(model, where, fields=fields)
-        except orb.errors.QueryIsNull:
-            sql_where, sql_where_data = '', {}
-        else:
-            data.update(sql_where_data)
+        # add sql joins to the statement
+        cmd += joins.joins()
 
         if sql_where:
             cmd.append(u'WHERE {0}'.format(sql_where))
@@ -113,14 +168,18 @@ class SELECT(SQLiteStatement):
             cmd.append(u'GROUP BY {0}'.format(', '.join(sql_group_by)))
         if sql_order_by:
             cmd.append(u'ORDER BY {0}'.format(', '.join(sql_order_by)))
-        if context.start:
-            if not isinstance(context.start, (int, long)):
-                raise orb.errors.DatabaseError('Invalid value provided for start')
-            cmd.append(u'OFFSET {0}'.format(context.start))
+        if context.start and not isinstance(context.start, (int, long)):
+            raise orb.errors.DatabaseError('Invalid value provided for start')
+
+        # the offset must follow a limit
         if context.limit > 0:
             if not isinstance(context.limit, (int, long)):
                 raise orb.errors.DatabaseError('Invalid value provided for limit')
             cmd.append(u'LIMIT {0}'.format(context.limit))
+        elif context.start:
+            cmd.append(u'LIMIT -1')
+        if context.start:
+            cmd.append(u'OFFSET {0}'.format(context.start))
 
         return u'\n'.join(cmd), data
 
@@ -0,0 +1,180 @@
+from projex.lazymodule import lazy_import
+from ...joinplan import JoinPlan
+from ..sqliteconnection import SQLiteStatement
+
+orb = lazy_import('orb')
+
+
+class SELECT_AGGREGATE(SQLiteStatement):
+    Functions = {
+        'avg': u'AVG',
+        'count': u'COUNT',
+        'max': u'MAX',
+        'min': u'MIN',
+        'sum': u'SUM'
+    }
+
+    def __call__(self, model, context, groupBy, aggregates):
+        """
+        Generates the query that calculates the given aggregates for the records
+        that match the context, grouped by the given columns.  The grouped values
+        are selected as `_orb_group_<index>` and the aggregates as
+        `_orb_value_<index>`.
+
+        :param      model      | <subclass of orb.Model>
+                    context    | <orb.Context>
+                    groupBy    | [<str> column || <orb.Query>, ..]
+                    aggregates | [(<str> function, <str> column || <orb.Query> || '*'), ..]
+
+        :return     (<str> sql, <dict> data)
+        """
+        joins = JoinPlan(model, quote=u'`{0}`')
+        try:
+            sql_where, data = self.filter(model, context, joins)
+        except orb.errors.QueryIsNull:
+            return u'', {}
+
+        group_fields = [self.field(model, joins, column, data) for column in groupBy]
+
+        columns = [u'{0} AS `_orb_group_{1}`'.format(field, i) for i, field in enumerate(group_fields)]
+        for i, (function, column) in enumerate(aggregates):
+            try:
+                sql_function = self.Functions[function]
+            except KeyError:
+                raise orb.errors.QueryInvalid('Unknown aggregate: {0}'.format(function))
+
+            value = u'*' if isinstance(column, basestring) and column == '*' else self.field(model, joins, column, data)
+            columns.append(u'{0}({1}) AS `_orb_value_{2}`'.format(sql_function, value, i))
+
+        cmd = [u'SELECT {0}'.format(u', '.join(columns))]
+        cmd += self.source(model, context, joins, sql_where)
+        if group_fields:
+            cmd.append(u'GROUP BY {0}'.format(u', '.join(group_fields)))
+            cmd.append(u'ORDER BY {0}'.format(u', '.join(group_fields)))
+        return u'\n'.join(cmd) + u';', data
+
+    def field(self, model, joins, name, data):
+        """
+        Returns the field to select for the given column name or reference path.
+        Queries are used to aggregate the result of their functions, and their
+        arguments are bound into the data.
+
+        :param      model | <subclass of orb.Model>
+                    joins | <JoinPlan>
+                    name  | <str> || <orb.Query>
+                    data  | <dict>
+
+        :return     <str>
+        """
+        if isinstance(name, orb.Query):
+            if '.' in name.columnName():
+                raise orb.errors.QueryInvalid('Could not aggregate {0}'.format(name.columnName()))
+            WHERE = self.byName('WHERE')
+            return WHERE.generateField(model, name.column(model), name, {}, data)
+
+        joined = joins.resolve(name)
+        if joined:
+            _, column, alias = joined
+            return u'`{0}`.`{1}`'.format(alias, column.field())
+
+        column = model.schema().column(name, raise_=False)
+        if column is None:
+            raise orb.errors.ColumnNotFound(model.schema().name(), name)
+        elif '.' in name or column.testFlag(column.Flags.Virtual) or column.testFlag(column.Flags.I18n):
+            raise orb.errors.QueryInvalid('Could not aggregate {0}'.format(name))
+        else:
+            return u'`{0}`.`{1}`'.format(model.schema().dbname(), column.field())
+
+    def filter(self, model, context, joins):
+        """
+        Generates the WHERE clause for the records that match the context,
+        including the model's base query.  Ordering and paging do not apply
+        to aggregates.  If the filter cannot match any records, then the
+        <orb.errors.QueryIsNull> error is raised.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+                    joins   | <JoinPlan>
+
+        :return     (<str> sql, <dict> data)
+        """
+        WHERE = self.byName('WHERE')
+
+        where = context.where
+        if context.useBaseQuery:
+            base_where = model.baseQuery(context=context)
+            if base_where:
+                where = base_where & where
+
+        if where is not None:
+            where = where.optimize()
+
+        data = {
+            'locale': context.locale,
+            'default_locale': orb.system.settings().default_locale
+        }
+
+        sql_where, sql_where_data = WHERE(model, where, joins=joins)
+        data.update(sql_where_data)
+        return sql_where, data
+
+    def source(self, model, context, joins, sql_where):
+        """
+        Returns the FROM, JOIN and WHERE clauses for an aggregate query.
+
+        :param      model     | <subclass of orb.Model>
+                    context   | <orb.Context>
+                    joins     | <JoinPlan>
+                    sql_where | <str>
+
+        :return     [<str>, ..]
+        """
+        cmd = [u'FROM `{0}`'.format(model.schema().dbname())]
+        cmd += joins.joins()
+        if sql_where:
+            cmd.append(u'WHERE {0}'.format(sql_where))
+        return cmd
+
+
+class SELECT_FACETS(SELECT_AGGREGATE):
+    def __call__(self, model, context, columns):
+        """
+        Generates the query that counts the records that match the context for
+        each value of the given columns in a single pass, as a union of one
+        grouped count per column.  Each row selects the index of the column it
+        was grouped by as `_orb_facet`, the grouped value as `_orb_group_<index>`
+        and the number of records as `count`.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+                    columns | [<str> || <orb.Query>, ..]
+
+        :return     (<str> sql, <dict> data)
+        """
+        joins = JoinPlan(model, quote=u'`{0}`')
+        try:
+            sql_where, data = self.filter(model, context, joins)
+        except orb.errors.QueryIsNull:
+            return u'', {}
+
+        fields = [self.field(model, joins, column, data) for column in columns]
+        source = self.source(model, context, joins, sql_where)
+
+        cmd = []
+        for i, field in enumerate(fields):
+            sql_columns = [u'{0} AS `_orb_facet`'.format(i)]
+            sql_columns += [u'{0} AS `_orb_group_{1}`'.format(field if i == j else u'NULL', j)
+                            for j in xrange(len(fields))]
+            sql_columns.append(u'COUNT(*) AS `count`')
+
+            if cmd:
+                cmd.append(u'UNION ALL')
+            cmd.append(u'SELECT {0}'.format(u', '.join(sql_columns)))
+            cmd += source
+            cmd.append(u'GROUP BY {0}'.format(field))
+
+        return u'\n'.join(cmd) + u';', data
+
+
+SQLiteStatement.registerAddon('SELECT AGGREGATE', SELECT_AGGREGATE())
+SQLiteStatement.registerAddon('SELECT FACETS', SELECT_FACETS())
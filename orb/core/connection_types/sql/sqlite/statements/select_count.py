@@ -1,17 +1,114 @@
 from projex.lazymodule import lazy_import
+from ...joinplan import JoinPlan
 from ..sqliteconnection import SQLiteStatement
 
 orb = lazy_import('orb')
 
 
 class SELECT_COUNT(SQLiteStatement):
+    def __call__(self, model, context):
+        # paged and distinct counts need to count the selected records
+        if context.limit or context.start or context.distinct:
+            SELECT = self.byName('SELECT')
+            columns = context.columns or [model.schema().idColumn().field()]
+            sql, data = SELECT(model, orb.Context(columns=columns, context=context))
+            if sql:
+                sql = 'SELECT COUNT(*) AS count FROM ({0}) AS records;'.format(sql)
+            return sql, data
+        else:
+            return self.countRecords(model, context)
+
+    def countRecords(self, model, context):
+        """
+        Generates a count directly against the model's table, only joining in the
+        references that are required to filter the records.  Ordering, expansion and
+        translation joins do not affect the number of records, so they are left out.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+
+        :return     (<str> sql, <dict> data)
+        """
+        WHERE = self.byName('WHERE')
+        schema = model.schema()
+
+        where = context.where
+        if context.useBaseQuery:
+            base_where = model.baseQuery(context=context)
+            if base_where:
+                where = base_where & where
+
+        if where is not None:
+            try:
+                where = where.optimize()
+            except orb.errors.QueryIsNull:
+                return u'', {}
+
+        data = {
+            'locale': context.locale,
+            'default_locale': orb.system.settings().default_locale
+        }
+        joins = JoinPlan(model, quote=u'`{0}`')
+
+        try:
+            sql_where, sql_where_data = WHERE(model, where, joins=joins)
+        except orb.errors.QueryIsNull:
+            return u'', {}
+        else:
+            data.update(sql_where_data)
+
+        cmd = [u'SELECT COUNT(*) AS count FROM `{0}`'.format(schema.dbname())]
+        cmd += joins.joins()
+        if sql_where:
+            cmd.append(u'WHERE {0}'.format(sql_where))
+        return u'\n'.join(cmd) + u';', data
+
+
+class SELECT_COUNT_ESTIMATE(SQLiteStatement):
+    def __call__(self, model, context):
+        """
+        Generates a query for the estimated number of records in the model's table
+        from the statistics gathered by ANALYZE.  Filtered, paged and distinct counts
+        cannot be estimated, so an empty statement is returned for them.
+
+        :param      model   | <subclass of orb.Model>
+                    context | <orb.Context>
+
+        :return     (<str> sql, <dict> data)
+        """
+        where = context.where
+        if context.useBaseQuery:
+            base_where = model.baseQuery(context=context)
+            if base_where:
+                where = base_where & where
+
+        try:
+            where = where.optimize() if where is not None else None
+        except orb.errors.QueryIsNull:
+            return u'', {}
+
+        if where is not None or context.limit or context.start or context.distinct:
+            return u'', {}
+
+        data = {'table': model.schema().dbname()}
+        sql = u'SELECT CAST(`stat` AS INTEGER) AS count FROM `sqlite_stat1` ' \
+              u'WHERE `tbl` = %(table)s ORDER BY `idx` IS NOT NULL LIMIT 1;'
+        return sql, data
+
+
+class SELECT_EXISTS(SQLiteStatement):
     def __call__(self, model, context):
         SELECT = self.byName('SELECT')
-        columns = context.columns or [model.schema().idColumn().field()]
-        sql, data = SELECT(model, orb.Context(columns=columns, context=context))
+        sql, data = SELECT(model, orb.Context(columns=[model.schema().idColumn().field()],
+                                              expand=None,
+                                              order=None,
+                                              limit=1,
+                                              context=context))
         if sql:
-            sql = 'SELECT COUNT(*) AS count FROM ({0}) AS records;'.format(sql)
+            sql = u'SELECT EXISTS(\n{0}\n) AS `exists`;'.format(sql)
         return sql, data
 
 
-SQLiteStatement.registerAddon('SELECT COUNT', SELECT_COUNT())
\ No newline at end of file
+SQLiteStatement.registerAddon('SELECT COUNT', SELECT_COUNT())
+SQLiteStatement.registerAddon('SELECT COUNT ESTIMATE', SELECT_COUNT_ESTIMATE())
+SQLiteStatement.registerAddon('SELECT EXISTS', SELECT_EXISTS())
@@ -0,0 +1,266 @@
+import projex.text
+
+from projex.decorators import abstractmethod
+from projex.lazymodule import lazy_import
+from ..sqliteconnection import SQLiteStatement
+
+orb = lazy_import('orb')
+
+
+class SELECT_EXPAND(SQLiteStatement):
+    def __call__(self, obj, tree, alias=''):
+        name, sql, data = self.generateRow(obj, tree, alias=alias)
+        return u'(\n{0}\n) AS `{1} [json]`'.format(sql, name), data
+
+    def collectionFields(self, tree, records_alias):
+        """
+        Returns the json_object keys and values that are selected for an expanded
+        collection, based on the keywords within the expand tree.
+
+        :param      tree          | <dict>
+                    records_alias | <str>
+
+        :return     [<str>, ..]
+        """
+        records = u'json_group_array(json(`{0}`.`json`))'.format(records_alias)
+
+        fields = []
+        if 'ids' in tree:
+            fields.append(u"'ids', json_group_array(`{0}`.`id`)".format(records_alias))
+        if 'count' in tree:
+            fields.append(u"'count', count(*)")
+        if 'first' in tree:
+            fields.append(u"'first', json(json_extract({0}, '$[0]'))".format(records))
+        if 'last' in tree:
+            fields.append(u"'last', json(json_extract({0}, '$[#-1]'))".format(records))
+        if 'records' in tree or not fields:
+            fields.append(u"'records', {0}".format(records))
+        return fields
+
+    @abstractmethod()
+    def generateRow(self, obj, tree, alias=''):
+        """
+        Generates the query that selects the expanded json value for the inputted
+        column or collector, correlated against the given source alias.
+
+        :param      obj   | <orb.Column> || <orb.Collector>
+                    tree  | <dict>
+                    alias | <str>
+
+        :return     (<str> name, <str> sql, <dict> data)
+        """
+
+    def generateSubTree(self, model, tree):
+        schema = model.schema()
+
+        expand_col = self.byName('SELECT EXPAND COLUMN')
+        expand_pipe = self.byName('SELECT EXPAND PIPE')
+        expand_rev = self.byName('SELECT EXPAND REVERSE')
+
+        for name, sub_tree in tree.items():
+            # cannot expand these keywords, they are reserved
+            if name in ('ids', 'count', 'records'):
+                continue
+
+            # these are expanded via the sub-tree
+            elif name in ('first', 'last'):
+                for child in self.generateSubTree(model, sub_tree):
+                    yield child
+
+            # otherwise, lookup a column, pipe or reverse lookup
+            else:
+                column = schema.column(name, raise_=False)
+                if column:
+                    if not column.testFlag(column.Flags.Virtual):
+                        yield expand_col, column, sub_tree
+                else:
+                    collector = schema.collector(name)
+                    if collector:
+                        if not collector.testFlag(collector.Flags.Virtual):
+                            if isinstance(collector, orb.Pipe):
+                                yield expand_pipe, collector, sub_tree
+                            elif isinstance(collector, orb.ReverseLookup):
+                                yield expand_rev, collector, sub_tree
+                    else:
+                        raise orb.errors.ColumnNotFound(schema.name(), name)
+
+    def collectSubTree(self, model, tree, alias=''):
+        fields = []
+        data = {}
+        for action, obj, sub_tree in self.generateSubTree(model, tree):
+            name, sub_sql, sub_data = action.generateRow(obj, sub_tree, alias=alias)
+            fields.append(u"'{0}', json((\n{1}\n))".format(name, sub_sql))
+            data.update(sub_data)
+        return fields, data
+
+    def generateObject(self, model, tree, alias):
+        """
+        Generates the json_object call for a record of the inputted model, which
+        includes the columns stored in the model's table, the translations for the
+        current locale and any nested expansions.
+
+        :param      model | <subclass of orb.Model>
+                    tree  | <dict>
+                    alias | <str>
+
+        :return     (<str> sql, <dict> data)
+        """
+        schema = model.schema()
+        table = schema.dbname()
+
+        fields = []
+        for column in schema.columns(recurse=False).values():
+            if column.testFlag(column.Flags.Virtual):
+                continue
+            elif column.testFlag(column.Flags.I18n):
+                sql = u"'{0}', (SELECT `{0}` FROM `{1}_i18n` WHERE `{1}_id` = `{2}`.`{3}` AND `locale` = %(locale)s)"
+                fields.append(sql.format(column.field(), table, alias, schema.idColumn().field()))
+            else:
+                fields.append(u"'{0}', `{1}`.`{0}`".format(column.field(), alias))
+
+        sub_fields, data = self.collectSubTree(model, tree, alias=alias)
+        return u'json_object({0})'.format(u', '.join(fields + sub_fields)), data
+
+    def generateBaseWhere(self, model, alias):
+        """
+        Generates the filter for the base query of the inputted model, if one
+        is defined.
+
+        :param      model | <subclass of orb.Model>
+                    alias | <str>
+
+        :return     (<str> sql, <dict> data)
+        """
+        query = model.baseQuery()
+        if query is not None:
+            WHERE = self.byName('WHERE')
+            sql, data = WHERE(model, query, aliases={model: alias})
+            if sql:
+                return u'({0}) AND '.format(sql), data
+        return u'', {}
+
+
+class SELECT_EXPAND_COLUMN(SELECT_EXPAND):
+    def generateRow(self, column, tree, alias=''):
+        target = column.referenceModel()
+        target_name = projex.text.underscore(column.name())
+        target_alias = '{0}_table'.format(target_name)
+
+        target_base_where, data = self.generateBaseWhere(target, target_alias)
+        target_json, target_data = self.generateObject(target, tree, target_alias)
+        data.update(target_data)
+
+        # generate the sql options
+        sql_options = {
+            'target_json': target_json,
+            'target_alias': target_alias,
+            'target_id_field': target.schema().idColumn().field(),
+            'target_base_where': target_base_where,
+            'target_table': target.schema().dbname(),
+            'source_table': alias or column.schema().dbname(),
+            'source_field': column.field()
+        }
+
+        # generate the sql
+        sql = (
+            u'  SELECT {target_json}\n'
+            u'  FROM `{target_table}` AS `{target_alias}`\n'
+            u'  WHERE {target_base_where}`{target_alias}`.`{target_id_field}` = `{source_table}`.`{source_field}`'
+        ).format(**sql_options)
+
+        return target_name, sql, data
+
+
+class SELECT_EXPAND_REVERSE(SELECT_EXPAND):
+    def generateRow(self, reversed, tree, alias=''):
+        target = reversed.referenceModel()
+        source = reversed.schema().model()
+
+        target_name = projex.text.underscore(reversed.name())
+        target_records_alias = '{0}_records'.format(target_name)
+        target_alias = '{0}_table'.format(target_name)
+
+        target_base_where, data = self.generateBaseWhere(target, target_alias)
+        target_json, target_data = self.generateObject(target, tree, target_alias)
+        data.update(target_data)
+
+        # define the sql options
+        sql_options = {
+            'target_fields': u', '.join(self.collectionFields(tree, target_records_alias)),
+            'target_json': target_json,
+            'target_alias': target_alias,
+            'target_base_where': target_base_where,
+            'target_table': target.schema().dbname(),
+            'target_id_field': target.schema().idColumn().field(),
+            'target_records_alias': target_records_alias,
+            'source_table': alias or source.schema().dbname(),
+            'source_field': reversed.targetColumn().field(),
+            'source_id_field': source.schema().idColumn().field(),
+            'limit_if_unique': 'LIMIT 1' if reversed.testFlag(reversed.Flags.Unique) else ''
+        }
+
+        # define the sql
+        sql = (
+            u'  SELECT json_object({target_fields})\n'
+            u'  FROM (\n'
+            u'      SELECT `{target_alias}`.`{target_id_field}` AS `id`, {target_json} AS `json`\n'
+            u'      FROM `{target_table}` AS `{target_alias}`\n'
+            u'      WHERE {target_base_where}`{target_alias}`.`{source_field}` = `{source_table}`.`{source_id_field}`\n'
+            u'      {limit_if_unique}\n'
+            u'  ) AS `{target_records_alias}`'
+        ).format(**sql_options)
+
+        return target_name, sql, data
+
+
+class SELECT_EXPAND_PIPE(SELECT_EXPAND):
+    def generateRow(self, pipe, tree, alias=''):
+        source = pipe.fromModel()
+        through = pipe.throughModel()
+        target = pipe.toModel()
+
+        target_name = projex.text.underscore(pipe.name())
+        target_records_alias = '{0}_records'.format(target_name)
+        target_alias = '{0}_table'.format(target_name)
+
+        target_base_where, data = self.generateBaseWhere(target, target_alias)
+        target_json, target_data = self.generateObject(target, tree, target_alias)
+        data.update(target_data)
+
+        # define the sql options
+        sql_options = {
+            'target_fields': u', '.join(self.collectionFields(tree, target_records_alias)),
+            'target_json': target_json,
+            'target_alias': target_alias,
+            'target_base_where': target_base_where,
+            'target_table': target.schema().dbname(),
+            'target_id_field': target.schema().idColumn().field(),
+            'target_field': pipe.toColumn().field(),
+            'target_records_alias': target_records_alias,
+            'through_table': through.schema().dbname(),
+            'source_table': alias or source.schema().dbname(),
+            'source_id_field': source.schema().idColumn().field(),
+            'source_field': pipe.fromColumn().field(),
+            'limit_if_unique': 'LIMIT 1' if pipe.testFlag(pipe.Flags.Unique) else ''
+        }
+
+        # define the sql
+        sql = (
+            u'  SELECT json_object({target_fields})\n'
+            u'  FROM (\n'
+            u'      SELECT `{target_alias}`.`{target_id_field}` AS `id`, {target_json} AS `json`\n'
+            u'      FROM `{target_table}` AS `{target_alias}`\n'
+            u'      WHERE {target_base_where}`{target_alias}`.`{target_id_field}` IN (\n'
+            u'          SELECT DISTINCT `t`.`{target_field}`\n'
+            u'          FROM `{through_table}` AS `t`\n'
+            u'          WHERE `t`.`{source_field}` = `{source_table}`.`{source_id_field}`\n'
+            u'          {limit_if_unique}\n'
+            u'      )\n'
+            u'  ) AS `{target_records_alias}`'
+        ).format(**sql_options)
+
+        return target_name, sql, data
+
+SQLiteStatement.registerAddon('SELECT EXPAND COLUMN', SELECT_EXPAND_COLUMN())
+SQLiteStatement.registerAddon('SELECT EXPAND REVERSE', SELECT_EXPAND_REVERSE())
+SQLiteStatement.registerAddon('SELECT EXPAND PIPE', SELECT_EXPAND_PIPE())
@@ -1,25 +1,44 @@
 import os
 from projex.lazymodule import lazy_import
+from ...joinplan import JoinPlan
+from ...valuetable import ValueTable
 from ..sqliteconnection import SQLiteStatement
 
 orb = lazy_import('orb')
 
 
 class WHERE(SQLiteStatement):
-    def __call__(self, model, query, aliases=None, fields=None):
+    # lists with more values than this are split into batches, or loaded into a temporary
+    # table, to stay within the variable limit for a statement
+    ValueChunkSize = 500
+    ValueTableThreshold = 500
+
+    def __call__(self, model, query, aliases=None, fields=None, joins=None):
         if query is None:
             return u'', {}
 
         aliases = aliases or {}
         fields = fields or {}
         data = {}
+
+        # compile dotted paths to joins and correlated EXISTS queries when possible
+        if isinstance(query, orb.Query):
+            planner = joins or JoinPlan(model, alias=aliases.get(model), quote=u'`{0}`')
+            compiled = planner.compile(model,
+                                       query,
+                                       lambda m, q, a, j: self(m, q, aliases=a, joins=j),
+                                       aliases=aliases,
+                                       references=joins is not None)
+            if compiled is not None:
+                return compiled
+
         query = query.expand(model)
 
         # generate a query compound
         if isinstance(query, orb.QueryCompound):
             sub_query_sql = []
             for sub_query in query:
-                sub_sql, sub_data = self(model, sub_query, aliases, fields)
+                sub_sql, sub_data = self(model, sub_query, aliases, fields, joins)
                 if sub_sql:
                     sub_query_sql.append(sub_sql)
                     data.update(sub_data)
@@ -32,8 +51,9 @@ class WHERE(SQLiteStatement):
             if not column:
                 raise orb.errors.ColumnNotFound(model.schema().name(), query.columnName())
 
-            # generate the sql field
-            field = fields.get(column) or self.generateField(model, column, query, aliases)
+            # generate the sql field, using the expression from the index for case-insensitive lookups
+            index_field = self.indexField(model, column, query, aliases) if column not in fields else None
+            field = fields.get(column) or index_field or self.generateField(model, column, query, aliases, data)
             value_key = u'{0}_{1}'.format(column.field(), os.urandom(4).encode('hex'))
 
             # calculate any math operations to the sql field
@@ -65,7 +85,7 @@ class WHERE(SQLiteStatement):
             if isinstance(value, (orb.Query, orb.QueryCompound)):
                 val_model = value.model()
                 val_column = value.column()
-                val_field = self.generateField(val_model, val_column, value, aliases)
+                val_field = self.generateField(val_model, val_column, value, aliases, data)
                 if invert:
                     sql =  u' '.join((val_field, sql_op, field))
                 else:
@@ -87,8 +107,12 @@ class WHERE(SQLiteStatement):
                 if sub_sql:
                     sql = u'{0} {1} ({2})'.format(field, sql_op, sub_sql.strip(';'))
                     data.update(sub_data)
+
+                # a sub-query that cannot match any records leaves nothing to compare against
+                elif op == orb.Query.Op.IsNotIn:
+                    sql = u'1 = 1'
                 else:
-                    raise orb.QueryInvalid('Could not create sub-query')
+                    sql = u'1 = 0'
 
             # convert all other data
             else:
@@ -101,13 +125,17 @@ class WHERE(SQLiteStatement):
                 elif op in (orb.Query.Op.Endswith, orb.Query.Op.DoesNotEndwith):
                     value = u'{0}%'.format(value)
 
-                if invert:
-                    opts = (u'%({0})s'.format(value_key), sql_op, field)
+                if op in (orb.Query.Op.IsIn, orb.Query.Op.IsNotIn) and not invert:
+                    sql, list_data = self.listSql(field, op, value, value_key)
+                    data.update(list_data)
                 else:
-                    opts = (field, sql_op, u'%({0})s'.format(value_key))
+                    if invert:
+                        opts = (u'%({0})s'.format(value_key), sql_op, field)
+                    else:
+                        opts = (field, sql_op, u'%({0})s'.format(value_key))
 
-                sql = u' '.join(opts)
-                data[value_key] = value
+                    sql = u' '.join(opts)
+                    data[value_key] = value
 
                 if column.testFlag(column.Flags.I18n) and column not in fields:
                     model_name = aliases.get(model) or model.schema().dbname()
@@ -122,7 +150,7 @@ class WHERE(SQLiteStatement):
 
         return sql, data
 
-    def generateField(self, model, column, query, aliases):
+    def generateField(self, model, column, query, aliases, data=None):
         alias = aliases.get(model) or model.schema().dbname()
         field = column.field()
 
@@ -130,15 +158,72 @@ class WHERE(SQLiteStatement):
 
         # process any functions on the query
         for func in query.functions():
-            try:
-                sql_func = self.funcSql(func)
-                sql_field = sql_func.format(sql_field)
-            except KeyError:
-                msg = 'Unknown function type: {0}'.format(orb.Query.Function(func))
-                raise orb.errors.QueryInvalid(msg)
+            sql_field = self.funcSql(model, func, sql_field, aliases, data)
 
         return sql_field
 
+    def indexField(self, model, column, query, aliases):
+        """
+        Returns the field expression that matches the index created for case-insensitive
+        string columns (`column` COLLATE NOCASE) when the query is a lowercase equality
+        lookup that can use it, otherwise None is returned.
+
+        :param      model   | <subclass of orb.Model>
+                    column  | <orb.Column>
+                    query   | <orb.Query>
+                    aliases | {<subclass of orb.Model>: <str>, ..}
+
+        :return     <str> || None
+        """
+        if (not isinstance(column, orb.AbstractStringColumn) or
+                column.testFlag(column.Flags.CaseSensitive) or
+                column.testFlag(column.Flags.I18n) or
+                query.math() or
+                query.isInverted() or
+                query.op() not in (orb.Query.Op.Is, orb.Query.Op.IsNot) or
+                list(query.functions()) != [orb.Query.Function.Lower] or
+                not isinstance(query.value(), basestring)):
+            return None
+
+        alias = aliases.get(model) or model.schema().dbname()
+        return u'`{0}`.`{1}` COLLATE NOCASE'.format(alias, column.field())
+
+    def listSql(self, field, op, values, value_key):
+        """
+        Generates the SQL for an IN or NOT IN check against a list of values.  Lists
+        larger than the `ValueTableThreshold` are loaded into a temporary table that
+        is joined against, and lists larger than the `ValueChunkSize` that cannot be
+        loaded into a table are split into batches that are combined together.
+
+        :param      field     | <str>
+                    op        | <orb.Query.Op>
+                    values    | (<variant>, ..)
+                    value_key | <str>
+
+        :return     (<str> sql, <dict> data)
+        """
+        sql_op = u'IN' if op == orb.Query.Op.IsIn else u'NOT IN'
+        kind = ValueTable.valueKind(values)
+
+        if kind is not None and len(values) > self.ValueTableThreshold:
+            sql = u'{0} {1} (SELECT `value` FROM `{2}`)'.format(field, sql_op, ValueTable.tableName(value_key))
+            return sql, {value_key: ValueTable(values, kind)}
+
+        elif len(values) > self.ValueChunkSize:
+            size = self.ValueChunkSize
+            data = {}
+            sql = []
+            for i in xrange(0, len(values), size):
+                chunk_key = u'{0}_{1}'.format(value_key, i // size)
+                data[chunk_key] = tuple(values[i:i + size])
+                sql.append(u'{0} {1} %({2})s'.format(field, sql_op, chunk_key))
+
+            joiner = u' OR ' if op == orb.Query.Op.IsIn else u' AND '
+            return u'({0})'.format(joiner.join(sql)), data
+
+        else:
+            return u'{0} {1} %({2})s'.format(field, sql_op, value_key), {value_key: values}
+
     @staticmethod
     def opSql(op, caseSensitive=False):
         general_mapping = {
@@ -170,14 +255,38 @@ class WHERE(SQLiteStatement):
 
         return general_mapping.get(op) or (sensitive_mapping[op] if caseSensitive else non_sensitive_mapping[op])
 
-    @staticmethod
-    def funcSql(func):
-        func_mapping = {
-            orb.Query.Function.Lower: u'lower({0})',
-            orb.Query.Function.Upper: u'upper({0})',
-            orb.Query.Function.Abs: u'abs({0})',
-            orb.Query.Function.AsString: u'{0}::varchar'
-        }
-        return func_mapping[func]
+    def funcSql(self, model, func, field, aliases, data=None):
+        """
+        Applies a query function to the inputted field using the template that is
+        registered for this dialect.  Arguments are bound into the data, and query
+        arguments are converted to the fields that they look up.
+
+        :param      model   | <subclass of orb.Model>
+                    func    | <orb.Query.Function> || (<str> name, (<variant>, ..) args)
+                    field   | <str>
+                    aliases | {<subclass of orb.Model>: <str>, ..}
+                    data    | <dict> || None
+
+        :return     <str>
+        """
+        name, args = orb.QueryFunction.parse(func)
+        function = orb.QueryFunction.byName(name)
+
+        sql_args = []
+        for arg in args:
+            if isinstance(arg, orb.Query):
+                arg_model = arg.model(model)
+                sql_args.append(self.generateField(arg_model, arg.column(arg_model), arg, aliases, data))
+            elif data is None:
+                raise orb.errors.QueryInvalid('Could not bind the arguments for {0}'.format(name))
+            else:
+                key = u'{0}_{1}'.format(name, os.urandom(4).encode('hex'))
+                data[key] = arg
+                sql_args.append(u'%({0})s'.format(key))
+
+        sql = function('SQLite', field, sql_args) if function else None
+        if sql is None:
+            raise orb.errors.QueryInvalid('Unknown function type: {0}'.format(name))
+        return sql
 
 SQLiteStatement.registerAddon('WHERE', WHERE())
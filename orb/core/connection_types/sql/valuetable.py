@@ -0,0 +1,53 @@
+""" Defines the value lists that are loaded into temporary tables for large IN checks. """
+
+
+class ValueTable(tuple):
+    """
+    Defines a large list of values for an IN check that is loaded into a temporary
+    table by the connection before the statement is run, rather than being bound as
+    individual parameters.  The WHERE statements select from the table that is named
+    after the parameter key the values are stored under (see `tableName`), and the
+    table is dropped once the statement has been run.
+    """
+    def __new__(cls, values, kind):
+        out = super(ValueTable, cls).__new__(cls, values)
+        out.__kind = kind
+        return out
+
+    def kind(self):
+        """
+        Returns the kind of values stored in this table, used to determine the column
+        type for the temporary table.
+
+        :return     <str> | 'integer' || 'string'
+        """
+        return self.__kind
+
+    @staticmethod
+    def tableName(key):
+        """
+        Returns the name of the temporary table for the given parameter key.
+
+        :param      key | <str>
+
+        :return     <str>
+        """
+        return u'orb_values_{0}'.format(key)
+
+    @staticmethod
+    def valueKind(values):
+        """
+        Returns the kind of values within the inputted list, if they can be loaded
+        into a temporary table or cast to a typed array.  If the values are of mixed
+        or unsupported types, then None is returned.
+
+        :param      values | [<variant>, ..]
+
+        :return     <str> | 'integer' || 'string' || None
+        """
+        if all(isinstance(value, (int, long)) and not isinstance(value, bool) for value in values):
+            return 'integer'
+        elif all(isinstance(value, basestring) for value in values):
+            return 'string'
+        else:
+            return None
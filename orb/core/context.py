@@ -27,8 +27,10 @@ class Context(object):
         'db': None,
         'database': None,
         'distinct': False,
+        'defer': None,
         'dryRun': False,
         'expand': None,
+        'expandStrategy': None,
         'format': 'json',
         'force': False,
         'inflated': True,
@@ -49,6 +51,7 @@ class Context(object):
 
     QueryFields = {
         'columns',
+        'defer',
         'expand',
         'limit',
         'order',
@@ -232,6 +235,36 @@ class Context(object):
         else:
             return out
 
+    def deferredColumns(self, schema):
+        """
+        Returns the columns for the given schema that should not be selected by default,
+        which includes columns flagged as Deferred and any columns within the defer option.
+
+        :param      schema | <orb.Schema>
+
+        :return     {<orb.Column>, ..}
+        """
+        output = set(schema.columns(flags=orb.Column.Flags.Deferred).values())
+        output.update(schema.column(col) for col in self.defer or [])
+        output.discard(schema.idColumn())
+        return output
+
+    def queryColumns(self, schema):
+        """
+        Returns the columns that should be selected from the backend for the given schema.
+        If no columns are explicitly requested, all columns are used except for the deferred
+        ones.
+
+        :param      schema | <orb.Schema>
+
+        :return     [<orb.Column>, ..]
+        """
+        if self.columns:
+            return [schema.column(col) for col in self.columns]
+        else:
+            deferred = self.deferredColumns(schema)
+            return [col for col in schema.columns().values() if col not in deferred]
+
     def schemaColumns(self, schema):
         return [schema.column(col) for col in self.columns or []]
 
@@ -324,6 +357,10 @@ class Context(object):
         if 'columns' in other_context and isinstance(other_context['columns'], (str, unicode)):
             other_context['columns'] = other_context['columns'].split(',')
 
+        # convert the deferred columns to a list
+        if 'defer' in other_context and isinstance(other_context['defer'], (str, unicode)):
+            other_context['defer'] = other_context['defer'].split(',')
+
         # convert where to query
         where = other_context.get('where')
         if isinstance(where, dict):
@@ -345,6 +382,9 @@ class Context(object):
         if other_context.get('pageSize') is not None and (type(other_context['pageSize']) != int or other_context['pageSize'] < 1):
             msg = 'Page size needs to be a number equal to or greater than 1, got {0} instead'
             raise orb.errors.InvalidContextOption(msg.format(other_context.get('pageSize')))
+        if other_context.get('expandStrategy') not in (None, 'subquery', 'lateral'):
+            msg = 'Expand strategy needs to be one of subquery or lateral, got {0} instead'
+            raise orb.errors.InvalidContextOption(msg.format(other_context.get('expandStrategy')))
 
         # update the raw values
         self.raw_values.update({k: v for k, v in other_context.items() if k in self.Defaults})
@@ -95,10 +95,24 @@ class DeleteEvent(RecordEvent):
         self.context = context
 
 class LoadEvent(RecordEvent):
-    def __init__(self, data=None, **options):
+    def __init__(self, data=None, restored=None, columns=None, **options):
         super(LoadEvent, self).__init__(**options)
 
         self.data = data
+        self.columns = columns  # keys for the data when it is loaded as a row tuple
+        self.restored = restored or frozenset()  # keys within the data that have already been restored
+
+    def items(self):
+        """
+        Returns the key and value pairs for the loaded data, which is either a
+        dictionary or a row tuple for the event's columns.
+
+        :return     [(<str> key, <variant> value), ..]
+        """
+        if self.columns is not None:
+            return zip(self.columns, self.data)
+        else:
+            return self.data.items()
 
 
 class SyncEvent(ModelEvent):
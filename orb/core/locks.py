@@ -0,0 +1,40 @@
+""" Defines the locks that are used to protect record and collection data. """
+
+from projex.locks import ReadWriteLock
+from projex.lazymodule import lazy_import
+
+orb = lazy_import('orb')
+
+
+class NullLock(object):
+    """
+    Defines a lock with the same interface as the <projex.locks.ReadWriteLock> that does
+    not perform any locking.  This is used for records and collections that are confined to
+    a single thread, such as within gevent or asyncio workers.
+    """
+    def reader_acquire(self):
+        pass
+
+    def reader_release(self):
+        pass
+
+    def writer_acquire(self):
+        pass
+
+    def writer_release(self):
+        pass
+
+NULL_LOCK = NullLock()
+
+
+def create_lock():
+    """
+    Creates a new data lock based on the `record_locking` setting.  When the setting is
+    'none', the shared no-op lock is returned, otherwise a new read/write lock is created.
+
+    :return     <projex.locks.ReadWriteLock> || <orb.core.locks.NullLock>
+    """
+    if orb.system.settings().record_locking == 'none':
+        return NULL_LOCK
+    else:
+        return ReadWriteLock()
@@ -4,16 +4,20 @@ database classes.
 """
 
 import logging
+import threading
+import weakref
 import projex.rest
 import projex.security
 import projex.text
 
 from collections import defaultdict
-from projex.locks import ReadLocker, ReadWriteLock, WriteLocker
+from projex.locks import ReadLocker, WriteLocker
 from projex.lazymodule import lazy_import
 from projex import funcutil
 
+from .locks import NULL_LOCK, create_lock
 from .metamodel import MetaModel
+from .plan import JSONPlan, json_plan_key
 from .search import SearchEngine
 
 
@@ -21,6 +25,25 @@ log = logging.getLogger(__name__)
 orb = lazy_import('orb')
 errors = lazy_import('orb.errors')
 
+# guards the lazy creation of record locks
+_LOCK_CREATION = threading.Lock()
+
+# maximum number of serialization plans to cache per schema
+_JSON_PLAN_CACHE_SIZE = 256
+
+
+def _allowed(columns=None, context=None):
+    """ Default authorization for serializing columns, which hides private columns. """
+    return not columns[0].testFlag(columns[0].Flags.Private)
+
+
+class _RawValue(object):
+    """ Holds a database value for a lazily restored column until it is first accessed. """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
 
 class Model(object):
     """
@@ -32,6 +55,20 @@ class Model(object):
     __search_engine__ = 'basic'
     __auth__ = None
 
+    # keep the per-record storage compact, the lock, cache and preload
+    # information are only allocated when they are first needed
+    __slots__ = (
+        '__dataLock',
+        '__values',
+        '__original',
+        '__loaded',
+        '__context',
+        '__cache',
+        '__preload',
+        '__group',
+        '__weakref__'
+    )
+
     def __len__(self):
         return len(self.schema().columns())
 
@@ -59,50 +96,8 @@ class Model(object):
         """
         # additional options
         context = self.context()
-
-        # hide private columns
-        def _allowed(columns=None, context=None):
-            return not columns[0].testFlag(columns[0].Flags.Private)
-
-        auth = self.__auth__ if callable(self.__auth__) else _allowed
-
-        schema = self.schema()
-
-        if context.columns:
-            columns = [schema.column(x) for x in context.columns]
-        else:
-            columns = schema.columns(flags=~orb.Column.Flags.RequiresExpand).values()
-
-        columns = [x for x in columns if x and auth(columns=(x,), context=context)]
-
-        # simple json conversion
-        output = self.values(key='field', columns=columns, inflated=False)
-
-        # expand any references we need
-        expand_tree = context.expandtree(self.__class__)
-        if expand_tree:
-            for key, subtree in expand_tree.items():
-                try:
-                    value = self.get(
-                        key,
-                        expand=subtree,
-                        returning=context.returning,
-                        scope=context.scope
-                    )
-                except orb.errors.ColumnNotFound:
-                    continue
-                else:
-                    if hasattr(value, '__json__'):
-                        output[key] = value.__json__()
-                    else:
-                        output[key] = value
-
-        # don't include the column names
-        if context.returning == 'values':
-            output = tuple(output[column.field()]
-                           for column in context.schemaColumns(self.schema()))
-            if len(output) == 1:
-                output = output[0]
+        plan = type(self).jsonPlan(context, record=self)
+        output = self._json(plan, context, plan.valueContext(context))
 
         if context.format == 'text':
             return projex.rest.jsonify(output)
@@ -207,12 +202,14 @@ class Model(object):
 
         context.setdefault('namespace', self.schema().namespace())
 
-        self.__dataLock = ReadWriteLock()
-        self.__values = {}
-        self.__loaded = set()
+        self.__dataLock = None
+        self.__values = {}          # current values by column name
+        self.__original = None      # committed values for modified columns
+        self.__loaded = False       # whether the id column was loaded from the backend
         self.__context = orb.Context(**context)
-        self.__cache = defaultdict(dict)
-        self.__preload = {}
+        self.__cache = None
+        self.__preload = None
+        self.__group = None         # weak references to the records that were inflated together, for loading deferred columns
 
         # extract values to use from the record
         record = []
@@ -254,56 +251,278 @@ class Model(object):
         if update_values:
             self.update(update_values)
 
-    def _load(self, event):
+    def _json(self, plan, context, value_context):
+        """
+        Serializes this record using the given plan.
+
+        :param      plan          | <orb.core.plan.JSONPlan>
+                    context       | <orb.Context>
+                    value_context | <orb.Context> | used to restore the column values
+
+        :return     <dict> || <tuple> || <variant>
+        """
+        # re-use the serialized stored values for unchanged versions of this record
+        key = self.__versionKey() if not context.scope else None
+        output = plan.cachedRecord(key) if key is not None else None
+        if output is None:
+            output = {}
+            for field, column in plan.direct:
+                output[field] = column.valueToJSON(column.restore(self.__storedValue(column), value_context))
+
+            if key is not None:
+                plan.cacheRecord(key, output)
+
+        for field, column in plan.indirect:
+            output[field] = self.get(column, inflated=False)
+
+        # expand any references we need
+        for key, subtree in plan.expand:
+            try:
+                value = self.get(
+                    key,
+                    expand=subtree,
+                    returning=context.returning,
+                    scope=context.scope
+                )
+            except orb.errors.ColumnNotFound:
+                continue
+            else:
+                if hasattr(value, '__json__'):
+                    output[key] = value.__json__()
+                else:
+                    output[key] = value
+
+        # don't include the column names
+        return plan.pack(output)
+
+    def _load(self, event, notify=True):
         """
         Processes a load event by setting the properties of this record
-        to the data restored from the database.
+        to the data restored from the database.  Values that are loaded after
+        the record was first loaded, such as deferred columns, do not notify
+        the onLoad event again.
 
         :param event: <orb.events.LoadEvent>
+        :param notify: <bool>
         """
         if not event.data:
             return
 
         context = self.context()
         schema = self.schema()
-        dbname = schema.dbname()
+        plan = schema.plan()
+        loaders = plan.loaders
+        restored = event.restored
+        dbname = None
         clean = {}
 
-        for col, value in event.data.items():
+        for col, value in event.items():
             try:
-                model_dbname, col_name = col.split('.')
-            except ValueError:
-                col_name = col
-                model_dbname = dbname
+                column, restore = loaders[col]
+            except KeyError:
+                if dbname is None:
+                    dbname = schema.dbname()
 
-            # make sure the value we're setting is specific to this model
-            try:
-                column = schema.column(col_name)
-            except orb.errors.ColumnNotFound:
-                column = None
+                try:
+                    model_dbname, col_name = col.split('.')
+                except ValueError:
+                    col_name = col
+                    model_dbname = dbname
 
-            if model_dbname != dbname or (column in clean and isinstance(clean[column], Model)):
-                continue
+                # make sure the value we're setting is specific to this model
+                try:
+                    column = schema.column(col_name)
+                except orb.errors.ColumnNotFound:
+                    column = None
 
-            # look for preloaded reverse lookups and pipes
-            elif not column:
-                self.__preload[col_name] = value
+                if model_dbname != dbname or (column in clean and isinstance(clean[column], Model)):
+                    continue
+
+                # look for preloaded reverse lookups and pipes
+                elif not column:
+                    if self.__preload is None:
+                        self.__preload = {}
+                    self.__preload[col_name] = value
+
+                # extract the value from the database
+                elif value is not None and column.restoresLazily():
+                    clean[column] = _RawValue(value)
+                else:
+                    clean[column] = column.dbRestore(value, context=context)
 
-            # extract the value from the database
             else:
-                value = column.dbRestore(value, context=context)
-                clean[column] = value
+                if column in clean and isinstance(clean[column], Model):
+                    continue
+                elif col in restored:
+                    clean[column] = value
+                elif restore is not None:
+                    clean[column] = restore(value, context=context)
+                elif value is not None:
+                    clean[column] = _RawValue(value)
+                else:
+                    clean[column] = column.dbRestore(value, context=context)
 
         # update the local values
-        with WriteLocker(self.__dataLock):
+        with WriteLocker(self.__lock(create=False)):
+            values = self.__values
+            original = self.__original
             for col, val in clean.items():
-                default = val if not isinstance(val, dict) else val.copy()
-                self.__values[col.name()] = (default, val)
-                self.__loaded.add(col)
+                name = col.name()
+                values[name] = val
 
-        if self.processEvent(event):
+                # store a copy of mutable values to compare against for changes
+                if isinstance(val, dict):
+                    if original is None:
+                        original = self.__original = {}
+                    original[name] = val.copy()
+                elif original:
+                    original.pop(name, None)
+
+            if plan.idColumn in clean:
+                self.__loaded = True
+
+        if notify and self.processEvent(event):
             self.onLoad(event)
 
+    def __restoreRaw(self, column, raw):
+        """
+        Restores the database value for a lazily loaded column.  If the restored value
+        is mutable, then a copy is stored to compare against for changes.  This method
+        does not lock, callers are expected to hold the write lock.
+
+        :param      column | <orb.Column>
+                    raw    | <_RawValue>
+
+        :return     <variant>
+        """
+        name = column.name()
+        current = self.__values.get(name)
+
+        # another thread may have already restored this value
+        if current is not raw and type(current) is not _RawValue:
+            return current
+
+        value = column.dbRestore(current.value, context=self.context())
+        self.__values[name] = value
+
+        if isinstance(value, dict):
+            if self.__original is None:
+                self.__original = {}
+            self.__original.setdefault(name, value.copy())
+
+        return value
+
+    def __loadDeferred(self, column):
+        """
+        Loads the values for a column that was not selected when this record was loaded.  If
+        this record was inflated along with other records (such as a collection page), then
+        the value will be loaded for all of those records in a single query.
+
+        :param      column | <orb.Column>
+        """
+        name = column.name()
+        group = [ref() for ref in self.__group] if self.__group else [self]
+        records = [record for record in group
+                   if record is not None and record.__loaded and name not in record.__values and
+                   column in record.schema().plan().storedSet]
+        if self not in records:
+            records.append(self)
+
+        model = column.schema().model()
+        id_column = model.schema().idColumn()
+        ids = [record.id() for record in records]
+
+        context = {k: v for k, v in self.context().raw_values.items() if k not in orb.Context.QueryFields}
+        context['where'] = orb.Query(model).in_(ids)
+        context['columns'] = [id_column, column]
+        context['inflated'] = False
+
+        rows = model.select(**context).records()
+        values = {id_column.dbRestore(row[id_column.field()]): row[column.field()] for row in rows}
+
+        for record in records:
+            data = {column.field(): values.get(record.id())}
+            record._load(orb.events.LoadEvent(record=record, data=data), notify=False)
+
+    def __storedValue(self, column):
+        """
+        Returns the stored value for the given column, loading deferred values from
+        the backend and restoring lazily loaded values as needed.
+
+        :param      column | <orb.Column>
+
+        :return     <variant>
+        """
+        with ReadLocker(self.__lock()):
+            try:
+                value = self.__values[column.name()]
+            except KeyError:
+                value = None
+                missing = True
+            else:
+                missing = False
+
+        # load any deferred values from the backend
+        if missing and self.__loaded and column in self.schema().plan().storedSet:
+            self.__loadDeferred(column)
+            with ReadLocker(self.__lock()):
+                value = self.__values.get(column.name())
+
+        # restore lazily loaded values on first access
+        if type(value) is _RawValue:
+            with WriteLocker(self.__lock()):
+                value = self.__restoreRaw(column, value)
+
+        return value
+
+    def __versionKey(self):
+        """
+        Returns the key that identifies the saved version of this record, based on
+        its id and the version column for its schema.  Records without a version
+        column, without a loaded version or with local changes will return None,
+        the version is not loaded from the backend when it was deferred.
+
+        :return     (<variant> id, <variant> version) || None
+        """
+        column = self.schema().plan().version
+        if column is None or not self.isRecord():
+            return None
+
+        with ReadLocker(self.__lock()):
+            values = self.__values
+            version = values.get(column.name())
+
+            # mutable values keep a copy of their original value, which only
+            # counts as a change when the value has been modified
+            for name, value in (self.__original or {}).items():
+                if values.get(name) != value:
+                    return None
+
+        if type(version) is _RawValue:
+            version = self.__storedValue(column)
+        return None if version is None else (self.id(), version)
+
+    def __lock(self, create=True):
+        """
+        Returns the read/write lock for this record, creating it on first use.  If the
+        create flag is False and no lock has been created yet, then a no-op lock is
+        returned -- used while loading values during construction.
+
+        :param      create | <bool>
+
+        :return     <projex.locks.ReadWriteLock> || <orb.core.locks.NullLock>
+        """
+        lock = self.__dataLock
+        if lock is None:
+            if not create:
+                return NULL_LOCK
+
+            with _LOCK_CREATION:
+                lock = self.__dataLock
+                if lock is None:
+                    lock = self.__dataLock = create_lock()
+        return lock
+
     # --------------------------------------------------------------------
     #                       EVENT HANDLERS
     # --------------------------------------------------------------------
@@ -341,21 +560,48 @@ class Model(object):
         Returns a dictionary of changes that have been made
         to the data from this record.
 
+        For existing records, only the columns that have been modified since
+        the record was loaded or last saved are checked.
+
         :return     { <orb.Column>: ( <variant> old, <variant> new), .. }
         """
         output = {}
         is_record = self.isRecord()
         schema = self.schema()
-        columns = [schema.column(c) for c in columns] if columns else \
-                   schema.columns(recurse=recurse, flags=flags).values()
+        lock = self.__lock()
+
+        # new records will compare every column against an empty value
+        if not is_record:
+            columns = [schema.column(c) for c in columns] if columns else \
+                       schema.columns(recurse=recurse, flags=flags).values()
+
+        # existing records only need to check the columns that have been modified
+        else:
+            with ReadLocker(lock):
+                dirty = list(self.__original) if self.__original else []
+
+            if not dirty:
+                return output
+            elif columns:
+                columns = [col for col in {schema.column(c) for c in columns} if col.name() in dirty]
+            else:
+                available = schema.columns(recurse=recurse, flags=flags)
+                columns = [available[name] for name in dirty if name in available]
 
         context = self.context(inflated=inflated)
-        with ReadLocker(self.__dataLock):
+        with ReadLocker(lock):
+            original = self.__original or {}
             for col in columns:
-                old, curr = self.__values.get(col.name(), (None, None))
                 if col.testFlag(col.Flags.ReadOnly):
                     continue
-                elif not is_record:
+
+                name = col.name()
+                curr = self.__values.get(name)
+                if type(curr) is _RawValue:
+                    curr = col.dbRestore(curr.value, context=self.context())
+
+                old = original[name] if name in original else curr
+                if not is_record:
                     old = None
 
                 check_old = col.restore(old, context)
@@ -413,8 +659,8 @@ class Model(object):
         if event.preventDefault:
             return 0
 
-        with WriteLocker(self.__dataLock):
-            self.__loaded.clear()
+        with WriteLocker(self.__lock()):
+            self.__loaded = False
 
         context = self.context(**context)
         conn = context.db.connection()
@@ -422,9 +668,11 @@ class Model(object):
 
         # clear out the old values
         if count == 1:
-            col = self.schema().column(self.schema().idColumn())
-            with WriteLocker(self.__dataLock):
-                self.__values[col.name()] = (None, None)
+            col = self.schema().idColumn()
+            with WriteLocker(self.__lock()):
+                self.__values[col.name()] = None
+                if self.__original:
+                    self.__original.pop(col.name(), None)
 
         return count
 
@@ -466,6 +714,9 @@ class Model(object):
             if not col:
                 collector = self.schema().collector(column)
                 if collector:
+                    if self.__cache is None:
+                        self.__cache = defaultdict(dict)
+
                     try:
                         return self.__cache[collector][sub_context]
                     except KeyError:
@@ -490,14 +741,13 @@ class Model(object):
                     return method(self, context=sub_context)
 
             # grab the current value
-            with ReadLocker(self.__dataLock):
-                old_value, value = self.__values.get(col.name(), (None, None))
+            value = self.__storedValue(col)
 
             # return a reference when desired
             out_value = col.restore(value, sub_context)
             if isinstance(out_value, orb.Model) and not isinstance(value, orb.Model):
-                with WriteLocker(self.__dataLock):
-                    self.__values[col.name()] = (old_value, out_value)
+                with WriteLocker(self.__lock()):
+                    self.__values[col.name()] = out_value
             return out_value
 
     def id(self, **context):
@@ -507,7 +757,7 @@ class Model(object):
 
     def init(self):
         columns = self.schema().columns().values()
-        with WriteLocker(self.__dataLock):
+        with WriteLocker(self.__lock(create=False)):
             for column in columns:
                 if column.name() not in self.__values and not column.testFlag(column.Flags.Virtual):
                     value = column.default()
@@ -516,7 +766,7 @@ class Model(object):
                     elif column.testFlag(column.Flags.Polymorphic):
                         value = type(self).__name__
 
-                    self.__values[column.name()] = (value, value)
+                    self.__values[column.name()] = value
 
         event = orb.events.InitEvent(record=self)
         if self.processEvent(event):
@@ -539,16 +789,21 @@ class Model(object):
         :return     <bool>
         """
         if db in (None, self.context().db):
-            col = self.schema().column(self.schema().idColumn())
-            with ReadLocker(self.__dataLock):
-                if col not in self.__loaded or self.__values[col.name()][0] is None:
-                    return False
-                return True
+            if not self.__loaded:
+                return False
+
+            name = self.schema().idColumn().name()
+            with ReadLocker(self.__lock()):
+                original = self.__original
+                if original and name in original:
+                    return original[name] is not None
+                else:
+                    return self.__values.get(name) is not None
         else:
             return None
 
     def preload(self, name):
-        return self.__preload.get(name) or {}
+        return (self.__preload or {}).get(name) or {}
 
     def save(self, values=None, after=None, before=None, **context):
         """
@@ -612,6 +867,11 @@ class Model(object):
         if not (self.isModified() and self.validate()):
             return False
 
+        # increment the version for the record
+        version = self.schema().plan().version
+        if isinstance(version, orb.VersionColumn):
+            self.set(version, version.nextVersion(self.get(version)), useMethod=False)
+
         conn = context.db.connection()
         if not self.isRecord():
             records, _ = conn.insert([self], context)
@@ -623,10 +883,12 @@ class Model(object):
 
         # mark all the data as committed
         cols = [self.schema().column(c).name() for c in context.columns or []]
-        with WriteLocker(self.__dataLock):
-            for col_name, (_, value) in self.__values.items():
-                if not cols or col_name in cols:
-                    self.__values[col_name] = (value, value)
+        with WriteLocker(self.__lock()):
+            if not cols:
+                self.__original = None
+            elif self.__original:
+                for col_name in cols:
+                    self.__original.pop(col_name, None)
 
         # create post-commit event
         event = orb.events.PostSaveEvent(record=self, context=context, newRecord=new_record, changes=changes)
@@ -669,7 +931,8 @@ class Model(object):
                                    context=sub_context)
 
                     # remove any preloaded values from the collector
-                    self.__preload.pop(collector.name(), None)
+                    if self.__preload:
+                        self.__preload.pop(collector.name(), None)
 
                     return records
             else:
@@ -688,8 +951,12 @@ class Model(object):
                 else:
                     return method(self, value)
 
-        with WriteLocker(self.__dataLock):
-            orig, curr = self.__values.get(col.name(), (None, None))
+        name = col.name()
+        with WriteLocker(self.__lock()):
+            curr = self.__values.get(name)
+            if type(curr) is _RawValue:
+                curr = self.__restoreRaw(col, curr)
+
             value = col.store(value, context)
 
             # update the context based on the locale value
@@ -704,7 +971,10 @@ class Model(object):
                 change = True
 
             if change:
-                self.__values[col.name()] = (orig, value)
+                if self.__original is None:
+                    self.__original = {}
+                self.__original.setdefault(name, curr)
+                self.__values[name] = value
 
         # broadcast the change event
         if change:
@@ -719,9 +989,8 @@ class Model(object):
             if self.processEvent(event):
                 self.onChange(event)
             if event.preventDefault:
-                with WriteLocker(self.__dataLock):
-                    orig, _ = self.__values.get(col.name(), (None, None))
-                    self.__values[col.name()] = (orig, curr)
+                with WriteLocker(self.__lock()):
+                    self.__values[name] = curr
                 return False
             else:
                 return change
@@ -829,7 +1098,7 @@ class Model(object):
         output = {}
         schema = self.schema()
         all_columns = schema.columns(recurse=recurse, flags=flags).values()
-        req_columns = [schema.column(col) for col in columns] if columns else None
+        req_columns = {schema.column(col) for col in columns} if columns else None
 
         for column in all_columns:
             if req_columns is not None and column not in req_columns:
@@ -1046,6 +1315,63 @@ class Model(object):
 
         return cls.select(**context).first()
 
+    @classmethod
+    def inflateMany(cls, values, **context):
+        """
+        Returns a list of new record instances for the given class with the
+        values defined from the database.  The values are restored one column
+        at a time using a single context, and records that are inflated together
+        will load any deferred columns together.
+
+        :param      values  | [<dict>, ..] || <orb.ResultSet>
+
+        :return     [<orb.Table>, ..]
+        """
+        context.setdefault('namespace', cls.schema().namespace())
+        context = orb.Context(**context)
+        loaders = cls.schema().plan().loaders
+        restored = set()
+
+        # restore the database values by column directly from the row tuples
+        if isinstance(values, orb.ResultSet):
+            keys = values.columns()
+            columns = zip(*values.rows()) or [()] * len(keys)
+            for i, key in enumerate(keys):
+                column, restore = loaders.get(key, (None, None))
+                if restore is not None:
+                    columns[i] = column.dbRestoreMany(columns[i], context=context)
+                    restored.add(key)
+
+            # the row tuples are loaded against the column keys, without building a dictionary per row
+            rows = zip(*columns)
+
+        # restore the database values by column from the dictionaries
+        else:
+            keys = None
+            rows = [value if isinstance(value, Model) else dict(value) for value in values]
+
+            if rows and not any(isinstance(row, Model) for row in rows):
+                for key in rows[0]:
+                    column, restore = loaders.get(key, (None, None))
+                    if restore is None:
+                        continue
+
+                    key_rows = [row for row in rows if key in row]
+                    db_values = [row[key] for row in key_rows]
+                    for row, value in zip(key_rows, column.dbRestoreMany(db_values, context=context)):
+                        row[key] = value
+                    restored.add(key)
+
+        restored = frozenset(restored)
+        records = [cls._inflate(row, context, restored=restored, columns=keys) for row in rows]
+
+        # the records only reference each other weakly, so a record does not keep its page alive
+        group = [weakref.ref(record) for record in records]
+        for record in records:
+            if record.__group is None:
+                record.__group = group
+        return records
+
     @classmethod
     def inflate(cls, values, **context):
         """
@@ -1057,8 +1383,21 @@ class Model(object):
 
         :return     <orb.Table>
         """
-        context = orb.Context(**context)
+        return cls._inflate(values, orb.Context(**context))
 
+    @classmethod
+    def _inflate(cls, values, context, restored=None, columns=None):
+        """
+        Returns a new record instance for the given class with the values
+        defined from the database.
+
+        :param      values   | <dict> values || <tuple> row
+                    context  | <orb.Context>
+                    restored | <frozenset> || None | keys that have already been restored
+                    columns  | [<str>, ..] || None | keys for the values of a row tuple
+
+        :return     <orb.Table>
+        """
         # inflate values from the database into the given class type
         if isinstance(values, Model):
             record = values
@@ -1067,8 +1406,12 @@ class Model(object):
             record = None
 
         schema = cls.schema()
-        polymorphs = schema.columns(flags=orb.Column.Flags.Polymorphic).values()
-        column = polymorphs[0] if polymorphs else None
+        column = schema.plan().polymorphic
+
+        # polymorphic models look up their type by key, so a row is mapped to its columns
+        if column and columns is not None:
+            values = dict(zip(columns, values))
+            columns = None
 
         # attempt to expand the class to its defined polymorphic type
         if column and column.field() in values:
@@ -1082,11 +1425,40 @@ class Model(object):
                     raise orb.errors.RecordNotFound(morph_cls, values.get(id_col))
 
         if record is None:
-            event = orb.events.LoadEvent(record=record, data=values)
+            event = orb.events.LoadEvent(record=record, data=values, restored=restored, columns=columns)
             record = cls(loadEvent=event, context=context)
 
         return record
 
+    @classmethod
+    def jsonPlan(cls, context, record=None):
+        """
+        Returns the serialization plan for this model for the given context.  Plans
+        that use the default authorization are cached per schema based on the
+        columns, deferred columns, expand tree and return type.  Custom `__auth__`
+        methods are called per record, so their plans are not cached and require
+        the record that is being serialized.
+
+        :param      context | <orb.Context>
+                    record  | <orb.Model> || None
+
+        :return     <orb.core.plan.JSONPlan>
+        """
+        if callable(cls.__auth__):
+            if record is None:
+                raise orb.errors.OrbError('A record is required to plan with a custom __auth__ method')
+            return JSONPlan(cls, context, record.__auth__)
+
+        key = json_plan_key(cls, context)
+        cache = cls.schema()._cached().setdefault('json', {})
+        try:
+            return cache[key]
+        except KeyError:
+            if len(cache) >= _JSON_PLAN_CACHE_SIZE:
+                cache.clear()
+            plan = cache[key] = JSONPlan(cls, context, _allowed)
+            return plan
+
     @classmethod
     def removeCallback(cls, eventType, func, record=None):
         """
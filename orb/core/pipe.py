@@ -25,6 +25,10 @@ class Pipe(Collector):
         self.__from = from_
         self.__to = to
 
+        # cached lookups, validated against the system revision
+        self.__cache = {}
+        self.__cacheRevision = -1
+
     def collect(self, record, **context):
         if not record.isRecord():
             return orb.Collection()
@@ -52,6 +56,36 @@ class Pipe(Collector):
         pipe_q = orb.Query(through, self.to()).in_(to_records)
         return through.select(columns=[self.from_()], where=pipe_q)
 
+    def _cached(self, key, lookup):
+        revision = orb.system.revision()
+        if self.__cacheRevision != revision:
+            self.__cache = {}
+            self.__cacheRevision = revision
+
+        try:
+            return self.__cache[key]
+        except KeyError:
+            value = self.__cache[key] = lookup()
+            return value
+
+    def _lookupFromColumn(self):
+        schema = orb.system.schema(self.__through)
+        try:
+            return schema.column(self.__from)
+        except AttributeError:
+            raise orb.errors.ModelNotFound(self.__through)
+
+    def _lookupToColumn(self):
+        schema = orb.system.schema(self.__through)
+        try:
+            return schema.column(self.__to)
+        except AttributeError:
+            raise orb.errors.ModelNotFound(self.__through)
+
+    def _lookupToModel(self):
+        col = self.toColumn()
+        return col.referenceModel() if col else None
+
     def copy(self):
         out = super(Pipe, self).copy()
         out._Pipe__through = self.__through
@@ -63,11 +97,7 @@ class Pipe(Collector):
         return self.__from
 
     def fromColumn(self):
-        schema = orb.system.schema(self.__through)
-        try:
-            return schema.column(self.__from)
-        except AttributeError:
-            raise orb.errors.ModelNotFound(self.__through)
+        return self._cached('fromColumn', self._lookupFromColumn)
 
     def fromModel(self):
         col = self.fromColumn()
@@ -80,15 +110,10 @@ class Pipe(Collector):
         return self.__to
 
     def toColumn(self):
-        schema = orb.system.schema(self.__through)
-        try:
-            return schema.column(self.__to)
-        except AttributeError:
-            raise orb.errors.ModelNotFound(self.__through)
+        return self._cached('toColumn', self._lookupToColumn)
 
     def toModel(self):
-        col = self.toColumn()
-        return col.referenceModel() if col else None
+        return self._cached('toModel', self._lookupToModel)
 
     def through(self):
         return self.__through
@@ -0,0 +1,226 @@
+""" Defines the precompiled column plans used when loading and storing records. """
+
+import copy
+
+from projex.lazymodule import lazy_import
+
+orb = lazy_import('orb')
+
+
+class SchemaPlan(object):
+    """
+    Defines the column information for a schema that is required to load and store
+    records, computed once so that the record loading and the INSERT and UPDATE
+    statements do not need to rediscover columns and flags for every record.
+
+    Plans should not be created directly, but accessed through the `Schema.plan`
+    method, which will regenerate the plan when the schema structure changes.
+    """
+    def __init__(self, schema):
+        Flags = orb.Column.Flags
+
+        columns = tuple(schema.columns().values())
+        dbname = schema.dbname()
+
+        # ordered column definitions
+        self.columns = columns
+        self.fields = tuple((col.field(), col) for col in columns)
+
+        # database storage split
+        self.stored = tuple(col for col in columns if not col.testFlag(Flags.Virtual))
+        self.i18n = tuple(col for col in self.stored if col.testFlag(Flags.I18n))
+        self.standard = tuple(col for col in self.stored if not col.testFlag(Flags.I18n))
+        self.storedSet = frozenset(self.stored)
+        self.i18nSet = frozenset(self.i18n)
+
+        try:
+            self.idColumn = schema.idColumn()
+        except orb.errors.ColumnNotFound:
+            self.idColumn = None
+
+        polymorphs = [col for col in columns if col.testFlag(Flags.Polymorphic)]
+        self.polymorphic = polymorphs[0] if polymorphs else None
+
+        # the column that changes whenever a record is saved, used to cache serialized records
+        versions = [col for col in self.stored if isinstance(col, orb.VersionColumn)]
+        if versions:
+            self.version = versions[0]
+        else:
+            self.version = schema.column('updated_at', raise_=False)
+            if self.version not in self.storedSet:
+                self.version = None
+
+        # map the raw keys that come back from the database to their column and restore method,
+        # columns that restore lazily will not have a restore method
+        self.loaders = {}
+        for key, col in schema.columnLookup().items():
+            loader = (col, None if col.restoresLazily() else col.dbRestore)
+            self.loaders[key] = loader
+            self.loaders['{0}.{1}'.format(dbname, key)] = loader
+
+
+def freeze_tree(tree):
+    """
+    Converts a nested dictionary, such as an expand tree, to a hashable value.
+
+    :param tree: <dict>
+
+    :return: <tuple>
+    """
+    return tuple(sorted((key, freeze_tree(value or {})) for key, value in tree.items()))
+
+
+def database_key(context):
+    """
+    Returns the key that identifies the database the given context reads from,
+    so that records with the same id and version in different databases are
+    not confused with one another.
+
+    :param context: <orb.Context>
+
+    :return: <tuple> || None
+    """
+    try:
+        db = context.db
+    except orb.errors.DatabaseNotFound:
+        return None
+    else:
+        return (type(db.connection()).__name__, db.host(), db.port(), db.name(), db.code())
+
+
+def json_plan_key(model, context):
+    """
+    Returns the key that identifies the serialization plan for the given model
+    and context, including the database and every context option that changes
+    the serialized output of a record (the scope is not hashable, so records
+    serialized with a scope are not cached).
+
+    :param model: subclass of <orb.Model>
+    :param context: <orb.Context>
+
+    :return: <tuple>
+    """
+    return (
+        database_key(context),
+        tuple(context.columns or ()),
+        tuple(context.defer or ()),
+        freeze_tree(context.expandtree(model)),
+        context.returning == 'values',
+        context.locale,
+        context.timezone,
+        context.namespace,
+        context.useBaseQuery
+    )
+
+
+class JSONPlan(object):
+    """
+    Defines the columns and expansion information that is required to serialize
+    records of a model for a given context, computed once so that the authorization,
+    column lookups and expand tree do not need to be rediscovered for every record.
+
+    Plans should not be created directly, but accessed through the `Model.jsonPlan`
+    method.
+
+    Plans also cache the serialized stored values for records of versioned models,
+    keyed by the record id and version, since the plan already identifies the
+    database, columns and locale that were used.  Getter, shortcut and expanded
+    values can change without the record's version changing, so they are not
+    cached.
+    """
+    RecordCacheSize = 10000
+
+    def __init__(self, model, context, auth):
+        schema = model.schema()
+        self.records = {}
+
+        if context.columns:
+            columns = [schema.column(col) for col in context.columns]
+        else:
+            deferred = context.deferredColumns(schema)
+            columns = [col for col in schema.columns(flags=~orb.Column.Flags.RequiresExpand).values()
+                       if col not in deferred]
+
+        columns = [col for col in columns if col and auth(columns=(col,), context=context)]
+
+        self.columns = tuple(columns)
+
+        # columns with getter methods or shortcuts are looked up through the record,
+        # all other columns are restored directly from their stored value
+        self.direct = tuple((col.field(), col) for col in columns
+                            if not col.shortcut() and col.gettermethod() is None)
+        self.indirect = tuple((col.field(), col) for col in columns
+                              if col.shortcut() or col.gettermethod() is not None)
+
+        self.expand = tuple(context.expandtree(model).items())
+
+        if context.returning == 'values':
+            self.values = tuple(col.field() for col in context.schemaColumns(schema))
+        else:
+            self.values = None
+
+        # records can be serialized by the backend when all values are stored and encode
+        # the same way from the database, and no references need to be expanded
+        locales = context.locale.split(',')
+        self.native = not (self.indirect or self.expand or self.values) and all(col.NativeJSON and not col.testFlag(col.Flags.Virtual) and
+                                                (len(locales) == 1 and locales[0] != 'all' or
+                                                 not col.testFlag(col.Flags.I18n))
+                                                for col in columns)
+
+    def pack(self, output):
+        """
+        Converts the serialized values for a record to the output for this plan,
+        which is a tuple of values when returning values rather than records.
+
+        :param output: <dict>
+
+        :return: <dict> || <tuple> || <variant>
+        """
+        if self.values is None:
+            return output
+
+        output = tuple(output[field] for field in self.values)
+        if len(output) == 1:
+            return output[0]
+        else:
+            return output
+
+    def valueContext(self, context):
+        """
+        Returns the context that is used to restore the values for serialization.
+
+        :param context: <orb.Context>
+
+        :return: <orb.Context>
+        """
+        options = {k: v for k, v in context.raw_values.items() if k not in orb.Context.QueryFields}
+        options['inflated'] = False
+        return orb.Context(**options)
+
+    def cacheRecord(self, key, output):
+        """
+        Caches a copy of the serialized stored values for a record, so changes made
+        to the output by the caller do not affect the cache.
+
+        :param key: (<variant> id, <variant> version)
+        :param output: <dict>
+        """
+        if len(self.records) >= self.RecordCacheSize:
+            self.records.clear()
+        self.records[key] = copy.deepcopy(output)
+
+    def cachedRecord(self, key):
+        """
+        Returns a copy of the cached serialized stored values for a record, or
+        None if it has not been cached.
+
+        :param key: (<variant> id, <variant> version)
+
+        :return: <dict> || None
+        """
+        try:
+            output = self.records[key]
+        except KeyError:
+            return None
+        else:
+            return copy.deepcopy(output)
@@ -137,7 +137,7 @@ class Query(object):
             'column': self.__column,
             'op': self.Op(self.__op),
             'caseSensitive': self.__caseSensitive,
-            'functions': [self.Function(func) for func in self.__functions],
+            'functions': [self.__functionJSON(func) for func in self.__functions],
             'math': [{'op': self.Math(op), 'value': value} for (op, value) in self.__math],
             'inverted': self.__inverted,
             'value': value
@@ -475,12 +475,17 @@ class Query(object):
         return out
 
     # public methods
-    def addFunction(self, func):
+    def addFunction(self, func, *args):
         """
-        Adds a new function for this query.
+        Adds a new function for this query.  The function can be one of the
+        Query.Function types, or the name of a registered <orb.QueryFunction>
+        along with its arguments.
         
-        :param      func | <Query.Function>
+        :param      func  | <Query.Function> || <str>
+                    *args | <variant>
         """
+        if isinstance(func, (str, unicode)):
+            func = (func, args)
         self.__functions.append(func)
 
     def addMath(self, math, value):
@@ -581,6 +586,29 @@ class Query(object):
         newq.setValue((low, high))
         return newq
 
+    def call(self, name, *args):
+        """
+        Returns a new query with the registered <orb.QueryFunction> of the given
+        name applied to its column, so the lookup is performed on the result of
+        the function within the database.  Arguments are bound as values, and
+        queries can be provided to pass in other columns.
+
+        :usage      |>>> from orb import Query as Q
+                    |>>> q = Q('created_at').call('date_trunc', 'month') == datetime.datetime(2016, 1, 1)
+                    |>>> q = Q('nickname').call('coalesce', Q('username')) == 'bob'
+
+        :param      name  | <str>
+                    *args | <variant> || <orb.Query>
+
+        :return     <Query>
+        """
+        if orb.QueryFunction.byName(name) is None:
+            raise orb.errors.QueryInvalid('Unknown function: {0}'.format(name))
+
+        q = self.copy()
+        q.addFunction(name, *args)
+        return q
+
     def caseSensitive(self):
         """
         Returns whether or not this query item will be case
@@ -1074,12 +1102,55 @@ class Query(object):
         
         :return     <self>
         """
-        query = self.copy()
         op = self.op()
+
+        # a range is negated as being outside of either bound
+        if op == Query.Op.Between and isinstance(self.value(), (list, tuple)) and len(self.value()) == 2:
+            low, high = self.value()
+            return orb.QueryCompound(self.lessThan(low), self.greaterThan(high), op=orb.QueryCompound.Op.Or)
+
+        query = self.copy()
         query.setOp(self.NegatedOp.get(op, op))
         query.setValue(self.value())
         return query
 
+    def optimize(self):
+        """
+        Returns a normalized copy of this query for compiling to the backend.  Any
+        duplicate values are removed from lists, single value lists are converted
+        to equality checks, and empty lists are resolved early.  If the query will
+        match all records, then None is returned, and if the query will not match
+        any records, then the <orb.errors.QueryIsNull> error is raised.
+
+        :return     <orb.Query> || None
+        """
+        if self.isNull():
+            return None
+
+        query = self.copy()
+        op = self.__op
+        if op in (Query.Op.IsIn, Query.Op.IsNotIn) and isinstance(self.__value, (list, tuple, set)):
+            values = []
+            found = set()
+            for value in self.__value:
+                key = _value_signature(value)
+                if key not in found:
+                    found.add(key)
+                    values.append(value)
+
+            if not values:
+                if op == Query.Op.IsIn:
+                    raise orb.errors.QueryIsNull()
+                else:
+                    return None
+            elif len(values) == 1 and values[0] is not None:
+                query.setOp(Query.Op.Is if op == Query.Op.IsIn else Query.Op.IsNot)
+                query.setValue(values[0])
+            else:
+                query.setValue(tuple(values))
+
+        return query
+
     def op(self):
         """
         Returns the operator type assigned to this query
@@ -1150,6 +1221,25 @@ class Query(object):
         """
         self.__value = projex.text.decoded(value) if isinstance(value, (str, unicode)) else value
 
+    def signature(self):
+        """
+        Returns a hashable value that describes the structure of this query, used
+        to compare queries since the == operator is used to build them.
+
+        :return     <tuple>
+        """
+        return (
+            'query',
+            self.__model,
+            self.__column,
+            self.__op,
+            self.__caseSensitive,
+            _value_signature(self.__value),
+            self.__inverted,
+            _value_signature(tuple(self.__functions)),
+            tuple((op, _value_signature(value)) for op, value in self.__math)
+        )
+
     def startswith(self, value):
         """
         Sets the operator type to Query.Op.Startswith and sets \
@@ -1188,6 +1278,16 @@ class Query(object):
         """
         return self.__value
 
+    def __functionJSON(self, func):
+        if isinstance(func, tuple):
+            name, args = func
+            return {
+                'name': name,
+                'args': [arg.__json__() if hasattr(arg, '__json__') else arg for arg in args]
+            }
+        else:
+            return self.Function(func)
+
     @staticmethod
     def build(data=None, **kwds):
         data = data or {}
@@ -1233,7 +1333,12 @@ class Query(object):
 
             # restore the function information
             for func in jdata.get('functions', []):
-                query.addFunction(orb.Query.Function(func))
+                if isinstance(func, dict):
+                    args = [Query.fromJSON(arg) if isinstance(arg, dict) and arg.get('type') == 'query' else arg
+                            for arg in func.get('args', [])]
+                    query.addFunction(func['name'], *args)
+                else:
+                    query.addFunction(orb.Query.Function(func))
 
             # restore the math information
             for entry in jdata.get('math', []):
@@ -1472,7 +1577,7 @@ class QueryCompound(object):
         :return     self
         """
         op = QueryCompound.Op.And if self.__op == QueryCompound.Op.Or else QueryCompound.Op.Or
-        return QueryCompound(*self.__queries, op=op)
+        return QueryCompound(*[query.negated() for query in self.__queries], op=op)
 
     def op(self):
         """
@@ -1504,12 +1609,66 @@ class QueryCompound(object):
             return other.copy()
         else:
             # grow this if the operators are the same
-            if self.__op == QueryCompound.Op.And:
+            if self.__op == QueryCompound.Op.Or:
                 queries = list(self.__queries) + [other]
                 return QueryCompound(*queries, op=QueryCompound.Op.Or)
             else:
                 return QueryCompound(self, other, op=QueryCompound.Op.Or)
 
+    def optimize(self):
+        """
+        Returns a normalized version of this compound for compiling to the backend.
+        Nested compounds that use the same operator are flattened, duplicate queries
+        are removed and equality checks against the same column within an OR are
+        merged into a single IN check.  If the compound will match all records,
+        then None is returned, and if it will not match any records, then the
+        <orb.errors.QueryIsNull> error is raised.
+
+        :return     <orb.Query> || <orb.QueryCompound> || None
+        """
+        is_and = self.__op == QueryCompound.Op.And
+
+        queries = []
+        found = set()
+        for query in self.__queries:
+            try:
+                query = query.optimize()
+            except orb.errors.QueryIsNull:
+                if is_and:
+                    raise
+                else:
+                    continue
+
+            if query is None:
+                if is_and:
+                    continue
+                else:
+                    return None
+
+            if isinstance(query, QueryCompound) and query.op() == self.__op:
+                sub_queries = query.queries()
+            else:
+                sub_queries = (query,)
+
+            for sub_query in sub_queries:
+                key = sub_query.signature()
+                if key not in found:
+                    found.add(key)
+                    queries.append(sub_query)
+
+        if not is_and:
+            queries = self.__mergeEqualities(queries)
+
+        if not queries:
+            if is_and:
+                return None
+            else:
+                raise orb.errors.QueryIsNull()
+        elif len(queries) == 1:
+            return queries[0]
+        else:
+            return QueryCompound(*queries, op=self.__op)
+
     def queries(self):
         """
         Returns the list of queries that are associated with
@@ -1519,6 +1678,15 @@ class QueryCompound(object):
         """
         return self.__queries
 
+    def signature(self):
+        """
+        Returns a hashable value that describes the structure of this compound, used
+        to compare queries since the == operator is used to build them.
+
+        :return     <tuple>
+        """
+        return 'compound', self.__op, tuple(query.signature() for query in self.__queries)
+
     def setOp(self, op):
         """
         Sets the operator type that this compound that will be
@@ -1540,3 +1708,104 @@ class QueryCompound(object):
             else:
                 for model in query.models(model):
                     yield model
+
+    def __mergeEqualities(self, queries):
+        # group equality checks against the same column into a single IN check, checks
+        # with functions are left alone since backends compare them through their index
+        # expression (lower(column) = lower(value)), which an IN check does not use
+        groups = {}
+        order = []
+        for query in queries:
+            key = None
+            if (isinstance(query, Query) and
+                    not query.isInverted() and
+                    not query.functions() and
+                    query.op() in (Query.Op.Is, Query.Op.IsIn)):
+                values = query.value() if query.op() == Query.Op.IsIn else (query.value(),)
+                if isinstance(values, (list, tuple, set)) and all(_is_plain_value(v) for v in values):
+                    key = (query.model(),
+                           query.columnName(),
+                           query.caseSensitive(),
+                           tuple((op, _value_signature(value)) for op, value in query.math()))
+
+            if key is None:
+                order.append((None, query))
+            elif key in groups:
+                groups[key].append(query)
+            else:
+                groups[key] = [query]
+                order.append((key, None))
+
+        output = []
+        for key, query in order:
+            if key is None:
+                output.append(query)
+                continue
+
+            group = groups[key]
+            if len(group) == 1:
+                output.append(group[0])
+                continue
+
+            values = []
+            found = set()
+            for query in group:
+                for value in (query.value() if query.op() == Query.Op.IsIn else (query.value(),)):
+                    value_key = _value_signature(value)
+                    if value_key not in found:
+                        found.add(value_key)
+                        values.append(value)
+
+            query = group[0].copy()
+            query.setOp(Query.Op.IsIn)
+            query.setValue(tuple(values))
+            output.append(query)
+
+        return output
+
+
+def _is_plain_value(value):
+    """
+    Returns whether or not the inputted value can be merged into a list of values
+    for an IN check.
+
+    :param      value | <variant>
+
+    :return     <bool>
+    """
+    if value is None or isinstance(value, (Query, QueryCompound, orb.Collection, list, tuple, set, dict)):
+        return False
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    else:
+        return True
+
+
+def _value_signature(value):
+    """
+    Returns a hashable value that represents the inputted query value.
+
+    :param      value | <variant>
+
+    :return     <variant>
+    """
+    if isinstance(value, (Query, QueryCompound)):
+        return value.signature()
+    elif isinstance(value, set):
+        return frozenset(_value_signature(v) for v in value)
+    elif isinstance(value, (list, tuple)):
+        return tuple(_value_signature(v) for v in value)
+    elif isinstance(value, orb.Model):
+        record_id = value.id()
+        if record_id is None:
+            return 'object', id(value)
+        return 'record', type(value), record_id
+    else:
+        try:
+            hash(value)
+        except TypeError:
+            return 'object', id(value)
+        else:
+            return value
@@ -0,0 +1,106 @@
+""" Defines the SQL functions that can be applied to the columns of a query. """
+
+import projex.text
+
+from projex.addon import AddonManager
+from projex.lazymodule import lazy_import
+
+orb = lazy_import('orb')
+
+
+class QueryFunction(AddonManager):
+    """
+    Defines a SQL function that can be applied to the column of a query, so that
+    records can be filtered, ordered and grouped by the result within the database.
+    Each function has a default template, which can be replaced for a particular
+    database dialect (the name of its connection type, such as `Postgres`).  The
+    templates are formatted with the column's field as `{0}` and the SQL for each
+    argument as `{1}`, `{2}`, etc., or with all of the arguments as `{args}`.
+
+    Arguments are bound as parameters of the statement, so templates for dialects
+    that format their parameters with `%` (Postgres and MySQL) need to escape any
+    literal percent signs as `%%`.
+
+    :usage      |>>> orb.QueryFunction.registerAddon('nullif', orb.QueryFunction(u'nullif({0}, {1})'))
+                |>>> q = orb.Query('nickname').call('nullif', '') == None
+    """
+    def __init__(self, template=None, **dialects):
+        self.__template = template
+        self.__dialects = dialects
+
+    def __call__(self, dialect, field, args=None):
+        """
+        Generates the SQL for this function applied to the given field for a dialect.
+        If the dialect does not support this function, then None is returned.
+
+        :param      dialect | <str>
+                    field   | <str>
+                    args    | [<str>, ..] || None | the SQL for each argument
+
+        :return     <str> || None
+        """
+        template = self.template(dialect)
+        if template is None:
+            return None
+
+        args = list(args or [])
+        return template.format(field, *args, args=u', '.join(args))
+
+    def template(self, dialect=None):
+        """
+        Returns the template for the given dialect, falling back to the default.
+
+        :param      dialect | <str> || None
+
+        :return     <unicode> || None
+        """
+        return self.__dialects.get(dialect, self.__template)
+
+    @staticmethod
+    def parse(func):
+        """
+        Returns the registered name and arguments for a function that is stored on
+        a query, which is either a <orb.Query.Function> or a (name, args) pair
+        added through <orb.Query.call>.
+
+        :param      func | <orb.Query.Function> || (<str> name, (<variant>, ..) args)
+
+        :return     (<str> name, (<variant>, ..) args)
+        """
+        if isinstance(func, tuple):
+            return func
+        else:
+            return projex.text.underscore(orb.Query.Function(func)), ()
+
+
+QueryFunction.registerAddon('abs', QueryFunction(u'abs({0})'))
+QueryFunction.registerAddon('as_string', QueryFunction(u'CAST({0} AS TEXT)',
+                                                       Postgres=u'{0}::varchar',
+                                                       MySQL=u'CAST({0} AS CHAR)'))
+QueryFunction.registerAddon('coalesce', QueryFunction(u'coalesce({0}, {args})'))
+QueryFunction.registerAddon('date', QueryFunction(u'date({0})'))
+QueryFunction.registerAddon('date_trunc', QueryFunction(
+    Postgres=u'date_trunc({1}, {0})',
+    SQLite=u"CASE {1} "
+           u"WHEN 'year' THEN datetime({0}, 'start of year') "
+           u"WHEN 'month' THEN datetime({0}, 'start of month') "
+           u"WHEN 'day' THEN datetime({0}, 'start of day') "
+           u"WHEN 'hour' THEN substr(datetime({0}), 1, 13) || ':00:00' "
+           u"WHEN 'minute' THEN substr(datetime({0}), 1, 16) || ':00' "
+           u"END",
+    MySQL=u"CAST(CASE {1} "
+          u"WHEN 'year' THEN DATE_FORMAT({0}, '%%Y-01-01') "
+          u"WHEN 'month' THEN DATE_FORMAT({0}, '%%Y-%%m-01') "
+          u"WHEN 'day' THEN DATE_FORMAT({0}, '%%Y-%%m-%%d') "
+          u"WHEN 'hour' THEN DATE_FORMAT({0}, '%%Y-%%m-%%d %%H:00:00') "
+          u"WHEN 'minute' THEN DATE_FORMAT({0}, '%%Y-%%m-%%d %%H:%%i:00') "
+          u"END AS DATETIME)"
+))
+QueryFunction.registerAddon('json_value', QueryFunction(
+    Postgres=u"jsonb_extract_path_text(({0})::jsonb, VARIADIC string_to_array({1}, '.'))",
+    SQLite=u"json_extract({0}, '$.' || {1})",
+    MySQL=u"JSON_UNQUOTE(JSON_EXTRACT({0}, CONCAT('$.', {1})))"
+))
+QueryFunction.registerAddon('length', QueryFunction(u'length({0})', MySQL=u'CHAR_LENGTH({0})'))
+QueryFunction.registerAddon('lower', QueryFunction(u'lower({0})', MySQL=u'lcase({0})'))
+QueryFunction.registerAddon('upper', QueryFunction(u'upper({0})', MySQL=u'ucase({0})'))
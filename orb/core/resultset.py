@@ -0,0 +1,137 @@
+""" Defines the row storage that is returned from backend queries. """
+
+
+class ResultSet(object):
+    """
+    Defines the rows that are returned from a backend query.  The rows are kept as
+    the tuples that are returned from the database cursor, along with a single map
+    of the column names to their index that is shared between all of the rows.
+    Dictionaries are only built when they are explicitly requested, or when the
+    result set is iterated.
+    """
+    __slots__ = ('__columns', '__index', '__rows')
+
+    def __init__(self, columns=None, rows=None):
+        self.__columns = tuple(columns or ())
+        self.__index = {column: i for i, column in enumerate(self.__columns)}
+        self.__rows = rows if rows is not None else []
+
+    def __getitem__(self, index):
+        return dict(zip(self.__columns, self.__rows[index]))
+
+    def __iter__(self):
+        columns = self.__columns
+        for row in self.__rows:
+            yield dict(zip(columns, row))
+
+    def __len__(self):
+        return len(self.__rows)
+
+    def column(self, name, default=None):
+        """
+        Returns the values for the given column name for all of the rows.  If the
+        column was not returned, then the default value will be used for each row.
+
+        :param      name    | <str>
+                    default | <variant>
+
+        :return     [<variant>, ..]
+        """
+        try:
+            i = self.__index[name]
+        except KeyError:
+            return [default] * len(self.__rows)
+        else:
+            return [row[i] for row in self.__rows]
+
+    def columns(self):
+        """
+        Returns the column names for this result set, in the order they are
+        stored within each row.
+
+        :return     (<str>, ..)
+        """
+        return self.__columns
+
+    def dicts(self, columns=None):
+        """
+        Returns the rows for this result set as dictionaries.  If a list of
+        columns is provided, only those keys will be included.
+
+        :param      columns | [<str>, ..] || None
+
+        :return     [{<str> column: <variant> value, ..}, ..]
+        """
+        if columns is None:
+            keys = self.__columns
+            return [dict(zip(keys, row)) for row in self.__rows]
+        else:
+            keys = list(columns)
+            return [dict(zip(keys, values)) for values in self.values(*keys)]
+
+    def hasColumn(self, name):
+        """
+        Returns whether or not the given column was returned within this result set.
+
+        :param      name | <str>
+
+        :return     <bool>
+        """
+        return name in self.__index
+
+    def index(self):
+        """
+        Returns the map of column names to their index within each row.
+
+        :return     {<str> column: <int> index, ..}
+        """
+        return self.__index
+
+    def mapped(self, mapper=dict):
+        """
+        Returns the rows for this result set as dictionaries that have been
+        processed through the given mapper.
+
+        :param      mapper | <callable>
+
+        :return     [<variant>, ..]
+        """
+        records = self.dicts()
+        if mapper is dict:
+            return records
+        else:
+            return [mapper(record) for record in records]
+
+    def rows(self):
+        """
+        Returns the raw row tuples for this result set.
+
+        :return     [(<variant>, ..), ..]
+        """
+        return self.__rows
+
+    def values(self, *columns):
+        """
+        Returns a tuple of values for the given columns for each row.  Columns that
+        were not returned will have a value of None.
+
+        :param      *columns | <str>
+
+        :return     [(<variant>, ..), ..]
+        """
+        if not columns:
+            return [tuple(row) for row in self.__rows]
+        else:
+            return zip(*[self.column(column) for column in columns]) if self.__rows else []
+
+    def without(self, *columns):
+        """
+        Returns a copy of this result set that does not include the given columns.
+
+        :param      *columns | <str>
+
+        :return     <orb.ResultSet>
+        """
+        keep = [i for i, column in enumerate(self.__columns) if column not in columns]
+        return ResultSet([self.__columns[i] for i in keep],
+                         [tuple(row[i] for i in keep) for row in self.__rows])
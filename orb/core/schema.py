@@ -7,6 +7,8 @@ from new import instancemethod
 from projex.enum import enum
 from projex.lazymodule import lazy_import
 
+from .plan import SchemaPlan
+
 log = logging.getLogger(__name__)
 orb = lazy_import('orb')
 errors = lazy_import('orb.errors')
@@ -18,6 +20,10 @@ class Schema(object):
     """
     Flags = enum('Abstract', 'Static')
 
+    # bumped whenever the structure of any schema changes, since inherited
+    # columns and dotted lookups can span multiple schemas
+    __generation = 0
+
     def __json__(self):
         # make sure we're only exposing desired public data
         columns = []
@@ -67,6 +73,7 @@ class Schema(object):
         self.__inherits = inherits
         self.__display = display
         self.__cache = {}
+        self.__cacheGeneration = -1
         self.__idColumn = idColumn
 
         self.__model = None
@@ -117,6 +124,25 @@ class Schema(object):
 
         return schema.ancestry() + [schema]
 
+    def _cached(self):
+        """
+        Returns the lookup cache for this schema, clearing it out if the schema
+        structure has changed since it was last built.
+
+        :return     {<tuple> key: <variant>, ..}
+        """
+        if self.__cacheGeneration != Schema.__generation:
+            self.__cache = {}
+            self.__cacheGeneration = Schema.__generation
+        return self.__cache
+
+    def _invalidate(self):
+        """
+        Marks the cached column, collector and index lookups as stale.  This
+        is called whenever the structure of a schema is modified.
+        """
+        Schema.__generation += 1
+
     def addColumn(self, column):
         """
         Adds the inputted column to this table schema.
@@ -125,6 +151,7 @@ class Schema(object):
         """
         column.setSchema(self)
         self.__columns[column.name()] = column
+        self._invalidate()
 
     def addIndex(self, index):
         """
@@ -134,6 +161,7 @@ class Schema(object):
         """
         index.setSchema(self)
         self.__indexes[index.name()] = index
+        self._invalidate()
 
     def addCollector(self, collector):
         """
@@ -143,6 +171,7 @@ class Schema(object):
         """
         collector.setSchema(self)
         self.__collectors[collector.name()] = collector
+        self._invalidate()
 
     def collector(self, name, recurse=True):
         """
@@ -158,16 +187,22 @@ class Schema(object):
 
         :return     {<str> name: <orb.Collector>, ..}
         """
-        output = {}
-        if recurse and self.inherits():
-            schema = orb.system.schema(self.inherits())
-            if not schema:
-                raise orb.errors.ModelNotFound(self.inherits())
-            else:
-                iflags = (flags & ~orb.Collector.Flags.Virtual) if flags else ~orb.Collector.Flags.Virtual
-                output.update(schema.collectors(recurse=recurse, flags=iflags))
-        output.update({c.name(): c for c in self.__collectors.values() if not flags or c.testFlag(flags)})
-        return output
+        cache = self._cached()
+        key = ('collectors', recurse, flags)
+        try:
+            return cache[key]
+        except KeyError:
+            output = {}
+            if recurse and self.inherits():
+                schema = orb.system.schema(self.inherits())
+                if not schema:
+                    raise orb.errors.ModelNotFound(self.inherits())
+                else:
+                    iflags = (flags & ~orb.Collector.Flags.Virtual) if flags else ~orb.Collector.Flags.Virtual
+                    output.update(schema.collectors(recurse=recurse, flags=iflags))
+            output.update({c.name(): c for c in self.__collectors.values() if not flags or c.testFlag(flags)})
+            cache[key] = output
+            return output
 
     def column(self, key, recurse=True, flags=0, raise_=True):
         """
@@ -184,34 +219,57 @@ class Schema(object):
         """
         if isinstance(key, orb.Column):
             return key
-        else:
-            parts = key.split('.')
+
+        cache = self._cached()
+        path_key = ('path', key, recurse, flags)
+        try:
+            last_column = cache[path_key]
+        except KeyError:
             schema = self
             last_column = None
 
-            for part in parts:
-                cols = schema.columns(recurse=recurse, flags=flags)
-                found = None
-
-                for column in cols.values():
-                    if part in (column.name(), column.field()):
-                        found = column
-                        break
+            for part in key.split('.'):
+                found = schema.columnLookup(recurse=recurse, flags=flags).get(part)
 
                 if found is None:
                     break
 
                 elif isinstance(found, orb.ReferenceColumn):
-                    schema = column.referenceModel().schema()
+                    schema = found.referenceModel().schema()
 
                 last_column = found
 
-            if last_column is not None:
-                return last_column
-            elif raise_:
-                raise orb.errors.ColumnNotFound(self.name(), key)
-            else:
-                return None
+            cache[path_key] = last_column
+
+        if last_column is not None:
+            return last_column
+        elif raise_:
+            raise orb.errors.ColumnNotFound(self.name(), key)
+        else:
+            return None
+
+    def columnLookup(self, recurse=True, flags=0):
+        """
+        Returns a mapping of both the name and field of each column to the
+        column instance.  When a name or field is shared by multiple columns,
+        the first column (by order) will be used.
+
+        :param      recurse | <bool>
+                    flags   | <orb.Column.Flags>
+
+        :return     {<str> name or field: <orb.Column>, ..}
+        """
+        cache = self._cached()
+        key = ('lookup', recurse, flags)
+        try:
+            return cache[key]
+        except KeyError:
+            output = {}
+            for col in self.columns(recurse=recurse, flags=flags).values():
+                output.setdefault(col.name(), col)
+                output.setdefault(col.field(), col)
+            cache[key] = output
+            return output
 
     def columns(self, recurse=True, flags=0):
         """
@@ -224,9 +282,10 @@ class Schema(object):
         
         :return     {<str> column name: <orb.Column>, ..}
         """
-        key = (recurse, flags)
+        cache = self._cached()
+        key = ('columns', recurse, flags)
         try:
-            return self.__cache[key]
+            return cache[key]
         except KeyError:
 
             output = odict()
@@ -253,7 +312,7 @@ class Schema(object):
                 if (not flags or col.testFlag(flags))
             ))
 
-            self.__cache[key] = output
+            cache[key] = output
             return output
 
     def database(self):
@@ -285,10 +344,7 @@ class Schema(object):
         return column in self.columns(recurse=recurse, flags=flags)
 
     def hasTranslations(self):
-        for col in self.columns().values():
-            if col.testFlag(col.Flags.I18n):
-                return True
-        return False
+        return len(self.columns(flags=orb.Column.Flags.I18n)) > 0
 
     def idColumn(self):
         return self.column(self.__idColumn)
@@ -302,14 +358,20 @@ class Schema(object):
         
         :return     [<orb.Index>, ..]
         """
-        output = self.__indexes.copy()
-        if recurse and self.inherits():
-            schema = orb.system.schema(self.inherits())
-            if not schema:
-                raise orb.errors.ModelNotFound(self.inherits())
-            else:
-                output.update(schema.indexes(recurse=recurse))
-        return output
+        cache = self._cached()
+        key = ('indexes', recurse)
+        try:
+            return cache[key]
+        except KeyError:
+            output = self.__indexes.copy()
+            if recurse and self.inherits():
+                schema = orb.system.schema(self.inherits())
+                if not schema:
+                    raise orb.errors.ModelNotFound(self.inherits())
+                else:
+                    output.update(schema.indexes(recurse=recurse))
+            cache[key] = output
+            return output
 
     def inherits(self):
         """
@@ -368,6 +430,20 @@ class Schema(object):
         else:
             return self.__namespace or context.namespace
 
+    def plan(self):
+        """
+        Returns the precompiled load and storage plan for this schema.  The plan is
+        generated on first use and regenerated after the schema structure changes.
+
+        :return     <orb.core.plan.SchemaPlan>
+        """
+        cache = self._cached()
+        try:
+            return cache['plan']
+        except KeyError:
+            plan = cache['plan'] = SchemaPlan(self)
+            return plan
+
     def register(self, item):
         """
         Registers a new orb object to this schema.  This could be a column, index, or collector -- including
@@ -401,6 +477,8 @@ class Schema(object):
             self.__columns[key] = item
             item.setSchema(self)
 
+        self._invalidate()
+
     def setColumns(self, columns):
         """
         Sets the columns that this schema uses.
@@ -411,6 +489,7 @@ class Schema(object):
         for name, column in columns.items():
             self.__columns[name] = column
             column.setSchema(self)
+        self._invalidate()
 
     def setDisplay(self, name):
         """
@@ -439,6 +518,7 @@ class Schema(object):
         for name, index in indexes.items():
             self.__indexes[name] = index
             index.setSchema(self)
+        self._invalidate()
 
     def setInherits(self, name):
         """
@@ -447,6 +527,7 @@ class Schema(object):
         :param      name    | <str>
         """
         self.__inherits = name
+        self._invalidate()
 
     def setName(self, name):
         """
@@ -475,6 +556,7 @@ class Schema(object):
         for name, collector in collectors.items():
             self.__collectors[name] = collector
             collector.setSchema(self)
+        self._invalidate()
 
     def setDbName(self, dbname):
         """
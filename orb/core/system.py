@@ -17,6 +17,7 @@ class System(object):
         self.__current_db = None
         self.__databases = {}
         self.__schemas = {}
+        self.__revision = 0
         self.__settings = Settings()
         self.__syntax = None
         self.__security = Security(self.__settings.security_key)
@@ -88,13 +89,27 @@ class System(object):
             pass
         else:
             if existing != obj and not force:
+                typ = type(obj).__name__
                 raise orb.errors.DuplicateEntryFound('{0} is already a registered {1}.'.format(key, typ))
 
         scope[key] = obj
+        self.__revision += 1
         return True
 
     def model(self, code, autoGenerate=False):
-        return self.models(autoGenerate=autoGenerate).get(code)
+        """
+        Returns the model that is associated with the given schema name.
+
+        :param      code         | <str>
+                    autoGenerate | <bool>
+
+        :return     <subclass of orb.Model> || None
+        """
+        schema = self.__schemas.get(code)
+        if schema is None:
+            return None
+        else:
+            return schema.model(autoGenerate=autoGenerate)
 
     def models(self, base=None, database='', autoGenerate=False):
         output = {}
@@ -106,6 +121,16 @@ class System(object):
                 output[schema.name()] = model
         return output
 
+    def revision(self):
+        """
+        Returns the revision number for the registry.  This value is incremented
+        whenever a new database or schema is registered, and can be used to validate
+        any cached lookups against the system.
+
+        :return     <int>
+        """
+        return self.__revision
+
     def schema(self, code):
         """
         Looks up the registered schemas for the inputted schema name.
@@ -14,6 +14,7 @@ class Settings(object):
         'max_connections': '3',
         'default_page_size': '40',
         'worker_class': 'default',
+        'record_locking': 'rw',  # possible values include rw, none
         'syntax': 'standard'  # possible values include standard, PEP8
     }
 
@@ -167,6 +167,7 @@ def testing_schema(orb):
     class Role(orb.Table):
         id = orb.IdColumn()
         name = orb.StringColumn()
+        version = orb.VersionColumn()
 
     class Employee(User):
         role = orb.ReferenceColumn(reference='Role', flags={'AutoExpand'})
@@ -39,6 +39,9 @@ def test_invalid_context_properties(orb):
     with pytest.raises(orb.errors.InvalidContextOption):
         context = orb.Context(start=-1)
 
+    with pytest.raises(orb.errors.InvalidContextOption):
+        context = orb.Context(expandStrategy='join')
+
 def test_valid_context_properties(orb):
     context = orb.Context(
         page=1,
@@ -231,3 +234,15 @@ def test_context_namespacing(orb):
     with orb.Context(namespace='test'):
         context = orb.Context()
         assert context.namespace == 'test'
+
+def test_context_deferred_columns(orb, User):
+    schema = User.schema()
+    context = orb.Context(defer='password,id')
+
+    assert context.defer == ['password', 'id']
+    assert context.deferredColumns(schema) == {schema.column('password')}
+
+    columns = context.queryColumns(schema)
+    assert schema.column('password') not in columns
+    assert schema.column('username') in columns
+    assert orb.Context(columns=['password']).queryColumns(schema) == [schema.column('password')]
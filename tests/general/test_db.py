@@ -3,3 +3,26 @@ import pytest
 def test_invalid_database(orb):
     with pytest.raises(orb.errors.BackendNotFound):
         db = orb.Database('Foo')
+
+def test_result_set(orb):
+    rows = orb.ResultSet(('id', 'username'), [(1, 'bob'), (2, 'sally')])
+
+    assert len(rows) == 2
+    assert rows.index() == {'id': 0, 'username': 1}
+    assert rows.column('username') == ['bob', 'sally']
+    assert rows.column('missing') == [None, None]
+    assert rows.values('username', 'id') == [('bob', 1), ('sally', 2)]
+    assert rows.dicts(['username']) == [{'username': 'bob'}, {'username': 'sally'}]
+    assert list(rows) == [{'id': 1, 'username': 'bob'}, {'id': 2, 'username': 'sally'}]
+    assert rows.mapped(lambda x: x['id']) == [1, 2]
+
+def test_result_set_inflate(orb, User):
+    rows = orb.ResultSet(('id', 'username'), [(1, 'bob'), (2, 'sally')])
+    users = User.inflateMany(rows)
+    assert [(user.id(), user.get('username')) for user in users] == [(1, 'bob'), (2, 'sally')]
+    assert User.inflateMany(orb.ResultSet(('id', 'username'), [])) == []
+
+def test_load_event_row(orb):
+    event = orb.events.LoadEvent(data=(1, 'bob'), columns=('id', 'username'))
+    assert event.items() == [('id', 1), ('username', 'bob')]
+    assert orb.events.LoadEvent(data={'id': 1}).items() == [('id', 1)]
@@ -0,0 +1,81 @@
+import pytest
+
+
+def test_record_change_tracking(orb, User):
+    record = User.inflate({'id': 1, 'username': 'bob'})
+
+    assert record.isRecord()
+    assert not record.isModified()
+
+    record.set('username', 'sam')
+    assert record.changes() == {User.schema().column('username'): ('bob', 'sam')}
+
+    record.set('username', 'bob')
+    assert not record.isModified()
+
+
+def test_record_locking_disabled(orb, User):
+    settings = orb.system.settings()
+    settings.record_locking = 'none'
+    try:
+        record = User.inflate({'id': 1, 'username': 'bob'})
+        assert record.get('username') == 'bob'
+        assert record.set('username', 'sam')
+        assert orb.core.locks.create_lock() is orb.core.locks.NULL_LOCK
+    finally:
+        settings.record_locking = 'rw'
+
+    assert orb.core.locks.create_lock() is not orb.core.locks.NULL_LOCK
+
+
+def test_record_changes_for_columns(orb, User):
+    record = User.inflate({'id': 1, 'username': 'bob', 'password': 'T3st1ng!'})
+    record.set('username', 'sam')
+
+    username = User.schema().column('username')
+    assert record.changes(columns=['username']).keys() == [username]
+    assert record.changes(columns=['password']) == {}
+    assert record.changes(flags=orb.Column.Flags.Virtual) == {}
+
+
+def test_lazy_column_restore(orb, TestAllColumns):
+    # invalid values are only found when the column is restored on first access
+    record = TestAllColumns.inflate({'id': 1, 'json': '{invalid', 'string': 'test'})
+    assert record.get('string') == 'test'
+    with pytest.raises(orb.errors.DataStoreError):
+        record.get('json')
+
+    record = TestAllColumns.inflate({'id': 1, 'json': '{"a": 1}', 'string': 'test'})
+    assert record.get('string') == 'test'
+    assert record.get('json') == {'a': 1}
+    assert not record.isModified()
+
+    record.get('json')['b'] = 2
+    assert record.isModified()
+
+
+def test_json_plan_cache(orb, User):
+    context = orb.Context()
+    plan = User.jsonPlan(context)
+
+    assert User.jsonPlan(orb.Context()) is plan
+    assert User.schema().column('password') not in plan.columns
+    assert User.schema().column('username') in plan.columns
+    assert User.jsonPlan(orb.Context(columns=['username'])) is not plan
+    assert User.jsonPlan(orb.Context(timezone='Europe/Paris')) is not plan
+
+    user = User({'username': 'bob'})
+    assert user.__json__() == user._json(plan, context, plan.valueContext(context))
+    assert 'password' not in user.__json__()
+
+
+def test_inflate_many_restores_by_column(orb, TestAllColumns):
+    records = TestAllColumns.inflateMany([
+        {'id': 1, 'string': 'a', 'json': '{"a": 1}'},
+        {'id': 2, 'string': 'b', 'json': None}
+    ])
+
+    assert [record.id() for record in records] == [1, 2]
+    assert [record.get('string') for record in records] == ['a', 'b']
+    assert records[0].get('json') == {'a': 1}
+    assert not any(record.isModified() for record in records)
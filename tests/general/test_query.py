@@ -0,0 +1,95 @@
+import pytest
+
+
+def test_query_optimize_flatten_and_dedupe(orb):
+    Q = orb.Query
+    q = orb.QueryCompound((Q('a') == 1) & (Q('b') == 2), Q('a') == 1, Q('c') == 3)
+
+    out = q.optimize()
+    assert isinstance(out, orb.QueryCompound)
+    assert out.op() == orb.QueryCompound.Op.And
+    assert [sub.columnName() for sub in out.queries()] == ['a', 'b', 'c']
+
+
+def test_query_optimize_or_to_in(orb):
+    Q = orb.Query
+    q = (Q('username') == 'bob') | (Q('username') == 'sally') | Q('username').in_(['bob', 'tom'])
+
+    out = q.optimize()
+    assert isinstance(out, orb.Query)
+    assert out.op() == Q.Op.IsIn
+    assert out.value() == ('bob', 'sally', 'tom')
+
+    # different columns are left alone
+    out = ((Q('username') == 'bob') | (Q('first_name') == 'bob')).optimize()
+    assert isinstance(out, orb.QueryCompound) and len(out.queries()) == 2
+
+    # checks with functions keep their own comparison
+    out = ((Q('username').lower() == 'BOB') | (Q('username').lower() == 'SALLY')).optimize()
+    assert isinstance(out, orb.QueryCompound) and len(out.queries()) == 2
+
+
+def test_query_optimize_empty_in(orb):
+    Q = orb.Query
+
+    with pytest.raises(orb.errors.QueryIsNull):
+        Q('id').in_([]).optimize()
+
+    with pytest.raises(orb.errors.QueryIsNull):
+        ((Q('id').in_([])) & (Q('username') == 'bob')).optimize()
+
+    assert Q('id').notIn([]).optimize() is None
+    assert ((Q('id').notIn([])) | (Q('username') == 'bob')).optimize() is None
+
+    out = ((Q('id').in_([])) | (Q('username') == 'bob')).optimize()
+    assert out.columnName() == 'username'
+
+    out = Q('id').in_([1, 1]).optimize()
+    assert out.op() == Q.Op.Is and out.value() == 1
+
+
+def test_query_negated(orb):
+    Q = orb.Query
+    q = -((Q('a') == 1) & (Q('b') > 2))
+
+    assert q.op() == orb.QueryCompound.Op.Or
+    assert [sub.op() for sub in q.queries()] == [Q.Op.IsNot, Q.Op.LessThanOrEqual]
+
+    q = (Q('a').between(1, 5)).negated()
+    assert q.op() == orb.QueryCompound.Op.Or
+    assert [(sub.op(), sub.value()) for sub in q.queries()] == [(Q.Op.LessThan, 1), (Q.Op.GreaterThan, 5)]
+
+
+def test_query_compound_or_grouping(orb):
+    Q = orb.Query
+    q = ((Q('a') == 1) & (Q('b') == 2)) | (Q('c') == 3)
+
+    assert q.op() == orb.QueryCompound.Op.Or
+    assert len(q.queries()) == 2
+    assert q.queries()[0].op() == orb.QueryCompound.Op.And
+
+
+def test_query_call_function(orb):
+    Q = orb.Query
+    q = Q('nickname').call('coalesce', Q('username')) == 'bob'
+
+    assert [name for name, args in q.functions()] == ['coalesce']
+    assert Q.fromJSON(q.__json__()).signature() == q.signature()
+    assert Q('username').lower().__json__()['functions'] == ['Lower']
+
+    with pytest.raises(orb.errors.QueryInvalid):
+        Q('username').call('missing')
+
+    date_trunc = orb.QueryFunction.byName('date_trunc')
+    assert date_trunc('Postgres', '"created_at"', ["'month'"]) == 'date_trunc(\'month\', "created_at")'
+    assert orb.QueryFunction.byName('coalesce')('SQLite', 'a', ['b', 'c']) == 'coalesce(a, b, c)'
+
+    import sqlite3
+    conn = sqlite3.connect(':memory:')
+    for unit, expected in (('year', '2016-01-01 00:00:00'),
+                           ('month', '2016-03-01 00:00:00'),
+                           ('day', '2016-03-14 00:00:00'),
+                           ('hour', '2016-03-14 15:00:00'),
+                           ('minute', '2016-03-14 15:09:00')):
+        sql = date_trunc('SQLite', "'2016-03-14 15:09:26'", ['?'])
+        assert conn.execute('SELECT ' + sql, (unit,)).fetchone()[0] == expected
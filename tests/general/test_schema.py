@@ -152,4 +152,121 @@ def test_virtual_schema_columns_and_collectors_are_class_specific(orb):
             pass
 
     assert A.schema().column('value') != B.schema().column('value')
-    assert A.schema().collector('options') != B.schema().collector('options')
\ No newline at end of file
+    assert A.schema().collector('options') != B.schema().collector('options')
+
+def test_schema_column_lookup_by_name_and_field(orb, GroupUser):
+    schema = GroupUser.schema()
+    col = schema.column('user')
+
+    assert isinstance(col, orb.ReferenceColumn)
+    assert schema.column('user_id') is col
+    assert schema.columnLookup()['user_id'] is col
+    assert schema.column('user.username').name() == 'username'
+
+
+def test_schema_cache_invalidated_on_register(orb):
+    class CacheTest(orb.Table):
+        id = orb.IdColumn()
+
+    schema = CacheTest.schema()
+    assert schema.column('name', raise_=False) is None
+    assert len(schema.columns()) == 1
+
+    schema.register(orb.StringColumn(name='name'))
+
+    assert schema.column('name', raise_=False) is not None
+    assert len(schema.columns()) == 2
+
+
+def test_schema_inherited_cache_invalidated(orb):
+    class CacheBase(orb.Table):
+        id = orb.IdColumn()
+
+    class CacheChild(CacheBase):
+        pass
+
+    assert CacheChild.schema().column('title', raise_=False) is None
+
+    CacheBase.schema().register(orb.StringColumn(name='title'))
+
+    assert CacheChild.schema().column('title', raise_=False) is not None
+
+
+def test_system_model_lookup(orb, User, GroupUser):
+    assert orb.system.model('User') is User
+    assert orb.system.model('DoesNotExist') is None
+    assert GroupUser.schema().column('user').referenceModel() is User
+
+
+def test_pipe_lookups(orb, User, Group, GroupUser):
+    pipe = User.schema().collector('groups')
+    assert pipe.fromColumn() is GroupUser.schema().column('user')
+    assert pipe.toColumn() is GroupUser.schema().column('group')
+    assert pipe.toModel() is Group
+
+
+def test_schema_plan(orb, Document, Employee):
+    plan = Document.schema().plan()
+    i18n = Document.schema().columns(flags=orb.Column.Flags.I18n).values()
+
+    assert plan is Document.schema().plan()
+    assert set(plan.i18n) == set(i18n)
+    assert not set(plan.standard).intersection(plan.i18n)
+    assert plan.loaders['title'][0] is Document.schema().column('title')
+    assert plan.loaders['documents.title'][0] is Document.schema().column('title')
+    assert plan.polymorphic is None
+    assert Employee.schema().plan().loaders['role_id'][0] is Employee.schema().column('role')
+
+
+def test_column_restore_many(orb, TestAllColumns):
+    import datetime
+    from orb.core.column_types.dtime import get_timezone
+
+    schema = TestAllColumns.schema()
+    context = orb.Context(timezone='US/Eastern')
+
+    column = schema.column('datetime_tz')
+    values = [datetime.datetime(2016, 1, 1, 12), None]
+    assert column.restoreMany(values, context) == [column.restore(v, context) for v in values]
+    assert column.dbStoreMany('SQLite', values) == [column.dbStore('SQLite', v) for v in values]
+    assert get_timezone('US/Eastern') is get_timezone('US/Eastern')
+
+    assert schema.column('string').restoreMany(['a', None]) == [u'a', None]
+    assert schema.column('integer').dbRestoreMany((1, 2)) == [1, 2]
+
+
+def test_column_to_array(orb, TestAllColumns):
+    import array
+    import datetime
+
+    schema = TestAllColumns.schema()
+
+    data, nulls = schema.column('integer').toArray([1, None, 3])
+    assert data == array.array('l', [1, 0, 3])
+    assert nulls == array.array('B', [0, 1, 0])
+
+    data, nulls = schema.column('date').toArray([datetime.date(1970, 1, 2), '1970-01-03'])
+    assert data == array.array('l', [1, 2])
+
+    data, nulls = schema.column('bool').toArray([True, False, None])
+    assert data == array.array('B', [1, 0, 0])
+
+    data, nulls = schema.column('string').toArray(['a', None])
+    assert data == ['a', None] and nulls == array.array('B', [0, 1])
+
+def test_column_value_to_json(orb, TestAllColumns):
+    import datetime
+    import decimal
+
+    schema = TestAllColumns.schema()
+    assert schema.column('datetime').valueToJSON(datetime.datetime(2016, 3, 14, 15, 9, 26)) == '2016-03-14T15:09:26'
+    assert schema.column('date').valueToJSON(datetime.date(2016, 3, 14)) == '2016-03-14'
+    assert schema.column('date').valueToJSON('2016-03-14') == '2016-03-14'
+    assert repr(schema.column('decimal').valueToJSON(decimal.Decimal('1.50'))) == "Decimal('1.50')"
+    assert schema.column('decimal').valueToJSON(None) is None
+    assert schema.column('string').valueToJSON('bob') == 'bob'
+
+    record = TestAllColumns({'datetime': datetime.datetime(2016, 3, 14, 15, 9, 26), 'decimal': decimal.Decimal('1.50')})
+    output = record.__json__()
+    assert output['datetime'] == '2016-03-14T15:09:26' and repr(output['decimal']) == "Decimal('1.50')"
+    assert not TestAllColumns.jsonPlan(orb.Context(columns=['decimal'])).native
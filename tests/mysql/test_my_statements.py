@@ -211,3 +211,24 @@ def test_my_select_bob_and_sally(orb, my_sql, my_db, User):
     _, count = conn.execute(sql, data)
     assert count == 0
 
+@pytest.mark.run(order=2)
+@requires_mysql
+def test_my_statement_expand_collectors(orb, Group, my_sql):
+    st = my_sql.statement('SELECT')
+    sql, data = st(Group, orb.Context(expand='users,groupUsers.ids'))
+
+    # the collectors are aggregated without derived tables, which can only reference
+    # the outer query as of MySQL 8.0.14
+    assert '_records`' not in sql
+    assert "JSON_ARRAYAGG(`group_users_table`.`id`)" in sql
+    assert "WHERE `group_users_table`.`group_id` = `groups`.`id`" in sql
+    assert "WHERE `users_table`.`id` IN (" in sql
+    assert 'LIMIT' not in sql
+
+    pipe = orb.Pipe(name='firstUser', through_path='GroupUser.group.user', flags={'Unique'})
+    pipe.setSchema(Group.schema())
+    sql, data = my_sql.statement('SELECT EXPAND PIPE')(pipe, {}, alias='groups')
+
+    # MySQL does not support LIMIT within an IN sub-query
+    assert "WHERE `first_user_table`.`id` = (" in sql
+    assert 'IN (' not in sql and 'LIMIT 1' in sql
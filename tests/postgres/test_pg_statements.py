@@ -105,6 +105,56 @@ def test_pg_statement_create_index(orb, GroupUser, pg_sql):
     statement, data = st(index, checkFirst=True)
     assert 'DO $$' in statement
 
+@pytest.mark.run(order=2)
+@requires_pg
+def test_pg_statement_case_insensitive_lookup(orb, User, pg_sql):
+    st = pg_sql.statement('SELECT')
+
+    sql, data = st(User, orb.Context(where=orb.Query('username').lower() == 'bob'))
+    assert 'lower("users"."username"::varchar) = lower(%(' in sql
+
+    sql, data = st(User, orb.Context(where=orb.Query('username').startswith('bo')))
+    assert 'lower("users"."username"::varchar) LIKE lower(%(' in sql
+
+    index = orb.Index(name='byUsername', columns=[User.schema().column('username')])
+    index.setSchema(User.schema())
+    statement, data = pg_sql.statement('CREATE INDEX')(index)
+    assert 'lower("username"::varchar) text_pattern_ops' in statement
+
+@pytest.mark.run(order=2)
+@requires_pg
+def test_pg_statement_expand_lateral(orb, GroupUser, pg_sql):
+    st = pg_sql.statement('SELECT')
+
+    sql, data = st(GroupUser, orb.Context(expand='user', limit=10, order='+id', expandStrategy='lateral'))
+    assert 'LEFT JOIN LATERAL' in sql and '"user_lateral"."json" AS "user"' in sql
+    assert sql.strip().endswith('ORDER BY "group_users"."_orb_row"')
+
+    sql, data = st(GroupUser, orb.Context(expand='user', limit=10))
+    assert 'LEFT JOIN LATERAL' not in sql
+
+@pytest.mark.run(order=2)
+@requires_pg
+def test_pg_statement_count_estimate(orb, User, pg_sql):
+    st = pg_sql.statement('SELECT COUNT ESTIMATE')
+    sql, data = st(User, orb.Context())
+    assert 'pg_class' in sql and data['table'] == '"public"."users"'
+
+    sql, data = st(User, orb.Context(where=orb.Query('username') == 'bob'))
+    assert sql == ''
+
+@requires_pg
+def test_pg_statement_function(orb, User, pg_sql):
+    st = pg_sql.statement('SELECT')
+    sql, data = st(User, orb.Context(where=orb.Query('username').call('json_value', 'a.b') == '1'))
+    assert 'jsonb_extract_path_text(("users"."username")::jsonb, VARIADIC string_to_array(%(json_value_' in sql
+
+@requires_pg
+def test_pg_statement_facets(orb, GroupUser, pg_sql):
+    st = pg_sql.statement('SELECT FACETS')
+    sql, data = st(GroupUser, orb.Context(), ['user', 'group'])
+    assert 'GROUP BY GROUPING SETS (("group_users"."user_id"), ("group_users"."group_id"))' in sql
+
 # ----
 # test SQL statement execution
 
@@ -295,6 +295,303 @@ def test_lite_api_select_multiple_columns(orb, User):
     assert type(data[0]) == tuple
     assert (1, 'bob') in data
 
+@requires_lite
+def test_lite_api_select_deferred_columns(orb, lite_db, User, monkeypatch):
+    conn = lite_db.connection()
+    selects = []
+    select = conn.select
+    monkeypatch.setattr(conn, 'select', lambda *args, **kw: selects.append(args) or select(*args, **kw))
+
+    users = User.select(defer='password', order='+id').records()
+    assert len(selects) == 1
+
+    # the deferred column is loaded for all of the records on first access, in a single query
+    assert users[0].get('password') is not None
+    assert len(selects) == 2
+    assert all(user.get('password') is not None for user in users)
+    assert len(selects) == 2
+
+@requires_lite
+def test_lite_api_select_deferred_group(orb, User):
+    import gc
+    import weakref
+
+    loaded = []
+    callback = lambda event: loaded.append(event)
+    User.addCallback(orb.events.LoadEvent, callback)
+    try:
+        users = User.select(defer='password', order='+id').records()
+        assert len(loaded) == len(users)
+
+        # deferred values are loaded for the group without firing the load event again
+        assert users[0].get('password') is not None
+        assert len(loaded) == len(users)
+    finally:
+        User.removeCallback(orb.events.LoadEvent, callback)
+
+    # a record does not keep the rest of its page alive
+    first = users[0]
+    last = weakref.ref(users[-1])
+    del users
+    gc.collect()
+    assert last() is None
+    assert first.get('username')
+
+@requires_lite
+def test_lite_api_select_tuples(orb, User):
+    users = User.select(order='+id')
+    assert users.tuples('id', 'username') == map(tuple, users.values('id', 'username'))
+    assert (1, 'bob') in users.tuples('id', 'username')
+    assert 'bob' in users.scalars('username', restore=True)
+    assert User.select(where=orb.Query('username') == 'missing').tuples('id') == []
+
+@requires_lite
+def test_lite_api_select_scalars_loaded(orb, lite_db, TestAllColumns):
+    import datetime
+
+    record = TestAllColumns({'password': 'T3st1ng!', 'datetime': datetime.datetime(2016, 3, 14, 15, 9, 26)})
+    record.save()
+
+    def scalars(loaded, **context):
+        records = TestAllColumns.select(where=orb.Query('id') == record.id())
+        if loaded:
+            records.records()
+        return records.scalars('datetime', **context)
+
+    # loaded and unloaded collections return the same database or restored values
+    assert scalars(True) == scalars(False)
+    assert scalars(True, restore=True) == scalars(False, restore=True) == [record.get('datetime')]
+    assert not isinstance(scalars(True)[0], datetime.datetime)
+
+@requires_lite
+def test_lite_api_select_arrays(orb, User):
+    arrays = User.select(order='+id').toArrays(['id', 'username'], useNumpy=False)
+    ids, id_nulls = arrays['id']
+    assert ids.typecode == 'l' and list(ids) == User.select(order='+id').scalars('id')
+    assert not any(id_nulls)
+    assert len(arrays['username'][0]) == len(ids)
+
+@requires_lite
+def test_lite_api_select_numpy_arrays(orb, lite_db, TestAllColumns):
+    import datetime
+    numpy = pytest.importorskip('numpy')
+
+    first = TestAllColumns({'password': 'T3st1ng!', 'integer': 3, 'bool': True, 'date': datetime.date(1970, 1, 3)})
+    first.save()
+    second = TestAllColumns({'password': 'T3st1ng!'})
+    second.save()
+
+    records = TestAllColumns.select(where=orb.Query('id').in_([first.id(), second.id()]), order='+id')
+    arrays = records.toArrays(['integer', 'bool', 'date', 'string'], useNumpy=True)
+
+    integers, nulls = arrays['integer']
+    assert integers.dtype == numpy.dtype('l') and list(integers) == [3, 0]
+    assert nulls.dtype == numpy.dtype(bool) and list(nulls) == [False, True]
+
+    bools, nulls = arrays['bool']
+    assert bools.dtype == numpy.dtype(bool) and bools[0]
+    assert list(nulls) == [False, True]
+
+    dates, nulls = arrays['date']
+    assert dates.dtype == numpy.dtype('datetime64[D]') and dates[0] == numpy.datetime64('1970-01-03')
+    assert list(nulls) == [False, True]
+
+    strings, nulls = arrays['string']
+    assert strings.dtype == numpy.dtype(object) and list(nulls) == [True, True]
+
+@requires_lite
+def test_lite_api_select_json(orb, User):
+    records = User.select(order='+id', returning='json').records()
+    assert records == User.select(order='+id').__json__()
+    assert 'password' not in records[0]
+
+@requires_lite
+def test_lite_api_iterjson(orb, User):
+    import json
+    import projex.rest
+
+    users = User.select(order='+id')
+    chunks = list(users.iterjson(chunk=1))
+    assert all(isinstance(chunk, str) for chunk in chunks)
+    assert len(chunks) == users.count() + 2
+    assert json.loads(''.join(chunks)) == json.loads(projex.rest.jsonify(users.__json__()))
+
+    users = User.select(order='+id', expand='count')
+    assert json.loads(''.join(users.iterjson())) == {'count': users.count()}
+
+    users = User.select(order='+id', expand='count,ids,first,records', pageSize=1, page=2)
+    expected = json.loads(projex.rest.jsonify(users.__json__()))
+    assert json.loads(''.join(User.select(order='+id', expand='count,ids,first,records', pageSize=1, page=2).iterjson())) == expected
+
+@requires_lite
+def test_lite_api_version_cache(orb, Role):
+    role = Role({'name': 'Tester'})
+    role.save()
+    assert role.get('version') == 1
+
+    roles = Role.select(where=orb.Query('id') == role.id())
+    etag = roles.etag()
+    assert etag.startswith('W/"')
+    assert roles.__json__() == [role.__json__()]
+    assert Role.jsonPlan(orb.Context()).cachedRecord((role.id(), 1)) == role.__json__()
+
+    output = role.__json__()
+    output['name'] = 'Changed'
+    assert role.__json__()['name'] == 'Tester'
+    assert Role.select(where=orb.Query('id') == role.id()).etag() == etag
+
+    cached = Role.select(where=orb.Query('id') == role.id())
+    assert cached.__json__() == [role.__json__()]
+    assert not cached.isLoaded()
+
+    role.set('name', 'Reviewer')
+    role.save()
+    assert role.get('version') == 2
+    assert Role.select(where=orb.Query('id') == role.id()).etag() != etag
+    assert Role.select(where=orb.Query('id') == role.id()).__json__()[0]['name'] == 'Reviewer'
+
+@requires_lite
+def test_lite_api_order_by_reference_path(orb, GroupUser):
+    records = GroupUser.select(where=orb.Query('user.username') == 'bob', order='-user.username')
+    assert len(records) > 0
+    assert all(record.get('user.username') == 'bob' for record in records)
+
+    with pytest.raises(orb.errors.QueryInvalid):
+        GroupUser.select(order='+user.groups').records()
+
+@requires_lite
+def test_lite_api_select_large_in(orb, User):
+    ids = User.select().values('id')
+    missing = range(100000, 102000)
+
+    records = User.select(where=orb.Query('id').in_(missing + ids))
+    assert sorted(records.values('id')) == sorted(ids)
+    assert records.count() == len(ids)
+    assert User.select(where=orb.Query('id').notIn(missing + ids)).count() == 0
+
+    records = User.select(where=orb.Query('id').in_(missing[:100] + ids), limit=2000)
+    assert sorted(records.values('id')) == sorted(ids)
+
+    # mixed values cannot be loaded into a table and are split into batches instead
+    mixed = [str(value) for value in missing[:1000]] + missing[1000:] + ids
+    assert User.select(where=orb.Query('id').in_(mixed)).count() == len(ids)
+
+@requires_lite
+def test_lite_api_iterselect_closed_early(orb, lite_db, User):
+    ids = User.select().values('id')
+    missing = range(100000, 102000)
+
+    conn = lite_db.connection()
+    context = orb.Context(where=orb.Query('id').in_(missing + ids), db=lite_db)
+    chunks = conn.iterselect(User, context, size=1)
+    assert len(next(chunks)) == 1
+    chunks.close()
+
+    # the temporary table of values is dropped when the iteration is closed
+    with conn.native() as native:
+        assert native.execute('SELECT name FROM sqlite_temp_master').fetchall() == []
+    assert User.select(where=orb.Query('id').in_(missing + ids)).count() == len(ids)
+
+@requires_lite
+def test_lite_api_select_expanded(orb, lite_db, Group, GroupUser):
+    conn = lite_db.connection()
+    admins = Group.byName('admins')
+
+    rows = conn.select(GroupUser, orb.Context(where=orb.Query('group') == admins, expand='user,group.users.ids'))
+    assert rows[0]['user']['username'] == 'bob'
+    assert rows[0]['group']['users'] == {'ids': [rows[0]['user']['id']]}
+
+    rows = conn.select(Group, orb.Context(where=orb.Query('id') == admins, expand='groupUsers.count,users.first'))
+    assert rows[0]['group_users'] == {'count': 1}
+    assert rows[0]['users']['first']['username'] == 'bob'
+
+    group = Group.select(where=orb.Query('id') == admins, expand='users').first()
+    assert group.preload('users')['records'][0]['username'] == 'bob'
+    assert group.__json__()['users'][0]['username'] == 'bob'
+
+@requires_lite
+def test_lite_api_collection_json_page(orb, lite_db, User):
+    total = User.select().count()
+
+    users = User.select(order='+id', expand='count,ids,records', pageSize=1, page=2)
+    data = users.__json__()
+    assert data['count'] == len(data['records']) == 1
+    assert data['ids'] == [data['records'][0]['id']]
+    assert users.pageCount() == total
+
+    rows, count = lite_db.connection().selectTotal(User, orb.Context(order='+id', limit=1, start=1))
+    assert len(rows) == 1 and count == total
+    assert not rows.hasColumn('_orb_total')
+
+@requires_lite
+def test_lite_api_collection_json_page_without_windows(orb, lite_db, User, monkeypatch):
+    conn = lite_db.connection()
+    monkeypatch.setattr(conn, 'hasWindowFunctions', lambda: False)
+
+    rows, count = conn.selectTotal(User, orb.Context(order='+id', limit=1, start=1))
+    assert len(rows) == 1 and count is None
+
+    total = User.select().count()
+    users = User.select(order='+id', expand='count,records', pageSize=1, page=2)
+    assert users.__json__()['count'] == 1
+    assert users.pageCount() == total
+
+@requires_lite
+def test_lite_api_collection_exists(orb, lite_db, User):
+    bob = User.byUsername('bob')
+    assert User.select().exists()
+    assert not User.select(where=orb.Query('username') == 'billy').exists()
+    assert User.select(where=orb.Query('username') != 'sally').has(bob)
+    assert not User.select(where=orb.Query('username') == 'sally').has(bob)
+
+@requires_lite
+def test_lite_api_collection_approximate_count(orb, lite_db, User):
+    count = User.select().count()
+    lite_db.connection().execute('ANALYZE', returning=False)
+
+    assert User.select().count(approximate=True) == count
+    assert User.select(where=orb.Query('username') == 'bob').count(approximate=True) == 1
+
+@requires_lite
+def test_lite_api_collection_aggregate(orb, lite_db, User, GroupUser):
+    assert User.select().aggregate(count='*') == [{'count': User.select().count()}]
+    assert User.select(where=orb.Query('username') == 'billy').aggregate(max='id') == [{'max': None}]
+
+    rows = GroupUser.select().aggregate(groupBy=['group.name'], count='*', min=['user', 'id'])
+    assert sum(row['count'] for row in rows) == GroupUser.select().count()
+    assert all(set(row['min']) == {'user', 'id'} for row in rows)
+
+@requires_lite
+def test_lite_api_collection_functions(orb, lite_db, User):
+    Q = orb.Query
+    users = User.select(where=Q('username').call('length') == 3)
+    assert 'bob' in users.values('username')
+    assert all(len(username) == 3 for username in users.values('username'))
+
+    users = User.select(where=Q('token').call('coalesce', Q('username')) != None,
+                        order=[(Q('username').call('length'), 'desc')])
+    lengths = [len(username) for username in users.values('username')]
+    assert lengths == sorted(lengths, reverse=True)
+
+    rows = User.select().aggregate(groupBy=['username', Q('username').call('length')], count='*')
+    assert sum(row['count'] for row in rows) == User.select().count()
+    assert all(row['length(username)'] == len(row['username']) for row in rows)
+
+@requires_lite
+def test_lite_api_collection_facets(orb, lite_db, User, GroupUser):
+    facets = GroupUser.select().facets(['group', 'user.username'])
+    assert sum(facet['count'] for facet in facets['group']) == GroupUser.select().count()
+    usernames = set(record.get('user').get('username') for record in GroupUser.select())
+    assert sorted(facet['value'] for facet in facets['user.username']) == sorted(usernames)
+
+    # the default facets are counted per column through aggregate
+    conn = lite_db.connection()
+    context = orb.Context(db=lite_db)
+    default = orb.Connection.facets(conn, GroupUser, context, ['group', 'user.username'])
+    rows = lambda rows: sorted((row['_orb_facet'], row['_orb_group_{0}'.format(row['_orb_facet'])], row['count'])
+                               for row in rows)
+    assert rows(default) == rows(conn.facets(GroupUser, context, ['group', 'user.username']))
+
 # @requires_lite
 # def test_lite_api_save_multi_i18n(orb, Document):
 #     doc = Document()
@@ -374,3 +671,44 @@ def test_lite_api_invalid_reference(orb, Employee, User):
 #     attachment.save()
 #
 #     assert isinstance(attachment.get('comment_id'), str)
+
+@requires_lite
+def test_lite_api_version_cache_per_database(orb, Role):
+    import os
+    import shutil
+    import tempfile
+
+    path = tempfile.mkdtemp()
+    dbs = []
+    try:
+        for name in ('tenant1', 'tenant2'):
+            db = orb.Database('SQLite')
+            db.setName(os.path.join(path, name))
+            db.sync(models=['Role'])
+            Role({'name': name}, db=db).save()
+            dbs.append(db)
+
+        d1, d2 = dbs
+        assert Role.select(db=d1).__json__()[0]['name'] == 'tenant1'
+        assert Role.select(db=d2).__json__()[0]['name'] == 'tenant2'
+        assert Role.select(db=d2).records()[0].get('name') == 'tenant2'
+    finally:
+        for db in dbs:
+            db.disconnect()
+        shutil.rmtree(path)
+
+@requires_lite
+def test_lite_api_select_lower_or(orb, User):
+    q = orb.Query('username').lower() == 'BOB'
+    assert User.select(where=q).values('username') == ['bob']
+
+    q = (orb.Query('username').lower() == 'BOB') | (orb.Query('username').lower() == 'SALLY')
+    assert sorted(User.select(where=q).values('username')) == ['bob', 'sally']
+
+@requires_lite
+def test_lite_api_reference_restore_many_context(orb, GroupUser, User):
+    ids = [User.byUsername('bob').id(), User.byUsername('sally').id()]
+    context = orb.Context(where=orb.Query('username') == 'nobody', columns=['id'], order='-username', limit=1, returning='values')
+
+    records = GroupUser.schema().column('user').restoreMany(ids, context=context)
+    assert [record.get('username') for record in records] == ['bob', 'sally']
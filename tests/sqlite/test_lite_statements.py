@@ -187,3 +187,105 @@ def test_lite_select_bob_and_sally(orb, lite_sql, lite_db, User):
     _, count = conn.execute(sql, data)
     assert count == 0
 
+@pytest.mark.run(order=2)
+@requires_lite
+def test_lite_select_empty_in(orb, lite_sql, lite_db, User):
+    st = lite_sql.statement('SELECT')
+    sql, data = st(User, orb.Context(where=orb.Query('id').in_([])))
+    assert sql == ''
+
+    conn = lite_db.connection()
+    assert conn.count(User, orb.Context(where=orb.Query('id').in_([]))) == 0
+    assert conn.count(User, orb.Context(where=orb.Query('id').notIn([]))) == conn.count(User, orb.Context())
+
+@pytest.mark.run(order=2)
+@requires_lite
+def test_lite_select_empty_sub_query(orb, lite_sql, lite_db, User):
+    empty = User.select(columns=['id'], where=orb.Query('id').in_([]))
+
+    st = lite_sql.statement('SELECT')
+    sql, data = st(User, orb.Context(where=orb.Query('id').in_(empty)))
+    assert 'WHERE 1 = 0' in sql
+
+    conn = lite_db.connection()
+    records, count = conn.execute(sql, data)
+    assert count == 0
+    assert conn.count(User, orb.Context(where=orb.Query('id').notIn(empty))) == conn.count(User, orb.Context())
+
+
+@pytest.mark.run(order=2)
+@requires_lite
+def test_lite_select_case_insensitive_lookup(orb, lite_sql, lite_db, User):
+    st = lite_sql.statement('SELECT')
+    sql, data = st(User, orb.Context(where=orb.Query('username').lower() == 'bob'))
+    assert '`users`.`username` COLLATE NOCASE = ' in sql
+
+    conn = lite_db.connection()
+    records, count = conn.execute(sql, data)
+    assert count == 1 and records[0]['username'] == 'bob'
+
+@pytest.mark.run(order=2)
+@requires_lite
+def test_lite_select_reference_path_join(orb, lite_sql, GroupUser):
+    st = lite_sql.statement('SELECT')
+    q = (orb.Query('user.username') == 'bob') & (orb.Query('user.token') != None)
+    sql, data = st(GroupUser, orb.Context(where=q, order='+user.username'))
+
+    assert sql.count('LEFT JOIN `users` AS `join_user`') == 1
+    assert '`join_user`.`username` ASC' in sql
+    assert ' IN (' not in sql
+
+@pytest.mark.run(order=2)
+@requires_lite
+def test_lite_select_collector_path_exists(orb, lite_sql, User):
+    st = lite_sql.statement('SELECT')
+    sql, data = st(User, orb.Context(where=orb.Query('groups.name') == 'admins'))
+    assert 'EXISTS (SELECT 1 FROM `group_users`' in sql
+
+    sql, data = st(User, orb.Context(where=orb.Query('userGroups.group.name') == 'admins'))
+    assert 'EXISTS (SELECT 1 FROM `group_users`' in sql and 'LEFT JOIN `groups` AS `join_group`' in sql
+
+@pytest.mark.run(order=2)
+@requires_lite
+def test_lite_select_expand(orb, lite_sql, GroupUser):
+    st = lite_sql.statement('SELECT')
+    sql, data = st(GroupUser, orb.Context(expand='user.groups'))
+    assert ') AS `user [json]`' in sql
+    assert "json_object('records', json_group_array(json(`groups_records`.`json`)))" in sql
+
+@pytest.mark.run(order=2)
+@requires_lite
+def test_lite_select_count_lean(orb, lite_sql, lite_db, GroupUser, User):
+    st = lite_sql.statement('SELECT COUNT')
+    sql, data = st(GroupUser, orb.Context(where=orb.Query('user.username') == 'bob', order='+id', expand='user'))
+    assert sql.startswith('SELECT COUNT(*) AS count FROM `group_users`\nLEFT JOIN `users` AS `join_user`')
+    assert 'ORDER BY' not in sql and 'json_object' not in sql
+
+    sql, data = st(GroupUser, orb.Context(limit=1))
+    assert 'AS records' in sql
+
+    exists_sql, data = lite_sql.statement('SELECT EXISTS')(User, orb.Context(order='+id'))
+    assert exists_sql.startswith('SELECT EXISTS(') and 'LIMIT 1' in exists_sql
+    assert lite_db.connection().execute(exists_sql, data)[0][0]['exists'] == 1
+
+@requires_lite
+def test_lite_select_function(orb, lite_sql, User):
+    st = lite_sql.statement('SELECT')
+    length = orb.Query('username').call('length')
+    sql, data = st(User, orb.Context(where=length == 3, order=[(length, 'desc')]))
+    assert 'WHERE length(`users`.`username`) = ' in sql
+    assert 'ORDER BY length(`users`.`username`) DESC' in sql
+
+    sql, data = st(User, orb.Context(where=orb.Query('username').call('coalesce', 'none') == 'bob'))
+    assert 'coalesce(`users`.`username`, %(coalesce_' in sql and 'none' in data.values()
+
+@requires_lite
+def test_lite_select_aggregate(orb, lite_sql, GroupUser):
+    st = lite_sql.statement('SELECT AGGREGATE')
+    sql, data = st(GroupUser, orb.Context(order='+id'), ['user.username'], [('count', '*'), ('max', 'group')])
+    assert 'COUNT(*) AS `_orb_value_0`, MAX(`group_users`.`group_id`) AS `_orb_value_1`' in sql
+    assert 'GROUP BY `join_user`.`username`' in sql
+
+    st = lite_sql.statement('SELECT FACETS')
+    sql, data = st(GroupUser, orb.Context(), ['user', 'group'])
+    assert sql.count('GROUP BY') == 2 and '\nUNION ALL\n' in sql